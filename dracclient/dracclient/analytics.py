@@ -0,0 +1,535 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Columnar tables of fleet inventory for vectorized analytics.
+
+Requires NumPy, which can be installed with the ``analytics`` extra.
+"""
+
+import array
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from dracclient import exceptions
+
+# Column types
+CATEGORY = 'category'
+INT = 'int'
+FLOAT = 'float'
+BOOL = 'bool'
+OBJECT = 'object'
+
+# Value stored in integer columns for missing values
+INT_MISSING = -1
+
+# Column types of the inventory record fields, by inventory kind. Fields that
+# are not listed are stored as OBJECT columns. Every table also has a
+# categorical 'host' column. FQDDs repeat across nodes, so ids are
+# categorical too.
+SCHEMAS = {
+    'cpus': {
+        'id': CATEGORY, 'model': CATEGORY, 'status': CATEGORY, 'cores': INT,
+        'speed_mhz': INT, 'ht_enabled': BOOL, 'turbo_enabled': BOOL,
+        'vt_enabled': BOOL, 'arch64': BOOL},
+    'memory': {
+        'id': CATEGORY, 'manufacturer': CATEGORY, 'model': CATEGORY,
+        'status': CATEGORY, 'size_mb': INT, 'speed_mhz': INT},
+    'nics': {
+        'id': CATEGORY, 'model': CATEGORY, 'duplex': CATEGORY,
+        'media_type': CATEGORY, 'speed_mbps': FLOAT},
+    'physical_disks': {
+        'id': CATEGORY, 'controller': CATEGORY, 'manufacturer': CATEGORY,
+        'model': CATEGORY, 'media_type': CATEGORY,
+        'interface_type': CATEGORY, 'firmware_version': CATEGORY,
+        'status': CATEGORY, 'raid_status': CATEGORY,
+        'device_protocol': CATEGORY, 'size_mb': INT, 'free_size_mb': INT},
+    'virtual_disks': {
+        'id': CATEGORY, 'controller': CATEGORY, 'raid_level': CATEGORY,
+        'status': CATEGORY, 'raid_status': CATEGORY,
+        'pending_operations': CATEGORY, 'size_mb': INT, 'span_depth': INT,
+        'span_length': INT},
+    'raid_controllers': {
+        'id': CATEGORY, 'manufacturer': CATEGORY, 'model': CATEGORY,
+        'primary_status': CATEGORY, 'firmware_version': CATEGORY,
+        'bus': CATEGORY},
+}
+
+AGGREGATIONS = ('count', 'sum', 'min', 'max', 'mean')
+
+
+def _require_numpy():
+    if numpy is None:
+        raise exceptions.DRACMissingDependency(
+            feature='Fleet analytics', dependency='numpy')
+
+
+def _as_categorical(column):
+    if isinstance(column, Categorical):
+        return column
+
+    index = {}
+    codes = numpy.empty(len(column), dtype=numpy.int32)
+    for (position, value) in enumerate(column):
+        if value is None:
+            codes[position] = -1
+        else:
+            codes[position] = index.setdefault(value, len(index))
+    categories = [None] * len(index)
+    for (value, code) in index.items():
+        categories[code] = value
+    return Categorical(codes, categories)
+
+
+class Categorical(object):
+    """Dictionary-encoded column
+
+    Values are stored as int32 codes indexing the list of categories. Missing
+    values have the code -1.
+    """
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+        self._index = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def code(self, value):
+        """Returns the code of a value, or None if it does not occur"""
+
+        if value is None:
+            return -1
+
+        if self._index is None:
+            self._index = dict((category, code) for (code, category)
+                               in enumerate(self.categories))
+        return self._index.get(value)
+
+    def take(self, selector):
+        return Categorical(self.codes[selector], self.categories)
+
+    def values(self):
+        """Returns the decoded values as an object array"""
+
+        lookup = numpy.array(list(self.categories) + [None], dtype=object)
+        return lookup[self.codes]
+
+    def eq(self, value):
+        code = self.code(value)
+        if code is None:
+            return numpy.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def isin(self, values):
+        codes = [code for code in (self.code(value) for value in values)
+                 if code is not None]
+        return numpy.isin(self.codes, codes)
+
+    def recode(self, categories):
+        """Returns the codes of this column in another list of categories
+
+        Values missing from categories get the code -1.
+        """
+        index = dict((category, code) for (code, category)
+                     in enumerate(categories))
+        mapping = numpy.array([index.get(category, -1)
+                               for category in self.categories] + [-1],
+                              dtype=numpy.int64)
+        return mapping[self.codes]
+
+
+class Table(object):
+    """Immutable columnar table
+
+    Columns are NumPy arrays, except categorical columns which are
+    Categorical objects.
+    """
+
+    def __init__(self, columns, types):
+        """Creates Table object
+
+        :param columns: an OrderedDict of column names and columns
+        :param types: a dictionary of column names and column types
+        """
+        _require_numpy()
+        self.columns = columns
+        self.types = types
+
+    def __len__(self):
+        for column in self.columns.values():
+            return len(column)
+        return 0
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __getitem__(self, name):
+        """Returns the values of a column as a NumPy array"""
+
+        column = self.columns[name]
+        if isinstance(column, Categorical):
+            return column.values()
+        return column
+
+    def eq(self, name, value):
+        """Returns a boolean mask of the rows where a column equals value"""
+
+        column = self.columns[name]
+        if isinstance(column, Categorical):
+            return column.eq(value)
+        return column == value
+
+    def isin(self, name, values):
+        """Returns a boolean mask of the rows where a column is in values"""
+
+        column = self.columns[name]
+        if isinstance(column, Categorical):
+            return column.isin(values)
+        return numpy.isin(column, list(values))
+
+    def where(self, mask):
+        """Returns a new table with the rows selected by a boolean mask"""
+
+        columns = collections.OrderedDict()
+        for (name, column) in self.columns.items():
+            if isinstance(column, Categorical):
+                columns[name] = column.take(mask)
+            else:
+                columns[name] = column[mask]
+        return Table(columns, self.types)
+
+    def filter(self, **equals):
+        """Returns the rows where every given column equals the given value
+
+        List or set values match any of their elements.
+        """
+        mask = numpy.ones(len(self), dtype=bool)
+        for (name, value) in equals.items():
+            if isinstance(value, (list, set, tuple)):
+                mask &= self.isin(name, value)
+            else:
+                mask &= self.eq(name, value)
+        return self.where(mask)
+
+    def _group_codes(self, name):
+        column = self.columns[name]
+        if isinstance(column, Categorical):
+            return column.codes
+        if column.dtype == object:
+            # numpy.unique sorts the values, which fails on missing ones
+            return _as_categorical(column).codes
+        return numpy.unique(column, return_inverse=True)[1]
+
+    def group_by(self, keys, aggregations):
+        """Groups the rows by key columns and aggregates other columns
+
+        :param keys: a list of column names
+        :param aggregations: a dictionary of output column names and
+                             (column name, function) tuples, function being
+                             one of 'count', 'sum', 'min', 'max' and 'mean'.
+                             Missing values are left out of all but 'count'.
+        :returns: a Table with one row per distinct key, holding the key
+                  columns followed by the aggregated columns. Groups without
+                  any value get a missing value.
+        """
+        if len(self):
+            stacked = numpy.stack([self._group_codes(key) for key in keys],
+                                  axis=1)
+            groups, first, inverse = numpy.unique(
+                stacked, axis=0, return_index=True, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            num_groups = len(groups)
+        else:
+            first = inverse = numpy.zeros(0, dtype=numpy.int64)
+            num_groups = 0
+
+        columns = collections.OrderedDict()
+        types = {}
+        for key in keys:
+            column = self.columns[key]
+            if isinstance(column, Categorical):
+                columns[key] = column.take(first)
+            else:
+                columns[key] = column[first]
+            types[key] = self.types[key]
+
+        counts = numpy.bincount(inverse, minlength=num_groups)
+        for (out_name, (name, function)) in aggregations.items():
+            columns[out_name] = self._aggregate(name, function, inverse,
+                                                counts, num_groups)
+            types[out_name] = (INT if function == 'count' else
+                               FLOAT if function == 'mean' else
+                               self.types[name])
+        return Table(columns, types)
+
+    def _aggregate(self, name, function, inverse, counts, num_groups):
+        if function not in AGGREGATIONS:
+            raise exceptions.InvalidParameterValue(
+                reason='Unknown aggregation %r, valid ones are %s' % (
+                    function, ', '.join(AGGREGATIONS)))
+
+        if function == 'count':
+            return counts
+
+        values = self.columns[name]
+        if isinstance(values, Categorical):
+            raise exceptions.InvalidParameterValue(
+                reason='Cannot compute the %s of categorical column %s' % (
+                    function, name))
+
+        # Missing values are left out, and groups without any value get a
+        # missing value.
+        if self.types[name] == INT:
+            valid = values != INT_MISSING
+        elif self.types[name] == FLOAT:
+            valid = ~numpy.isnan(values)
+        else:
+            valid = None
+        if valid is not None and not valid.all():
+            values = values[valid]
+            inverse = inverse[valid]
+            counts = numpy.bincount(inverse, minlength=num_groups)
+        empty = counts == 0
+
+        if function in ('sum', 'mean'):
+            sums = numpy.bincount(inverse, weights=values,
+                                  minlength=num_groups)
+            if function == 'mean':
+                with numpy.errstate(invalid='ignore', divide='ignore'):
+                    return sums / counts
+            if values.dtype.kind in 'iub':
+                sums = sums.astype(numpy.int64)
+            return self._fill_missing(sums, empty)
+
+        dtype = values.dtype
+        if dtype.kind == 'b':
+            # Booleans cannot hold the initial values, and the infinities
+            # would be cast to True
+            values = values.astype(numpy.int8)
+        result = numpy.zeros(num_groups, dtype=values.dtype)
+        if function == 'min':
+            result[:] = numpy.iinfo(values.dtype).max \
+                if values.dtype.kind in 'iu' else numpy.inf
+            numpy.minimum.at(result, inverse, values)
+        else:
+            result[:] = numpy.iinfo(values.dtype).min \
+                if values.dtype.kind in 'iu' else -numpy.inf
+            numpy.maximum.at(result, inverse, values)
+        return self._fill_missing(result.astype(dtype), empty)
+
+    @staticmethod
+    def _fill_missing(result, empty):
+        if empty.any():
+            if result.dtype.kind == 'f':
+                result[empty] = numpy.nan
+            elif result.dtype.kind in 'iu':
+                result[empty] = INT_MISSING
+        return result
+
+    def join(self, other, on, columns, prefix=''):
+        """Adds columns of another table by many-to-one key lookup
+
+        :param other: the Table holding the columns to add, with at most one
+                      row per key
+        :param on: a list of (column name, other column name) pairs of key
+                   columns, ideally categorical ones
+        :param columns: names of the columns of other to add
+        :param prefix: prefix of the names of the added columns
+        :returns: a new Table. Rows without a match in other get missing
+                  values.
+        """
+        # Express the keys of both tables in the categories of other, then
+        # combine them into a single integer per row.
+        left_key = numpy.zeros(len(self), dtype=numpy.int64)
+        right_key = numpy.zeros(len(other), dtype=numpy.int64)
+        unmatched = numpy.zeros(len(self), dtype=bool)
+        for (name, other_name) in on:
+            other_column = _as_categorical(other.columns[other_name])
+            radix = len(other_column.categories) + 1
+            left_codes = _as_categorical(self.columns[name]).recode(
+                other_column.categories)
+            unmatched |= left_codes < 0
+            left_key = left_key * radix + left_codes + 1
+            right_key = right_key * radix + other_column.codes + 1
+
+        order = numpy.argsort(right_key, kind='mergesort')
+        positions = numpy.searchsorted(right_key[order], left_key)
+        positions = numpy.minimum(positions, max(len(other) - 1, 0))
+        rows = order[positions] if len(other) else positions
+        if len(other):
+            unmatched |= right_key[rows] != left_key
+        else:
+            unmatched[:] = True
+
+        result = collections.OrderedDict(self.columns)
+        types = dict(self.types)
+        for name in columns:
+            column = other.columns[name]
+            if isinstance(column, Categorical):
+                codes = column.codes[rows] if len(other) else \
+                    numpy.full(len(self), -1, dtype=numpy.int32)
+                codes = numpy.where(unmatched, -1, codes).astype(numpy.int32)
+                added = Categorical(codes, column.categories)
+            else:
+                added = numpy.array(column[rows]) if len(other) else \
+                    numpy.zeros(len(self), dtype=column.dtype)
+                if added.dtype.kind == 'f':
+                    added[unmatched] = numpy.nan
+                elif added.dtype.kind in 'iu':
+                    added[unmatched] = INT_MISSING
+                elif added.dtype.kind == 'O':
+                    added[unmatched] = None
+            result[prefix + name] = added
+            types[prefix + name] = other.types[name]
+        return Table(result, types)
+
+    def rows(self):
+        """Iterates over the rows as dictionaries"""
+
+        names = list(self.columns)
+        values = [self[name] for name in names]
+        for index in range(len(self)):
+            yield dict((name, column[index])
+                       for (name, column) in zip(names, values))
+
+
+class TableBuilder(object):
+    """Accumulates records into compact column buffers"""
+
+    _TYPECODES = {INT: 'q', FLOAT: 'd', BOOL: 'b'}
+
+    def __init__(self, fields, schema):
+        """Creates TableBuilder object
+
+        :param fields: names of the record fields
+        :param schema: a dictionary of field names and column types
+        """
+        self.fields = list(fields)
+        self.types = {'host': CATEGORY}
+        for field in self.fields:
+            self.types[field] = schema.get(field, OBJECT)
+
+        self._buffers = collections.OrderedDict()
+        self._categories = {}
+        for name in ['host'] + self.fields:
+            column_type = self.types[name]
+            if column_type == CATEGORY:
+                self._buffers[name] = array.array('i')
+                self._categories[name] = collections.OrderedDict()
+            elif column_type in self._TYPECODES:
+                self._buffers[name] = array.array(
+                    self._TYPECODES[column_type])
+            else:
+                self._buffers[name] = []
+
+    def append(self, host, record):
+        self._append('host', host)
+        for (name, value) in zip(self.fields, record):
+            self._append(name, value)
+
+    def _append(self, name, value):
+        column_type = self.types[name]
+        buf = self._buffers[name]
+        if column_type == CATEGORY:
+            if value is None:
+                buf.append(-1)
+            else:
+                categories = self._categories[name]
+                code = categories.get(value)
+                if code is None:
+                    code = categories[value] = len(categories)
+                buf.append(code)
+        elif column_type == INT:
+            buf.append(INT_MISSING if value is None else int(value))
+        elif column_type == FLOAT:
+            buf.append(float('nan') if value is None else float(value))
+        elif column_type == BOOL:
+            buf.append(bool(value))
+        else:
+            buf.append(value)
+
+    def build(self):
+        """Returns a Table holding the records appended so far"""
+
+        _require_numpy()
+        columns = collections.OrderedDict()
+        for (name, buf) in self._buffers.items():
+            column_type = self.types[name]
+            if column_type == CATEGORY:
+                columns[name] = Categorical(
+                    numpy.array(buf, dtype=numpy.int32),
+                    list(self._categories[name]))
+            elif column_type == INT:
+                columns[name] = numpy.array(buf, dtype=numpy.int64)
+            elif column_type == FLOAT:
+                columns[name] = numpy.array(buf, dtype=numpy.float64)
+            elif column_type == BOOL:
+                columns[name] = numpy.array(buf, dtype=bool)
+            else:
+                column = numpy.empty(len(buf), dtype=object)
+                column[:] = buf
+                columns[name] = column
+        return Table(columns, self.types)
+
+
+class FleetInventory(object):
+    """Columnar inventory of many nodes, one table per inventory kind
+
+    The kinds are those of dracclient.export.INVENTORY_KINDS, so the
+    (host, kind, record) tuples of export.iter_inventory() can be ingested
+    directly.
+    """
+
+    def __init__(self):
+        _require_numpy()
+        self._builders = {}
+        self._tables = {}
+
+    def add(self, host, kind, records):
+        """Ingests records of one kind retrieved from a host
+
+        :param host: host the records were retrieved from
+        :param kind: inventory kind, e.g. 'physical_disks'
+        :param records: a list of inventory namedtuples, as returned by
+                        RAIDManagement and InventoryManagement
+        """
+        for record in records:
+            builder = self._builders.get(kind)
+            if builder is None:
+                builder = self._builders[kind] = TableBuilder(
+                    record._fields, SCHEMAS.get(kind, {}))
+            builder.append(host, record)
+        self._tables.pop(kind, None)
+
+    def add_from(self, items):
+        """Ingests an iterable of (host, kind, record) tuples"""
+
+        for (host, kind, record) in items:
+            self.add(host, kind, [record])
+
+    def table(self, kind):
+        """Returns the Table of an inventory kind"""
+
+        table = self._tables.get(kind)
+        if table is None:
+            builder = self._builders.get(kind)
+            if builder is None:
+                raise KeyError(kind)
+            table = self._tables[kind] = builder.build()
+        return table
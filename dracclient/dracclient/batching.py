@@ -0,0 +1,209 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Adaptive sizing of the batches of items returned by enumerations.
+
+A sizer is passed to wsman.Client, which asks it for the MaxElements of the
+Enumerate and Pull requests sent without an explicit max_elems and reports
+how every request went. Share one sizer between all the clients of a process
+so that hosts running the same firmware start from the size learned on the
+others.
+"""
+
+import collections
+import logging
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+
+class _Entry(object):
+    """Batch size learned for a resource"""
+
+    def __init__(self, size):
+        self.size = size
+        # Smallest size which failed, not tried again until ceiling_expires
+        self.ceiling = None
+        self.ceiling_expires = None
+
+
+class AdaptiveBatchSizer(object):
+    """Thread-safe tuner of the MaxElements of enumerations
+
+    Sizes are learned per host and resource URI. The size is doubled after
+    responses received well within target_latency and halved after slow or
+    large responses and after failures. A size which failed is not tried
+    again for ceiling_ttl seconds.
+
+    Sizes are also remembered per iDRAC firmware version and resource URI,
+    which is the starting point of hosts running the same firmware.
+    wsman.Client reads the firmware version of its host once, before its
+    first enumeration sized by the sizer.
+    """
+
+    def __init__(self, initial=100, minimum=10, maximum=1000,
+                 target_latency=5, max_response_bytes=4 * 1024 * 1024,
+                 ceiling_ttl=3600, max_entries=10000):
+        """Creates AdaptiveBatchSizer object
+
+        :param initial: size used for resources nothing was learned about
+        :param minimum: smallest size used
+        :param maximum: largest size used
+        :param target_latency: number of seconds a request should take at
+                               most. Responses received within half of it
+                               grow the size.
+        :param max_response_bytes: number of bytes a response should hold at
+                                   most. Responses holding less than half of
+                                   it grow the size.
+        :param ceiling_ttl: number of seconds after which a size which
+                            failed may be tried again, or None to never try
+                            it again
+        :param max_entries: maximum number of sizes held, or None for no
+                            limit
+        """
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.max_response_bytes = max_response_bytes
+        self.ceiling_ttl = ceiling_ttl
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def size(self, host, resource_uri, firmware_version=None):
+        """Returns the batch size to request
+
+        :param host: hostname or IP of the DRAC interface
+        :param resource_uri: URI of the resource enumerated
+        :param firmware_version: version of the firmware of the DRAC
+                                 interface, or None if unknown
+        :returns: the maximum number of elements to request
+        """
+        with self._lock:
+            return self._entry(host, resource_uri, firmware_version).size
+
+    def record_response(self, host, resource_uri, firmware_version,
+                        max_elems, elapsed, content_length=None):
+        """Adjusts the batch size after a successful request
+
+        :param host: hostname or IP of the DRAC interface
+        :param resource_uri: URI of the resource enumerated
+        :param firmware_version: version of the firmware of the DRAC
+                                 interface, or None if unknown
+        :param max_elems: maximum number of elements requested
+        :param elapsed: number of seconds the request took
+        :param content_length: number of bytes of the response, or None if
+                               unknown
+        """
+        slow = (elapsed > self.target_latency or
+                (content_length is not None and
+                 content_length > self.max_response_bytes))
+        fast = (elapsed <= self.target_latency / 2.0 and
+                (content_length is None or
+                 content_length <= self.max_response_bytes / 2.0))
+
+        with self._lock:
+            entry = self._entry(host, resource_uri, firmware_version)
+            if slow:
+                size = min(entry.size, max(self.minimum, max_elems // 2))
+            elif fast:
+                size = max(entry.size, min(self._limit(entry), max_elems * 2))
+            else:
+                return
+
+            self._update(host, resource_uri, firmware_version, entry, size)
+
+    def record_failure(self, host, resource_uri, firmware_version,
+                       max_elems):
+        """Shrinks the batch size after a failed request
+
+        :param host: hostname or IP of the DRAC interface
+        :param resource_uri: URI of the resource enumerated
+        :param firmware_version: version of the firmware of the DRAC
+                                 interface, or None if unknown
+        :param max_elems: maximum number of elements requested
+        """
+        with self._lock:
+            entry = self._entry(host, resource_uri, firmware_version)
+            if entry.ceiling is None or max_elems <= entry.ceiling:
+                entry.ceiling = max_elems
+                if self.ceiling_ttl is not None:
+                    entry.ceiling_expires = time.time() + self.ceiling_ttl
+
+            size = min(entry.size, max(self.minimum, max_elems // 2))
+            self._update(host, resource_uri, firmware_version, entry, size)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _limit(self, entry):
+        if (entry.ceiling is not None and entry.ceiling_expires is not None
+                and entry.ceiling_expires <= time.time()):
+            entry.ceiling = None
+            entry.ceiling_expires = None
+
+        if entry.ceiling is None:
+            return self.maximum
+        return max(self.minimum, min(self.maximum, entry.ceiling - 1))
+
+    def _entry(self, host, resource_uri, firmware_version):
+        # Returns the entry of the host, created from the one of its
+        # firmware version if there is one.
+        entry = self._get(('host', host, resource_uri))
+        if entry is not None:
+            return entry
+
+        entry = _Entry(self.initial)
+        if firmware_version is not None:
+            firmware_entry = self._get(
+                ('firmware', firmware_version, resource_uri))
+            if firmware_entry is not None:
+                entry.size = firmware_entry.size
+                entry.ceiling = firmware_entry.ceiling
+                entry.ceiling_expires = firmware_entry.ceiling_expires
+
+        self._put(('host', host, resource_uri), entry)
+        return entry
+
+    def _update(self, host, resource_uri, firmware_version, entry, size):
+        if size != entry.size:
+            LOG.debug('Batch size of %(resource_uri)s on %(host)s changed '
+                      'from %(old)d to %(new)d',
+                      {'resource_uri': resource_uri, 'host': host,
+                       'old': entry.size, 'new': size})
+        entry.size = size
+
+        if firmware_version is not None:
+            firmware_entry = _Entry(size)
+            firmware_entry.ceiling = entry.ceiling
+            firmware_entry.ceiling_expires = entry.ceiling_expires
+            self._put(('firmware', firmware_version, resource_uri),
+                      firmware_entry)
+
+    def _get(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            # Refresh the position of the entry in the LRU order
+            self._entries[key] = entry
+        return entry
+
+    def _put(self, key, entry):
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while (self.max_entries is not None and
+               len(self._entries) > self.max_entries):
+            self._entries.popitem(last=False)
@@ -0,0 +1,156 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Change detection of enumerated resources.
+
+Periodic scrapes mostly receive the same items over and over. The items of
+an enumeration are hashed as received, and when the hash matches the one of
+the previous enumeration of the same resource the objects parsed back then
+are returned, instead of walking the XML tree and building them again.
+"""
+
+import collections
+import hashlib
+import threading
+
+from dracclient import wsman
+
+
+class ItemsDigest(object):
+    """Hash of the items received by an enumeration"""
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+        self.complete = True
+
+    def update(self, content):
+        """Adds the items of a response to the hash
+
+        :param content: raw content of an Enumerate or Pull response
+        """
+        match = wsman.ITEMS_RE.search(content)
+        if match is None:
+            # Unexpected layout, never report this enumeration as unchanged
+            self.complete = False
+            return
+        self._hash.update(match.group(0))
+
+    def reset(self):
+        """Discards the responses added, e.g. on restarting an enumeration"""
+
+        self._hash = hashlib.sha256()
+        self.complete = True
+
+    def hexdigest(self):
+        """Returns the hash, or None if some responses could not be hashed"""
+
+        if not self.complete:
+            return None
+        return self._hash.hexdigest()
+
+
+class ParsedList(list):
+    """List of parsed objects telling whether they changed
+
+    The changed attribute is False when the objects were returned from the
+    cache, because the items received were identical to the previous ones.
+    """
+
+    def __init__(self, items=(), changed=True):
+        super(ParsedList, self).__init__(items)
+        self.changed = changed
+
+
+class ParsedDict(dict):
+    """Dictionary of parsed objects telling whether they changed
+
+    The changed attribute is False when the objects were returned from the
+    cache, because the items received were identical to the previous ones.
+    """
+
+    def __init__(self, items=(), changed=True):
+        super(ParsedDict, self).__init__(items)
+        self.changed = changed
+
+
+def mark_changed(result, changed):
+    """Returns a copy of a parsed list or dictionary with a changed flag
+
+    :param result: a list or a dictionary of parsed objects
+    :param changed: whether the objects differ from the previous ones
+    :returns: a ParsedList or ParsedDict object
+    """
+    if isinstance(result, dict):
+        return ParsedDict(result, changed)
+    return ParsedList(result, changed)
+
+
+class ParseCache(object):
+    """Thread-safe cache of parsed enumeration results
+
+    One cache can be shared by the clients of many hosts. The least recently
+    used entries are evicted once max_entries is reached.
+
+    The cached objects themselves are returned on a hit, so they must not be
+    modified by callers.
+    """
+
+    def __init__(self, max_entries=10000):
+        """Creates ParseCache object
+
+        :param max_entries: maximum number of results held, or None for no
+                            limit
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, digest):
+        """Returns the cached result for a key if its digest matches
+
+        :param key: a hashable key, e.g. a (host, resource URI) tuple
+        :param digest: hash of the items just received, or None
+        :returns: the result cached for the key, or None if there is none or
+                  it was parsed from different items
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if digest is None or entry is None or entry[0] != digest:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            # Refresh the position of the entry in the LRU order
+            del self._entries[key]
+            self._entries[key] = entry
+            return entry[1]
+
+    def put(self, key, digest, result):
+        """Caches the result parsed from items with the given digest"""
+
+        if digest is None:
+            return
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (digest, result)
+            while (self.max_entries is not None and
+                   len(self._entries) > self.max_entries):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -15,11 +15,19 @@
 Wrapper for pywsman.Client
 """
 
+import collections
 import logging
+import threading
 import time
+import weakref
 
+from lxml import etree as ElementTree
+
+from dracclient import cache
 from dracclient import constants
+from dracclient import deadline
 from dracclient import exceptions
+from dracclient import ratelimit
 from dracclient.resources import bios
 from dracclient.resources import idrac_card
 from dracclient.resources import inventory
@@ -28,13 +36,33 @@ from dracclient.resources import lifecycle_controller
 from dracclient.resources import raid
 from dracclient.resources import system
 from dracclient.resources import uris
+from dracclient import retry
+from dracclient import singleflight
+from dracclient import snapshot
 from dracclient import utils
 from dracclient import wsman
 
 IDRAC_IS_READY = "LC061"
 
+WSManIdentity = collections.namedtuple(
+    'WSManIdentity',
+    ['protocol_version', 'product_vendor', 'product_version'])
+
 LOG = logging.getLogger(__name__)
 
+# Gates serializing the invocations of the thread-safe clients, shared by
+# the clients of the same node. A gate is dropped with its last client.
+_INVOKE_GATES = weakref.WeakValueDictionary()
+_INVOKE_GATES_LOCK = threading.Lock()
+
+
+def _get_invoke_gate(host, port):
+    with _INVOKE_GATES_LOCK:
+        gate = _INVOKE_GATES.get((host, port))
+        if gate is None:
+            gate = _INVOKE_GATES[(host, port)] = ratelimit.ConcurrencyGate(1)
+        return gate
+
 
 class DRACClient(object):
     """Client for managing DRAC nodes"""
@@ -49,7 +77,13 @@ class DRACClient(object):
             ssl_retry_delay=constants.DEFAULT_WSMAN_SSL_ERROR_RETRY_DELAY_SEC,
             ready_retries=constants.DEFAULT_IDRAC_IS_READY_RETRIES,
             ready_retry_delay=(
-                constants.DEFAULT_IDRAC_IS_READY_RETRY_DELAY_SEC)):
+                constants.DEFAULT_IDRAC_IS_READY_RETRY_DELAY_SEC),
+            retry_policy=None, ready_retry_policy=None,
+            connect_timeout=constants.DEFAULT_WSMAN_CONNECT_TIMEOUT_SEC,
+            read_timeout=constants.DEFAULT_WSMAN_READ_TIMEOUT_SEC,
+            rate_limiter=None, parse_cache=None, coalesce_requests=False,
+            thread_safe=False, session=None, pull_retry=None,
+            batch_sizer=None, parse_pool=None):
         """Creates client object
 
         :param host: hostname or IP of the DRAC interface
@@ -65,10 +99,52 @@ class DRACClient(object):
                               ready
         :param ready_retry_delay: number of seconds to wait between
                                   checks if the iDRAC is ready
+        :param retry_policy: a dracclient.retry.RetryPolicy used to retry
+                             requests on connection and SSL failures.
+                             Overrides ssl_retries and ssl_retry_delay.
+        :param ready_retry_policy: a dracclient.retry.RetryPolicy used when
+                                   waiting for the iDRAC to become ready.
+                                   Overrides ready_retries and
+                                   ready_retry_delay.
+        :param connect_timeout: number of seconds to wait for a connection
+                                to the DRAC interface, or None to wait
+                                indefinitely
+        :param read_timeout: number of seconds to wait for data from the
+                             DRAC interface, or None to wait indefinitely
+        :param rate_limiter: a dracclient.ratelimit.RateLimiter shared with
+                             other clients, or None
+        :param parse_cache: a dracclient.cache.ParseCache used to skip
+                            parsing enumerations whose items did not change
+                            since the previous call, or None
+        :param coalesce_requests: whether identical read-only requests
+                                  issued concurrently by several threads
+                                  share a single request and its result
+        :param thread_safe: whether invocations of methods, which change the
+                            state of the node, are serialized while reads
+                            run in parallel, for using the client from many
+                            threads. Invocations are serialized with those
+                            of the other thread-safe clients of the same
+                            host and port.
+        :param session: a requests.Session keeping connections to the DRAC
+                        interface open between requests, or None
+        :param pull_retry: a dracclient.retry.PullRetry used to retry the
+                           Pull requests of enumerations which failed, or
+                           None
+        :param batch_sizer: a dracclient.batching.AdaptiveBatchSizer picking
+                            the number of items requested by enumerations,
+                            or None
+        :param parse_pool: a dracclient.offload.ParsePool shared with other
+                           clients, parsing the settings lists in worker
+                           processes, or None
         """
         self.client = WSManClient(host, username, password, port, path,
                                   protocol, ssl_retries, ssl_retry_delay,
-                                  ready_retries, ready_retry_delay)
+                                  ready_retries, ready_retry_delay,
+                                  retry_policy, ready_retry_policy,
+                                  connect_timeout, read_timeout,
+                                  rate_limiter, parse_cache,
+                                  coalesce_requests, thread_safe, session,
+                                  pull_retry, batch_sizer, parse_pool)
         self._job_mgmt = job.JobManagement(self.client)
         self._power_mgmt = bios.PowerManagement(self.client)
         self._boot_mgmt = bios.BootManagement(self.client)
@@ -145,12 +221,15 @@ class DRACClient(object):
         return self._boot_mgmt.change_boot_device_order(boot_mode,
                                                         boot_device_list)
 
-    def list_bios_settings(self, by_name=True):
+    def list_bios_settings(self, by_name=True, lazy=False):
         """List the BIOS configuration settings
 
         :param by_name: Controls whether returned dictionary uses BIOS
                         attribute name as key. If set to False, instance_id
                         will be used.
+        :param lazy: Controls whether the attributes are parsed on first
+                     access rather than up front. Lazy attributes keep the
+                     response alive until they are fully parsed.
         :returns: a dictionary with the BIOS settings using its name as the
                   key. The attributes are either BIOSEnumerableAttribute,
                   BIOSStringAttribute or BIOSIntegerAttribute objects.
@@ -159,7 +238,7 @@ class DRACClient(object):
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._bios_cfg.list_bios_settings(by_name)
+        return self._bios_cfg.list_bios_settings(by_name, lazy=lazy)
 
     def set_bios_settings(self, settings):
         """Sets the BIOS configuration
@@ -192,7 +271,8 @@ class DRACClient(object):
         """
         return self._bios_cfg.set_bios_settings(settings)
 
-    def list_idrac_settings(self, by_name=False, fqdd_filter=IDRAC_FQDD):
+    def list_idrac_settings(self, by_name=False, fqdd_filter=IDRAC_FQDD,
+                            lazy=False):
         """List the iDRAC configuration settings
 
         :param by_name: Controls whether returned dictionary uses iDRAC card
@@ -201,6 +281,9 @@ class DRACClient(object):
                         form "group_id#name".
         :param fqdd_filter: An FQDD used to filter the instances.  Note that
                             this is only used when by_name is True.
+        :param lazy: Controls whether the attributes are parsed on first
+                     access rather than up front. Lazy attributes keep the
+                     response alive until they are fully parsed.
         :returns: a dictionary with the iDRAC settings using instance_id as the
                   key except when by_name is True. The attributes are either
                   iDRACCardEnumerableAttribute, iDRACCardStringAttribute or
@@ -211,7 +294,8 @@ class DRACClient(object):
                  interface
         """
         return self._idrac_cfg.list_idrac_settings(by_name=by_name,
-                                                   fqdd_filter=fqdd_filter)
+                                                   fqdd_filter=fqdd_filter,
+                                                   lazy=lazy)
 
     def set_idrac_settings(self, settings, idrac_fqdd=IDRAC_FQDD):
         """Sets the iDRAC configuration settings
@@ -657,6 +741,48 @@ class DRACClient(object):
 
         return self.client.is_idrac_ready()
 
+    def identify(self):
+        """Identifies the WS-Man service of the DRAC interface
+
+        The Identify request is unauthenticated and does not involve the
+        Lifecycle Controller.
+
+        :returns: a WSManIdentity object
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+        doc = self.client.identify()
+
+        def _get_attr(attr_name):
+            elem = utils.find_xml(doc, attr_name, wsman.NS_WSMAN_IDENTITY)
+            return elem.text if elem is not None else None
+
+        return WSManIdentity(protocol_version=_get_attr('ProtocolVersion'),
+                             product_vendor=_get_attr('ProductVendor'),
+                             product_version=_get_attr('ProductVersion'))
+
+    def is_alive(self, timeout=constants.DEFAULT_IDENTIFY_TIMEOUT_SEC):
+        """Indicates if the WS-Man service of the DRAC interface answers
+
+        Sends a single unauthenticated Identify request, without retries,
+        which makes it suitable for sweeping the reachability of many nodes.
+        Use is_idrac_ready() to check that the iDRAC accepts commands.
+
+        :param timeout: number of seconds to wait for the response
+        :returns: Boolean indicating whether a valid response was received
+        """
+        try:
+            with deadline.Deadline(timeout):
+                self.client.identify(retry_policy=retry.FixedDelay(1))
+        except (exceptions.WSManRequestFailure,
+                exceptions.WSManInvalidResponse,
+                ElementTree.XMLSyntaxError) as ex:
+            LOG.debug('WS-Man service of %(host)s is not answering: '
+                      '%(error)s', {'host': self.client.host, 'error': ex})
+            return False
+
+        return True
+
     def wait_until_idrac_is_ready(self, retries=None, retry_delay=None):
         """Waits until the iDRAC is in a ready state
 
@@ -668,6 +794,10 @@ class DRACClient(object):
                             retries. If None, the value of
                             ready_retry_delay that was provided
                             when the object was created is used.
+
+        If neither retries nor retry_delay is given, the ready_retry_policy
+        provided when the object was created is used instead.
+
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
@@ -677,11 +807,56 @@ class DRACClient(object):
 
         return self.client.wait_until_idrac_is_ready(retries, retry_delay)
 
+    def deadline(self, timeout):
+        """Bounds the duration of the calls made within a block
+
+        Returns a context manager. Every call issued from the current thread
+        inside the block, including readiness waits, pulls and retries, fails
+        with DRACDeadlineExceeded once timeout seconds have elapsed::
+
+            with client.deadline(30):
+                client.list_boot_devices()
+                client.set_bios_settings(settings)
+
+        :param timeout: number of seconds available for the block
+        :returns: a dracclient.deadline.Deadline object
+        """
+
+        return deadline.Deadline(timeout)
+
+    def snapshot(self, sections=None):
+        """Captures the configuration state of the node
+
+        The snapshot holds the BIOS, iDRAC, LC and System settings, the boot
+        modes and devices, the RAID layout and the hardware inventory. Use
+        dracclient.snapshot.diff() to compare two snapshots.
+
+        :param sections: names of the sections to capture, keys of
+                         dracclient.snapshot.SECTIONS. Defaults to all of
+                         them.
+        :returns: a dracclient.snapshot.Snapshot object
+        :raises: InvalidParameterValue on unknown sections
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        :raises: DRACOperationFailed on error reported back by the DRAC
+                 interface
+        """
+
+        return snapshot.take_snapshot(self, sections)
+
+    def close(self):
+        """Closes the connections kept open to the DRAC interface, if any"""
+
+        self.client.close()
+
 
 class WSManClient(wsman.Client):
     """Wrapper for wsman.Client that can wait until iDRAC is ready
 
        Additionally, the Invoke operation offers return value checking.
+       Client objects keep no per-request state and can be shared between
+       threads. In thread-safe mode, invocations are serialized, which
+       prevents concurrent configuration changes of the same node.
     """
 
     def __init__(
@@ -691,7 +866,13 @@ class WSManClient(wsman.Client):
             ssl_retry_delay=constants.DEFAULT_WSMAN_SSL_ERROR_RETRY_DELAY_SEC,
             ready_retries=constants.DEFAULT_IDRAC_IS_READY_RETRIES,
             ready_retry_delay=(
-                constants.DEFAULT_IDRAC_IS_READY_RETRY_DELAY_SEC)):
+                constants.DEFAULT_IDRAC_IS_READY_RETRY_DELAY_SEC),
+            retry_policy=None, ready_retry_policy=None,
+            connect_timeout=constants.DEFAULT_WSMAN_CONNECT_TIMEOUT_SEC,
+            read_timeout=constants.DEFAULT_WSMAN_READ_TIMEOUT_SEC,
+            rate_limiter=None, parse_cache=None, coalesce_requests=False,
+            thread_safe=False, session=None, pull_retry=None,
+            batch_sizer=None, parse_pool=None):
         """Creates client object
 
         :param host: hostname or IP of the DRAC interface
@@ -707,24 +888,94 @@ class WSManClient(wsman.Client):
                               ready
         :param ready_retry_delay: number of seconds to wait between
                                   checks if the iDRAC is ready
+        :param retry_policy: a dracclient.retry.RetryPolicy used to retry
+                             requests on connection and SSL failures.
+                             Overrides ssl_retries and ssl_retry_delay.
+        :param ready_retry_policy: a dracclient.retry.RetryPolicy used when
+                                   waiting for the iDRAC to become ready.
+                                   Overrides ready_retries and
+                                   ready_retry_delay.
+        :param connect_timeout: number of seconds to wait for a connection
+                                to the DRAC interface, or None to wait
+                                indefinitely
+        :param read_timeout: number of seconds to wait for data from the
+                             DRAC interface, or None to wait indefinitely
+        :param rate_limiter: a dracclient.ratelimit.RateLimiter shared with
+                             other clients, or None
+        :param parse_cache: a dracclient.cache.ParseCache used to skip
+                            parsing enumerations whose items did not change
+                            since the previous call, or None
+        :param coalesce_requests: whether identical read-only requests
+                                  issued concurrently by several threads
+                                  share a single request and its result
+        :param thread_safe: whether invocations of methods, which change the
+                            state of the node, are serialized while reads
+                            run in parallel, for using the client from many
+                            threads. Invocations are serialized with those
+                            of the other thread-safe clients of the same
+                            host and port.
+        :param session: a requests.Session keeping connections to the DRAC
+                        interface open between requests, or None
+        :param pull_retry: a dracclient.retry.PullRetry used to retry the
+                           Pull requests of enumerations which failed, or
+                           None
+        :param batch_sizer: a dracclient.batching.AdaptiveBatchSizer picking
+                            the number of items requested by enumerations,
+                            or None
+        :param parse_pool: a dracclient.offload.ParsePool shared with other
+                           clients, parsing the settings lists in worker
+                           processes, or None
         """
         super(WSManClient, self).__init__(host, username, password,
                                           port, path, protocol, ssl_retries,
-                                          ssl_retry_delay)
+                                          ssl_retry_delay, retry_policy,
+                                          connect_timeout, read_timeout,
+                                          rate_limiter, session, pull_retry,
+                                          batch_sizer)
 
         self._ready_retries = ready_retries
         self._ready_retry_delay = ready_retry_delay
-
-    def enumerate(self, resource_uri, optimization=True, max_elems=100,
+        if ready_retry_policy is None:
+            ready_retry_policy = retry.FixedDelay(ready_retries,
+                                                  ready_retry_delay)
+        self._ready_retry_policy = ready_retry_policy
+        self.parse_cache = parse_cache
+        self.parse_pool = parse_pool
+        self._flights = None
+        if coalesce_requests:
+            self._flights = singleflight.Group()
+
+        # In thread-safe mode, concurrent readiness checks share a single
+        # request and invocations are serialized, one at a time per node
+        # across all the thread-safe clients of the node.
+        self._ready_flights = self._flights
+        self._invoke_gate = None
+        if thread_safe:
+            if self._ready_flights is None:
+                self._ready_flights = singleflight.Group()
+            self._invoke_gate = _get_invoke_gate(self.host, self.port)
+
+    def _coalesce(self, key, func, *args, **kwargs):
+        # Read-only requests issued concurrently with the same key share a
+        # single request. The results returned are shared as well, so they
+        # must not be modified.
+        if self._flights is None:
+            return func(*args, **kwargs)
+
+        return self._flights.do(key, func, *args, **kwargs)
+
+    def enumerate(self, resource_uri, optimization=True, max_elems=None,
                   auto_pull=True, filter_query=None, filter_dialect='cql',
-                  wait_for_idrac=True):
+                  wait_for_idrac=True, enumeration_mode=None):
         """Executes enumerate operation over WS-Man
 
         :param resource_uri: URI of resource to enumerate
         :param optimization: flag to enable enumeration optimization. If
                              disabled, the enumeration returns only an
                              enumeration context.
-        :param max_elems: maximum number of elements returned by the operation
+        :param max_elems: maximum number of elements returned by each
+                          operation, or None to let the batch sizer of the
+                          client pick it for every operation
         :param auto_pull: flag to enable automatic pull on the enumeration
                           context, merging the items returned
         :param filter_query: filter query string
@@ -733,16 +984,198 @@ class WSManClient(wsman.Client):
         :param wait_for_idrac: indicates whether or not to wait for the
             iDRAC to be ready to accept commands before issuing the
             command
+        :param enumeration_mode: one of wsman.ENUMERATION_MODES to receive
+                                 endpoint references of the instances, or
+                                 None to receive the instances only
         :returns: an lxml.etree.Element object of the response received
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
+        :raises: InvalidParameterValue on invalid enumeration mode
+        """
+        def _enumerate():
+            if wait_for_idrac:
+                self.wait_until_idrac_is_ready()
+
+            return super(WSManClient, self).enumerate(
+                resource_uri, optimization, max_elems, auto_pull,
+                filter_query, filter_dialect, enumeration_mode)
+
+        return self._coalesce(
+            ('enumerate', resource_uri, optimization, max_elems, auto_pull,
+             filter_query, filter_dialect, enumeration_mode, wait_for_idrac),
+            _enumerate)
+
+    def enumerate_selectors(self, resource_uri, max_elems=None,
+                            filter_query=None, filter_dialect='cql',
+                            wait_for_idrac=True):
+        """Lists the selectors of the instances of a resource
+
+        :param resource_uri: URI of resource to enumerate
+        :param max_elems: maximum number of elements returned by each
+                          operation, or None to let the batch sizer of the
+                          client pick it for every operation
+        :param filter_query: filter query string
+        :param filter_dialect: filter dialect. Valid options are: 'cql' and
+                               'wql'.
+        :param wait_for_idrac: indicates whether or not to wait for the
+            iDRAC to be ready to accept commands before issuing the
+            command
+        :returns: a list of dictionaries of selector names and values, one
+                  per instance
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+        def _enumerate_selectors():
+            if wait_for_idrac:
+                self.wait_until_idrac_is_ready()
+
+            return super(WSManClient, self).enumerate_selectors(
+                resource_uri, max_elems, filter_query, filter_dialect)
+
+        return self._coalesce(
+            ('enumerate_selectors', resource_uri, max_elems, filter_query,
+             filter_dialect, wait_for_idrac),
+            _enumerate_selectors)
+
+    def iter_items(self, resource_uri, max_elems=None, filter_query=None,
+                   filter_dialect='cql', enumeration_mode=None,
+                   wait_for_idrac=True):
+        """Enumerates a resource, streaming the items received
+
+        Every item is yielded as soon as it is parsed and dropped once the
+        next one is requested, see wsman.Client.iter_items().
+
+        :param resource_uri: URI of resource to enumerate
+        :param max_elems: maximum number of elements returned by each
+                          operation, or None to let the batch sizer of the
+                          client pick it for every operation
+        :param filter_query: filter query string
+        :param filter_dialect: filter dialect. Valid options are: 'cql' and
+                               'wql'.
+        :param enumeration_mode: one of wsman.ENUMERATION_MODES, or None
+        :param wait_for_idrac: indicates whether or not to wait for the
+            iDRAC to be ready to accept commands before issuing the
+            command
+        :returns: a generator of lxml.etree.Element objects
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+        if wait_for_idrac:
+            self.wait_until_idrac_is_ready()
+
+        return super(WSManClient, self).iter_items(
+            resource_uri, max_elems, filter_query, filter_dialect,
+            enumeration_mode)
+
+    def enumerate_parsed(self, resource_uri, parse, cache_key=None,
+                         filter_query=None, filter_dialect='cql',
+                         wait_for_idrac=True, offload=False, shared=True):
+        """Enumerates a resource and parses the items received
+
+        When the client has a parse cache and the items received are
+        identical to those received by the previous call for the same
+        resource, the objects parsed back then are returned without walking
+        the response again.
+
+        :param resource_uri: URI of resource to enumerate
+        :param parse: a callable taking the lxml.etree.Element of the
+                      response and returning a list or a dictionary of
+                      parsed objects
+        :param cache_key: a hashable value distinguishing calls parsing the
+                          same resource differently
+        :param filter_query: filter query string
+        :param filter_dialect: filter dialect. Valid options are: 'cql' and
+                               'wql'.
+        :param wait_for_idrac: indicates whether or not to wait for the
+            iDRAC to be ready to accept commands before issuing the
+            command
+        :param offload: whether the response may be parsed by the parse pool
+                        of the client. parse must then be picklable and
+                        return objects supported by dracclient.serialization.
+        :param shared: whether the parsed objects may be kept in the parse
+                       cache and shared with identical calls in flight.
+                       Objects referring to the response, such as lazy
+                       settings, must not be shared.
+        :returns: a cache.ParsedList or cache.ParsedDict object, whose
+                  changed attribute is False when it was returned from the
+                  cache
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
         """
+        if not shared:
+            return self._enumerate_parsed(resource_uri, parse, cache_key,
+                                          filter_query, filter_dialect,
+                                          wait_for_idrac, offload,
+                                          shared=False)
+
+        # The parse callable is left out of the key, cache_key tells apart
+        # the calls parsing the same resource differently.
+        return self._coalesce(
+            ('enumerate_parsed', resource_uri, cache_key, filter_query,
+             filter_dialect, wait_for_idrac),
+            self._enumerate_parsed, resource_uri, parse, cache_key,
+            filter_query, filter_dialect, wait_for_idrac, offload)
+
+    def _enumerate_parsed(self, resource_uri, parse, cache_key, filter_query,
+                          filter_dialect, wait_for_idrac, offload,
+                          shared=True):
         if wait_for_idrac:
             self.wait_until_idrac_is_ready()
 
-        return super(WSManClient, self).enumerate(resource_uri, optimization,
-                                                  max_elems, auto_pull,
-                                                  filter_query, filter_dialect)
+        # Unshared results are not cached either. The responses are kept
+        # raw until they need parsing: results found in the cache spare
+        # building the document, and the parse pool is sent the responses.
+        parse_cache = self.parse_cache if shared else None
+        items_digest = None
+        if parse_cache is not None:
+            items_digest = cache.ItemsDigest()
+        contents = self._enumerate(resource_uri, filter_query=filter_query,
+                                   filter_dialect=filter_dialect,
+                                   items_digest=items_digest, raw=True)
+        if parse_cache is None:
+            return cache.mark_changed(
+                self._parse(parse, contents, offload), True)
+
+        digest = items_digest.hexdigest()
+        key = (self.endpoint, resource_uri, filter_query, filter_dialect,
+               cache_key)
+
+        result = parse_cache.get(key, digest)
+        if result is not None:
+            return cache.mark_changed(result, False)
+
+        result = self._parse(parse, contents, offload)
+        parse_cache.put(key, digest, result)
+        return cache.mark_changed(result, True)
+
+    def _parse(self, parse, contents, offload):
+        if offload and self.parse_pool is not None:
+            return self.parse_pool.parse(parse, contents)
+        return parse(wsman.parse_enumeration(contents))
+
+    def get(self, resource_uri, selectors, wait_for_idrac=True):
+        """Retrieves a single instance of a resource over WS-Man
+
+        :param resource_uri: URI of the resource
+        :param selectors: dictionary of selectors identifying the instance
+        :param wait_for_idrac: indicates whether or not to wait for the
+            iDRAC to be ready to accept commands before issuing the
+            command
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManInstanceNotFound when no instance matches the selectors
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+        def _get():
+            if wait_for_idrac:
+                self.wait_until_idrac_is_ready()
+
+            return super(WSManClient, self).get(resource_uri, selectors)
+
+        return self._coalesce(
+            ('get', resource_uri, tuple(sorted(selectors.items())),
+             wait_for_idrac),
+            _get)
 
     def invoke(self,
                resource_uri,
@@ -754,6 +1187,9 @@ class WSManClient(wsman.Client):
                check_return_value=True):
         """Invokes a remote WS-Man method
 
+        In thread-safe mode, invocations are serialized: only one at a time
+        waits for the iDRAC to be ready and is sent.
+
         :param resource_uri: URI of the resource
         :param method: name of the method to invoke
         :param selectors: dictionary of selectors
@@ -773,7 +1209,24 @@ class WSManClient(wsman.Client):
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         :raises: DRACUnexpectedReturnValue on return value mismatch
+        :raises: DRACDeadlineExceeded if the current deadline passes while
+                 waiting for another invocation
         """
+        if self._invoke_gate is None:
+            return self._invoke(resource_uri, method, selectors, properties,
+                                expected_return_value, wait_for_idrac,
+                                check_return_value)
+
+        self._invoke_gate.acquire()
+        try:
+            return self._invoke(resource_uri, method, selectors, properties,
+                                expected_return_value, wait_for_idrac,
+                                check_return_value)
+        finally:
+            self._invoke_gate.release()
+
+    def _invoke(self, resource_uri, method, selectors, properties,
+                expected_return_value, wait_for_idrac, check_return_value):
         if wait_for_idrac:
             self.wait_until_idrac_is_ready()
 
@@ -818,17 +1271,27 @@ class WSManClient(wsman.Client):
         :raises: DRACUnexpectedReturnValue on return value mismatch
         """
 
+        if self._ready_flights is None:
+            return self._is_idrac_ready()
+
+        return self._ready_flights.do(('is_idrac_ready',),
+                                      self._is_idrac_ready)
+
+    def _is_idrac_ready(self):
         selectors = {'SystemCreationClassName': 'DCIM_ComputerSystem',
                      'SystemName': 'DCIM:ComputerSystem',
                      'CreationClassName': 'DCIM_LCService',
                      'Name': 'DCIM:LCService'}
 
-        result = self.invoke(uris.DCIM_LCService,
-                             'GetRemoteServicesAPIStatus',
-                             selectors,
-                             {},
-                             expected_return_value=utils.RET_SUCCESS,
-                             wait_for_idrac=False)
+        # The status request is read-only, so it bypasses the serialization
+        # of invocations.
+        result = self._invoke(uris.DCIM_LCService,
+                              'GetRemoteServicesAPIStatus',
+                              selectors,
+                              {},
+                              expected_return_value=utils.RET_SUCCESS,
+                              wait_for_idrac=False,
+                              check_return_value=True)
 
         message_id = utils.find_xml(result,
                                     'MessageID',
@@ -847,6 +1310,10 @@ class WSManClient(wsman.Client):
                             retries. If None, the value of
                             ready_retry_delay that was provided when the
                             object was created is used.
+
+        If neither retries nor retry_delay is given, the ready_retry_policy
+        provided when the object was created is used instead.
+
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
@@ -854,14 +1321,17 @@ class WSManClient(wsman.Client):
         :raises: DRACUnexpectedReturnValue on return value mismatch
         """
 
-        if retries is None:
-            retries = self._ready_retries
-
-        if retry_delay is None:
-            retry_delay = self._ready_retry_delay
-
-        # Try every 10 seconds over 4 minutes for the iDRAC to become ready
-        while retries > 0:
+        if retries is None and retry_delay is None:
+            policy = self._ready_retry_policy
+        else:
+            if retries is None:
+                retries = self._ready_retries
+            if retry_delay is None:
+                retry_delay = self._ready_retry_delay
+            policy = retry.FixedDelay(retries, retry_delay)
+
+        retry_state = policy.begin()
+        while True:
             LOG.debug("Checking to see if the iDRAC is ready")
 
             if self.is_idrac_ready():
@@ -869,11 +1339,12 @@ class WSManClient(wsman.Client):
                 return
 
             LOG.debug("The iDRAC is not ready")
-            retries -= 1
-            if retries > 0:
-                time.sleep(retry_delay)
-
-        if retries == 0:
-            err_msg = "Timed out waiting for the iDRAC to become ready"
-            LOG.error(err_msg)
-            raise exceptions.DRACOperationFailed(drac_messages=err_msg)
+            delay = retry_state.next_delay()
+            if delay is None:
+                break
+            time.sleep(delay)
+
+        deadline.check()
+        err_msg = "Timed out waiting for the iDRAC to become ready"
+        LOG.error(err_msg)
+        raise exceptions.DRACOperationFailed(drac_messages=err_msg)
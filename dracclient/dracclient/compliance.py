@@ -0,0 +1,184 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Fleet-wide compliance checks of BIOS settings against a golden profile.
+
+Requires NumPy, which can be installed with the ``analytics`` extra.
+"""
+
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from dracclient import exceptions
+
+# Code of absent values in the value matrices
+_MISSING = -1
+
+NodeCompliance = collections.namedtuple(
+    'NodeCompliance',
+    ['host', 'drift', 'pending_drift', 'read_only_conflicts', 'missing',
+     'changes'])
+
+
+def _require_numpy():
+    if numpy is None:
+        raise exceptions.DRACMissingDependency(
+            feature='BIOS compliance checks', dependency='numpy')
+
+
+def _normalize(value):
+    # Integer attributes are parsed as int, while profiles often hold strings
+    if value is None or value == '':
+        return None
+    return str(value)
+
+
+class BIOSComplianceChecker(object):
+    """Compares the BIOS settings of many nodes with a golden profile"""
+
+    def __init__(self, profile):
+        """Creates BIOSComplianceChecker object
+
+        :param profile: a dictionary of BIOS attribute names and their
+                        expected values
+        """
+        _require_numpy()
+        self.profile = profile
+        self.attributes = sorted(profile)
+        self._values = {}
+        self._golden = numpy.array(
+            [self._encode(profile[name]) for name in self.attributes],
+            dtype=numpy.int32)
+
+    def _encode(self, value):
+        value = _normalize(value)
+        if value is None:
+            return _MISSING
+        return self._values.setdefault(value, len(self._values))
+
+    def check(self, node_settings):
+        """Checks the BIOS settings of nodes against the profile
+
+        :param node_settings: a dictionary, or an iterable of tuples, of
+                              hosts and the dictionaries returned by
+                              DRACClient.list_bios_settings() for them
+        :returns: a BIOSComplianceReport object
+        """
+        if isinstance(node_settings, dict):
+            node_settings = node_settings.items()
+        node_settings = list(node_settings)
+
+        shape = (len(node_settings), len(self.attributes))
+        current = numpy.full(shape, _MISSING, dtype=numpy.int32)
+        pending = numpy.full(shape, _MISSING, dtype=numpy.int32)
+        read_only = numpy.zeros(shape, dtype=bool)
+        present = numpy.zeros(shape, dtype=bool)
+
+        hosts = []
+        for (row, (host, settings)) in enumerate(node_settings):
+            hosts.append(host)
+            for (column, name) in enumerate(self.attributes):
+                attribute = settings.get(name)
+                if attribute is None:
+                    continue
+                present[row, column] = True
+                read_only[row, column] = attribute.read_only
+                current[row, column] = self._encode(attribute.current_value)
+                pending[row, column] = self._encode(attribute.pending_value)
+
+        return BIOSComplianceReport(self, hosts, current, pending, read_only,
+                                    present)
+
+
+class BIOSComplianceReport(object):
+    """Result of a BIOS compliance check
+
+    The drift, pending_drift, read_only_conflicts, missing and changes
+    attributes are boolean matrices with one row per host and one column per
+    attribute of the profile:
+
+    - drift: the current value differs from the profile.
+    - pending_drift: a pending value is set and differs from the profile, so
+      applying the pending changes would not make the node compliant.
+    - read_only_conflicts: the current value differs from the profile, but
+      the attribute is read-only.
+    - missing: the node does not have the attribute.
+    - changes: the attribute must be set to reach compliance, i.e. the value
+      it will have once pending changes are applied differs from the profile
+      and the attribute is writable.
+    """
+
+    def __init__(self, checker, hosts, current, pending, read_only, present):
+        self.hosts = hosts
+        self.attributes = checker.attributes
+        self.profile = checker.profile
+
+        golden = checker._golden[numpy.newaxis, :]
+        effective = numpy.where(pending != _MISSING, pending, current)
+        self.drift = present & (current != golden)
+        self.pending_drift = (present & (pending != _MISSING) &
+                              (pending != golden))
+        self.read_only_conflicts = self.drift & read_only
+        self.missing = ~present
+        self.changes = present & ~read_only & (effective != golden)
+
+    def compliant(self):
+        """Returns a boolean array telling which hosts are compliant"""
+
+        return ~(self.drift | self.missing).any(axis=1)
+
+    def noncompliant_hosts(self):
+        return [self.hosts[row]
+                for row in numpy.flatnonzero(~self.compliant())]
+
+    def _attributes_by_host(self, matrix):
+        result = collections.defaultdict(list)
+        rows, columns = numpy.nonzero(matrix)
+        for (row, column) in zip(rows, columns):
+            result[row].append(self.attributes[column])
+        return result
+
+    def change_sets(self):
+        """Returns the settings to apply to make the hosts compliant
+
+        :returns: a dictionary of hosts and dictionaries of attribute names
+                  and values, which can be passed to
+                  DRACClient.set_bios_settings(). Hosts without changes to
+                  apply are omitted.
+        """
+        return dict(
+            (self.hosts[row], dict((name, self.profile[name])
+                                   for name in names))
+            for (row, names) in self._attributes_by_host(
+                self.changes).items())
+
+    def nodes(self):
+        """Iterates over the compliance details of every host
+
+        :returns: a generator of NodeCompliance namedtuples holding the host
+                  and lists of attribute names, except for changes which is
+                  a dictionary of attribute names and values
+        """
+        matrices = [self._attributes_by_host(matrix)
+                    for matrix in (self.drift, self.pending_drift,
+                                   self.read_only_conflicts, self.missing)]
+        change_sets = self.change_sets()
+        for (row, host) in enumerate(self.hosts):
+            yield NodeCompliance(host, *([matrix.get(row, [])
+                                          for matrix in matrices] +
+                                         [change_sets.get(host, {})]))
@@ -20,6 +20,19 @@ DEFAULT_IDRAC_IS_READY_RETRY_DELAY_SEC = 10
 DEFAULT_WSMAN_SSL_ERROR_RETRIES = 3
 DEFAULT_WSMAN_SSL_ERROR_RETRY_DELAY_SEC = 0
 
+# Web Services Management (WS-Management and WS-Man) request timeouts
+DEFAULT_WSMAN_CONNECT_TIMEOUT_SEC = 10
+DEFAULT_WSMAN_READ_TIMEOUT_SEC = 300
+
+# Maximum number of items returned by each WS-Man Enumerate and Pull request
+DEFAULT_WSMAN_MAX_ELEMS = 100
+
+# Number of distinct strings interned by the parsers
+DEFAULT_INTERN_TABLE_SIZE = 100000
+
+# Time allowed for a WS-Man Identify liveness probe
+DEFAULT_IDENTIFY_TIMEOUT_SEC = 5
+
 # power states
 POWER_ON = 'POWER_ON'
 POWER_OFF = 'POWER_OFF'
@@ -0,0 +1,114 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Context-scoped deadlines bounding the duration of multi-request operations.
+
+A deadline is entered as a context manager and applies to every WS-Man
+request, retry, pull and readiness wait issued from the same thread until it
+is exited. Nested deadlines can only shorten the time available.
+"""
+
+import threading
+import time
+
+from dracclient import exceptions
+
+_local = threading.local()
+
+
+def _stack():
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+class Deadline(object):
+    """A point in time by which an operation must be completed"""
+
+    def __init__(self, timeout):
+        """Creates Deadline object
+
+        :param timeout: number of seconds from now until the deadline
+        """
+        self.timeout = timeout
+        self.expires_at = time.time() + timeout
+
+    def remaining(self):
+        """Returns the number of seconds left, never less than zero"""
+
+        return max(self.expires_at - time.time(), 0)
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        """Raises DRACDeadlineExceeded if the deadline has passed"""
+
+        if self.expired():
+            raise exceptions.DRACDeadlineExceeded(timeout=self.timeout)
+
+    def __enter__(self):
+        _stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _stack().remove(self)
+
+
+def current():
+    """Returns the tightest deadline active in this thread, or None"""
+
+    stack = _stack()
+    if not stack:
+        return None
+
+    return min(stack, key=lambda d: d.expires_at)
+
+
+def remaining():
+    """Returns the seconds left before the current deadline, or None"""
+
+    active = current()
+    if active is not None:
+        return active.remaining()
+
+
+def check():
+    """Raises DRACDeadlineExceeded if the current deadline has passed"""
+
+    active = current()
+    if active is not None:
+        active.check()
+
+
+def clamp_timeout(timeout):
+    """Shortens a requests timeout so that it ends by the current deadline
+
+    :param timeout: a number of seconds, a (connect, read) tuple or None
+    :returns: the timeout, with every component capped by the time remaining
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+
+    if timeout is None:
+        return left
+
+    if isinstance(timeout, tuple):
+        return tuple(left if value is None else min(value, left)
+                     for value in timeout)
+
+    return min(timeout, left)
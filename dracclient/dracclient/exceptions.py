@@ -20,6 +20,18 @@ class BaseClientException(Exception):
         message = self.msg_fmt % kwargs
         super(BaseClientException, self).__init__(message)
 
+    def __reduce__(self):
+        # Pickled with the formatted message, e.g. to be raised by the
+        # process receiving it
+        return (_restore_exception, (self.__class__, self.args),
+                self.__dict__)
+
+
+def _restore_exception(exc_cls, args):
+    exc = exc_cls.__new__(exc_cls)
+    super(BaseClientException, exc).__init__(*args)
+    return exc
+
 
 class DRACRequestFailed(BaseClientException):
     pass
@@ -43,6 +55,11 @@ class DRACMissingResponseField(BaseClientException, AttributeError):
     msg_fmt = ("Attribute '%(attr)s' is missing from the response")
 
 
+class DRACMissingDependency(BaseClientException):
+    msg_fmt = ("%(feature)s requires the '%(dependency)s' package, which is "
+               "not installed")
+
+
 class InvalidParameterValue(BaseClientException):
     msg_fmt = '%(reason)s'
 
@@ -51,10 +68,29 @@ class WSManRequestFailure(BaseClientException):
     msg_fmt = ('WSMan request failed')
 
 
+class DRACDeadlineExceeded(WSManRequestFailure):
+    msg_fmt = ('Operation did not complete within its deadline of '
+               '%(timeout)s seconds')
+
+
 class WSManInvalidResponse(BaseClientException):
     msg_fmt = ('Invalid response received. Status code: "%(status_code)s", '
                'reason: "%(reason)s"')
 
+    def __init__(self, message=None, **kwargs):
+        super(WSManInvalidResponse, self).__init__(message, **kwargs)
+        self.status_code = kwargs.get('status_code')
+
+
+class WSManEnumerationContextExpired(WSManInvalidResponse):
+    msg_fmt = ('Enumeration context of %(resource_uri)s is no longer valid. '
+               'Status code: "%(status_code)s", reason: "%(reason)s"')
+
+
+class WSManInstanceNotFound(BaseClientException):
+    msg_fmt = ('No instance of %(resource_uri)s matches the selectors '
+               '%(selectors)s')
+
 
 class WSManInvalidFilterDialect(BaseClientException):
     msg_fmt = ('Invalid filter dialect "%(invalid_filter)s". '
@@ -0,0 +1,364 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Streaming export of the hardware inventory of many nodes.
+
+Records are written as soon as the inventory of a node is received, so the
+memory used does not depend on the number of nodes exported.
+"""
+
+import collections
+import csv
+import gzip
+import io
+import json
+import logging
+import sys
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+LOG = logging.getLogger(__name__)
+
+# Inventory kinds and the DRACClient methods returning them
+INVENTORY_KINDS = collections.OrderedDict([
+    ('cpus', 'list_cpus'),
+    ('memory', 'list_memory'),
+    ('nics', 'list_nics'),
+    ('physical_disks', 'list_physical_disks'),
+    ('virtual_disks', 'list_virtual_disks'),
+    ('raid_controllers', 'list_raid_controllers'),
+])
+
+_DONE = object()
+
+# On Python 2, csv and json produce byte strings, written to binary files
+_PY2 = sys.version_info[0] == 2
+
+
+def record_to_dict(host, kind, record):
+    """Converts an inventory namedtuple into an ordered dictionary
+
+    :param host: host the record was retrieved from
+    :param kind: inventory kind of the record, a key of INVENTORY_KINDS
+    :param record: a CPU, Memory, NIC, PhysicalDisk, VirtualDisk or
+                   RAIDController object
+    :returns: an OrderedDict with the host, the kind and the record fields
+    """
+    result = collections.OrderedDict([('host', host), ('kind', kind)])
+    result.update(record._asdict())
+    return result
+
+
+def iter_inventory(drac_clients, kinds=None, workers=1, on_error=None):
+    """Iterates over the inventory of many nodes as it is retrieved
+
+    :param drac_clients: an iterable of DRACClient objects. It is consumed
+                         lazily, so it can be a generator creating the
+                         clients on demand.
+    :param kinds: inventory kinds to retrieve, keys of INVENTORY_KINDS.
+                  Defaults to all of them.
+    :param workers: number of nodes queried concurrently
+    :param on_error: a callable invoked with the host, the kind and the
+                     exception when a node cannot be queried. By default the
+                     error is logged and the node skipped.
+    :returns: a generator of (host, kind, record) tuples
+    """
+    if kinds is None:
+        kinds = list(INVENTORY_KINDS)
+
+    unknown_kinds = set(kinds) - set(INVENTORY_KINDS)
+    if unknown_kinds:
+        raise ValueError('Unknown inventory kinds: %r' % unknown_kinds)
+
+    if on_error is None:
+        on_error = _log_error
+
+    if workers <= 1:
+        for drac_client in drac_clients:
+            for batch in _query_node(drac_client, kinds, on_error):
+                for item in batch:
+                    yield item
+        return
+
+    for item in _iter_inventory_concurrently(drac_clients, kinds, workers,
+                                             on_error):
+        yield item
+
+
+def _log_error(host, kind, error):
+    LOG.error('Failed to retrieve %(kind)s of %(host)s: %(error)s',
+              {'kind': kind, 'host': host, 'error': error})
+
+
+def _query_node(drac_client, kinds, on_error):
+    host = drac_client.client.host
+    for kind in kinds:
+        try:
+            records = getattr(drac_client, INVENTORY_KINDS[kind])()
+        except Exception as ex:
+            on_error(host, kind, ex)
+            continue
+
+        yield [(host, kind, record) for record in records]
+
+
+def _iter_inventory_concurrently(drac_clients, kinds, workers, on_error):
+    query = _ConcurrentQuery(drac_clients, kinds, workers, on_error)
+    query.start()
+    try:
+        for batch in query.batches():
+            for item in batch:
+                yield item
+    finally:
+        query.stop()
+
+
+class _ConcurrentQuery(object):
+    """Queries nodes from a pool of threads
+
+    Both queues are bounded, so at most a few batches per worker are held in
+    memory however slowly the results are consumed.
+    """
+
+    def __init__(self, drac_clients, kinds, workers, on_error):
+        self.drac_clients = drac_clients
+        self.kinds = kinds
+        self.workers = workers
+        self.on_error = on_error
+        self._clients_queue = queue.Queue(maxsize=workers)
+        self._results_queue = queue.Queue(maxsize=workers * 2)
+        self._stopped = threading.Event()
+        self._threads = []
+        # Error raised by the iterable of clients, raised again by batches()
+        self._error = None
+
+    def start(self):
+        feeder = threading.Thread(target=self._feed)
+        feeder.daemon = True
+        feeder.start()
+        for _ in range(self.workers):
+            worker = threading.Thread(target=self._work)
+            worker.daemon = True
+            worker.start()
+            self._threads.append(worker)
+
+    def _feed(self):
+        try:
+            for drac_client in self.drac_clients:
+                if self._stopped.is_set():
+                    break
+                self._clients_queue.put(drac_client)
+        except Exception as ex:
+            LOG.exception('Failed to iterate over the clients to export')
+            self._error = ex
+        finally:
+            for _ in range(self.workers):
+                self._clients_queue.put(_DONE)
+
+    def _work(self):
+        try:
+            while True:
+                drac_client = self._clients_queue.get()
+                if drac_client is _DONE:
+                    break
+                if self._stopped.is_set():
+                    continue
+                for batch in _query_node(drac_client, self.kinds,
+                                         self.on_error):
+                    self._results_queue.put(batch)
+        finally:
+            self._results_queue.put(_DONE)
+
+    def batches(self):
+        remaining = self.workers
+        while remaining:
+            batch = self._results_queue.get()
+            if batch is _DONE:
+                remaining -= 1
+            else:
+                yield batch
+
+        # The workers are done once the feeder has handed over _DONE, after
+        # setting the error if there was one.
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        self._stopped.set()
+        # Unblock the workers waiting to hand over a batch
+        while any(thread.is_alive() for thread in self._threads):
+            try:
+                self._results_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+class _RotatingWriter(object):
+    """Base class of writers splitting their output into several files"""
+
+    extension = None
+
+    def __init__(self, prefix, max_records=None, compress=False):
+        """Creates the writer
+
+        :param prefix: path prefix of the output files. A sequence number
+                       and an extension are appended to it.
+        :param max_records: number of records after which a new file is
+                            started, or None for a single file
+        :param compress: whether to gzip the output files
+        """
+        self.prefix = prefix
+        self.max_records = max_records
+        self.compress = compress
+        self.paths = []
+        self._sequence = collections.Counter()
+
+    def _path(self, name):
+        path = '%s%s-%05d.%s' % (self.prefix, name,
+                                 self._sequence[name], self.extension)
+        self._sequence[name] += 1
+        if self.compress:
+            path += '.gz'
+        return path
+
+    def _open(self, name):
+        path = self._path(name)
+        self.paths.append(path)
+        if self.compress:
+            raw = gzip.open(path, 'wb')
+        else:
+            raw = io.open(path, 'wb')
+        if _PY2:
+            return raw
+        return io.TextIOWrapper(raw, encoding='utf-8', newline='')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class NDJSONWriter(_RotatingWriter):
+    """Writes records as newline delimited JSON, one object per line"""
+
+    extension = 'ndjson'
+
+    def __init__(self, prefix, max_records=None, compress=False):
+        super(NDJSONWriter, self).__init__(prefix, max_records, compress)
+        self._file = None
+        self._count = 0
+
+    def write(self, host, kind, record):
+        if self._file is None or (self.max_records is not None and
+                                  self._count >= self.max_records):
+            self.close()
+            self._file = self._open('')
+            self._count = 0
+
+        self._file.write(json.dumps(record_to_dict(host, kind, record)))
+        self._file.write('\n')
+        self._count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CSVWriter(_RotatingWriter):
+    """Writes records as CSV, in one series of files per inventory kind
+
+    List values, such as the physical disks of a virtual disk, are joined
+    with semicolons.
+    """
+
+    extension = 'csv'
+
+    def __init__(self, prefix, max_records=None, compress=False):
+        super(CSVWriter, self).__init__(prefix, max_records, compress)
+        self._files = {}
+
+    def write(self, host, kind, record):
+        current = self._files.get(kind)
+        if current is None or (self.max_records is not None and
+                               current[2] >= self.max_records):
+            self._close_kind(kind)
+            stream = self._open('-' + kind)
+            writer = csv.writer(stream)
+            writer.writerow(['host'] + list(record._fields))
+            current = self._files[kind] = [stream, writer, 0]
+
+        current[1].writerow([self._format(host)] + [self._format(value)
+                                                    for value in record])
+        current[2] += 1
+
+    @staticmethod
+    def _format(value):
+        if isinstance(value, (list, tuple)):
+            value = u';'.join(value)
+        if _PY2 and isinstance(value, type(u'')):
+            return value.encode('utf-8')
+        return value
+
+    def _close_kind(self, kind):
+        current = self._files.pop(kind, None)
+        if current is not None:
+            current[0].close()
+
+    def close(self):
+        for kind in list(self._files):
+            self._close_kind(kind)
+
+
+class InventoryExporter(object):
+    """Streams the inventory of many nodes to one or more writers"""
+
+    def __init__(self, writers, kinds=None, workers=1, on_error=None):
+        """Creates InventoryExporter object
+
+        :param writers: a list of NDJSONWriter or CSVWriter objects
+        :param kinds: inventory kinds to export, keys of INVENTORY_KINDS.
+                      Defaults to all of them.
+        :param workers: number of nodes queried concurrently
+        :param on_error: a callable invoked with the host, the kind and the
+                         exception when a node cannot be queried
+        """
+        self.writers = writers
+        self.kinds = kinds
+        self.workers = workers
+        self.on_error = on_error
+
+    def export(self, drac_clients):
+        """Exports the inventory of the nodes and closes the writers
+
+        :param drac_clients: an iterable of DRACClient objects
+        :returns: a dictionary with the number of records written per kind
+        """
+        counts = collections.Counter()
+        try:
+            for (host, kind, record) in iter_inventory(
+                    drac_clients, self.kinds, self.workers, self.on_error):
+                for writer in self.writers:
+                    writer.write(host, kind, record)
+                counts[kind] += 1
+        finally:
+            for writer in self.writers:
+                writer.close()
+
+        return dict(counts)
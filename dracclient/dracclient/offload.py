@@ -0,0 +1,123 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Parsing of enumerations in a pool of processes.
+
+Parsing the items of large enumerations into settings objects runs Python
+code holding the GIL, so the threads of a fleet scraper parse one response
+at a time however many of them wait on the network. A parse pool hands the
+raw responses to worker processes, which parse them and send the parsed
+objects back encoded with dracclient.serialization.
+"""
+
+import logging
+import multiprocessing
+import pickle
+import threading
+
+from dracclient import serialization
+from dracclient import wsman
+
+LOG = logging.getLogger(__name__)
+
+
+def _parse_in_worker(parse, contents, codec):
+    # Errors, including those of dracclient which pickle their message, are
+    # raised again by the caller.
+    return serialization.dumps(parse(wsman.parse_enumeration(contents)),
+                               codec)
+
+
+class ParsePool(object):
+    """Pool of processes parsing enumerations for many clients
+
+    Create the pool before starting the threads using it, since its worker
+    processes are forked when it is created.
+    """
+
+    def __init__(self, processes=None, min_bytes=64 * 1024, timeout=60,
+                 codec=None):
+        """Creates ParsePool object
+
+        :param processes: number of worker processes, defaults to the number
+                          of CPUs
+        :param min_bytes: size of the smallest enumeration parsed by the
+                          workers, in bytes received. Smaller ones are parsed
+                          by the calling thread, which is faster than sending
+                          them over.
+        :param timeout: number of seconds to wait for a worker before
+                        parsing in the calling thread, or None to wait
+                        indefinitely
+        :param codec: codec of dracclient.serialization used to send the
+                      parsed objects back, defaults to msgpack when it is
+                      installed
+        """
+        self.min_bytes = min_bytes
+        self.timeout = timeout
+        self.codec = codec
+        self._pool = multiprocessing.Pool(processes)
+        self._lock = threading.Lock()
+        self.offloaded = 0
+        self.fallbacks = 0
+
+    def parse(self, parse, contents):
+        """Parses an enumeration, in a worker process if it is large enough
+
+        :param parse: a callable taking the lxml.etree.Element of the
+                      response and returning objects supported by
+                      dracclient.serialization. It must be picklable, e.g.
+                      a module-level function or a functools.partial of one.
+        :param contents: the raw contents of the responses of the
+                         enumeration. The calling thread parses them only
+                         when the enumeration is small or cannot be sent to
+                         a worker.
+        :returns: the objects returned by parse
+        :raises: the exceptions raised by parse
+        """
+        if sum(len(content) for content in contents) < self.min_bytes:
+            return parse(wsman.parse_enumeration(contents))
+
+        try:
+            # Fails here rather than in the pool, where it could not be told
+            # apart from the errors of parse
+            pickle.dumps(parse, pickle.HIGHEST_PROTOCOL)
+            result = self._pool.apply_async(_parse_in_worker,
+                                            (parse, contents, self.codec))
+        except Exception as exc:
+            LOG.warning('Could not send the enumeration to a worker process, '
+                        'parsing in the calling thread. Error: %s', exc)
+            self._increment('fallbacks')
+            return parse(wsman.parse_enumeration(contents))
+
+        try:
+            data = result.get(self.timeout)
+        except multiprocessing.TimeoutError:
+            LOG.warning('No worker process parsed the enumeration within %s '
+                        'seconds, parsing in the calling thread',
+                        self.timeout)
+            self._increment('fallbacks')
+            return parse(wsman.parse_enumeration(contents))
+
+        self._increment('offloaded')
+        return serialization.loads(data)
+
+    def close(self):
+        """Stops the worker processes"""
+
+        self._pool.terminate()
+        self._pool.join()
+
+    def _increment(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
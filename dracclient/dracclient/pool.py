@@ -0,0 +1,285 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Pool of clients for services talking to large fleets of nodes.
+
+Every pooled client keeps its connections to its DRAC interface open between
+requests. The pool bounds the number of clients open at once, and so of
+connections, keeps the most recently used idle ones warm and closes the
+others.
+"""
+
+import collections
+import contextlib
+import logging
+import threading
+import time
+
+import requests
+from requests import compat
+
+from dracclient import client as drac_client
+from dracclient import deadline
+
+LOG = logging.getLogger(__name__)
+
+
+class _Entry(object):
+    """A pooled client"""
+
+    def __init__(self, key, password, client):
+        self.key = key
+        self.password = password
+        self.client = client
+        self.users = 0
+        self.idle_since = None
+        self.retired = False
+
+
+class _RejectCookies(compat.cookielib.DefaultCookiePolicy):
+    """Cookie policy keeping no cookie
+
+    Requests are authenticated on their own, cookies are not needed.
+    """
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+def _new_session(max_connections):
+    # The requests of the callers sharing a client wait for one of its
+    # connections to be free rather than opening extra ones, which would be
+    # closed once done. Blocking urllib3 pools are safe to share between
+    # threads. The adapters are mounted before the session is shared and the
+    # cookie jar stays empty, so the threads sending requests at once only
+    # read the state of the session.
+    session = requests.Session()
+    session.cookies.set_policy(_RejectCookies())
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                            pool_maxsize=max_connections,
+                                            pool_block=True)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class DRACClientPool(object):
+    """Thread-safe pool of DRACClient objects
+
+    Clients are keyed by (host, port, protocol, username). A client checked
+    out is shared by every caller checking out the same key until they all
+    check it back in, so clients are created in thread-safe mode. Idle
+    clients are kept in least recently used order.
+    """
+
+    def __init__(self, max_open=1000, max_idle=100, idle_timeout=300,
+                 max_connections=4, **client_kwargs):
+        """Creates DRACClientPool object
+
+        :param max_open: maximum number of clients open at once, whether
+                         checked out or idle. Checking out another client
+                         closes the least recently used idle one, or blocks
+                         until a client is checked in.
+        :param max_idle: maximum number of idle clients kept open
+        :param idle_timeout: number of seconds after which an idle client is
+                             closed, or None to keep idle clients open
+        :param max_connections: maximum number of connections every client
+                                opens to its DRAC interface, and so of
+                                requests it sends at once. Requests of
+                                callers sharing a client wait for a free
+                                connection. At most max_open times
+                                max_connections connections are open.
+        :param client_kwargs: keyword arguments of DRACClient shared by all
+                              the clients, e.g. retry_policy, rate_limiter or
+                              parse_cache
+        """
+        self.max_open = max_open
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.max_connections = max_connections
+        self.client_kwargs = client_kwargs
+        self._entries = {}
+        self._by_client = {}
+        self._idle = collections.OrderedDict()
+        self._cond = threading.Condition()
+
+    @property
+    def open_count(self):
+        """Number of clients open, whether checked out or idle"""
+
+        with self._cond:
+            return len(self._by_client)
+
+    @property
+    def idle_count(self):
+        """Number of idle clients"""
+
+        with self._cond:
+            return len(self._idle)
+
+    def checkout(self, host, username, password, port=443, path='/wsman',
+                 protocol='https'):
+        """Returns a client for a DRAC interface
+
+        Every client checked out must be checked in once done with it.
+
+        :param host: hostname or IP of the DRAC interface
+        :param username: username for accessing the DRAC interface
+        :param password: password for accessing the DRAC interface. A
+                         client open with another password is replaced.
+        :param port: port for accessing the DRAC interface
+        :param path: path for accessing the DRAC interface
+        :param protocol: protocol for accessing the DRAC interface
+        :returns: a DRACClient object
+        :raises: DRACDeadlineExceeded if the current deadline passes while
+                 waiting for a client to be checked in
+        """
+        key = (host, port, protocol, username)
+        to_close = []
+        with self._cond:
+            to_close.extend(self._reap())
+            while True:
+                entry = self._entries.get(key)
+                if entry is not None and entry.password != password:
+                    to_close.extend(self._retire(entry))
+                    entry = None
+
+                if entry is not None:
+                    break
+
+                if len(self._by_client) < self.max_open:
+                    entry = self._open(key, host, username, password, port,
+                                       path, protocol)
+                    break
+
+                if self._idle:
+                    to_close.extend(self._retire(
+                        next(iter(self._idle.values()))))
+                    continue
+
+                deadline.check()
+                self._cond.wait(deadline.remaining())
+
+            self._idle.pop(key, None)
+            entry.users += 1
+
+        self._close(to_close)
+        return entry.client
+
+    def checkin(self, client):
+        """Returns a client to the pool
+
+        :param client: a DRACClient object returned by checkout()
+        """
+        to_close = []
+        with self._cond:
+            entry = self._by_client.get(id(client))
+            if entry is None:
+                # The pool was closed while the client was checked out
+                return
+
+            entry.users -= 1
+            if entry.users == 0:
+                if entry.retired:
+                    to_close.extend(self._retire(entry))
+                else:
+                    entry.idle_since = time.time()
+                    self._idle[entry.key] = entry
+                    while len(self._idle) > self.max_idle:
+                        to_close.extend(self._retire(
+                            next(iter(self._idle.values()))))
+                to_close.extend(self._reap())
+            self._cond.notify()
+
+        self._close(to_close)
+
+    @contextlib.contextmanager
+    def client(self, host, username, password, port=443, path='/wsman',
+               protocol='https'):
+        """Checks out a client for the duration of a with block
+
+        Takes the same parameters as checkout().
+        """
+        client = self.checkout(host, username, password, port, path,
+                               protocol)
+        try:
+            yield client
+        finally:
+            self.checkin(client)
+
+    def reap(self):
+        """Closes the clients idle for longer than idle_timeout"""
+
+        with self._cond:
+            to_close = self._reap()
+            if to_close:
+                self._cond.notify_all()
+
+        self._close(to_close)
+
+    def close(self):
+        """Closes every client, including the ones checked out"""
+
+        with self._cond:
+            to_close = [entry.client for entry in self._by_client.values()]
+            self._entries.clear()
+            self._by_client.clear()
+            self._idle.clear()
+            self._cond.notify_all()
+
+        self._close(to_close)
+
+    def _open(self, key, host, username, password, port, path, protocol):
+        kwargs = dict(self.client_kwargs)
+        kwargs.setdefault('thread_safe', True)
+        session = _new_session(self.max_connections)
+        client = drac_client.DRACClient(host, username, password, port, path,
+                                        protocol, session=session, **kwargs)
+        entry = _Entry(key, password, client)
+        self._entries[key] = entry
+        self._by_client[id(client)] = entry
+        return entry
+
+    def _retire(self, entry):
+        # Detaches an entry from its key. Its client is closed once it is no
+        # longer checked out, the caller closes the clients returned.
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+            if self._idle.get(entry.key) is entry:
+                del self._idle[entry.key]
+        entry.retired = True
+
+        if entry.users > 0:
+            return []
+
+        self._by_client.pop(id(entry.client), None)
+        return [entry.client]
+
+    def _reap(self):
+        if self.idle_timeout is None:
+            return []
+
+        to_close = []
+        expires_before = time.time() - self.idle_timeout
+        while self._idle:
+            entry = next(iter(self._idle.values()))
+            if entry.idle_since > expires_before:
+                break
+            to_close.extend(self._retire(entry))
+        return to_close
+
+    def _close(self, clients):
+        for client in clients:
+            LOG.debug('Closing the pooled client of %s', client.client.host)
+            client.close()
@@ -0,0 +1,339 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Rate limiting of the requests sent to DRAC interfaces.
+
+A limiter is passed to wsman.Client, which acquires a permit before sending
+each HTTP request and releases it once the response has been received. Share
+one limiter between all the clients of a process to make them share the same
+per-endpoint and global budgets.
+"""
+
+import logging
+import threading
+import time
+
+import requests.exceptions
+
+from dracclient import deadline
+from dracclient import exceptions
+
+LOG = logging.getLogger(__name__)
+
+
+def _wait(condition, timeout_at):
+    """Waits on a condition, honouring the current deadline
+
+    :param condition: a threading.Condition held by the caller
+    :param timeout_at: time at which the wait should end anyway, or None
+    :raises: DRACDeadlineExceeded if the current deadline has passed
+    """
+    active_deadline = deadline.current()
+    timeout = None
+    if active_deadline is not None:
+        active_deadline.check()
+        timeout = active_deadline.remaining()
+
+    if timeout_at is not None:
+        wait_for = max(timeout_at - time.time(), 0)
+        timeout = wait_for if timeout is None else min(timeout, wait_for)
+
+    condition.wait(timeout)
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket limiting a rate of events"""
+
+    def __init__(self, rate, burst=None):
+        """Creates TokenBucket object
+
+        :param rate: number of tokens added per second
+        :param burst: maximum number of tokens saved up. Defaults to rate,
+                      but never less than one.
+        """
+        self.rate = float(rate)
+        if burst is None:
+            burst = max(rate, 1)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.time()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.time()
+        elapsed = max(now - self._last_refill, 0)
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def acquire(self):
+        """Takes a token, blocking until one is available
+
+        :raises: DRACDeadlineExceeded if the current deadline passes while
+                 waiting
+        """
+        with self._cond:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait_for = (1 - self._tokens) / self.rate
+                _wait(self._cond, time.time() + wait_for)
+
+
+class ConcurrencyGate(object):
+    """Thread-safe limit on the number of operations in flight"""
+
+    def __init__(self, limit):
+        """Creates ConcurrencyGate object
+
+        :param limit: maximum number of operations in flight
+        """
+        self.limit = limit
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Enters the gate, blocking while it is full
+
+        :raises: DRACDeadlineExceeded if the current deadline passes while
+                 waiting
+        """
+        with self._cond:
+            while self.in_flight >= self.limit:
+                _wait(self._cond, None)
+            self.in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def set_limit(self, limit):
+        with self._cond:
+            self.limit = limit
+            self._cond.notify_all()
+
+
+class RateLimiter(object):
+    """Per-endpoint and global limits on request concurrency and rate
+
+    Each limit is optional. Per-endpoint limits apply separately to every
+    endpoint URL, while global limits apply to the sum of the requests sent
+    through this limiter to all endpoints.
+    """
+
+    def __init__(self, max_concurrency=None, requests_per_sec=None,
+                 burst=None, global_max_concurrency=None,
+                 global_requests_per_sec=None, global_burst=None):
+        """Creates RateLimiter object
+
+        :param max_concurrency: maximum number of requests in flight per
+                                endpoint
+        :param requests_per_sec: maximum number of requests per second per
+                                 endpoint
+        :param burst: number of requests per endpoint that can be sent at
+                      once after an idle period
+        :param global_max_concurrency: maximum number of requests in flight
+                                       in total
+        :param global_requests_per_sec: maximum number of requests per
+                                        second in total
+        :param global_burst: number of requests in total that can be sent at
+                             once after an idle period
+        """
+        self.max_concurrency = max_concurrency
+        self.requests_per_sec = requests_per_sec
+        self.burst = burst
+
+        self._global_gate = None
+        if global_max_concurrency is not None:
+            self._global_gate = ConcurrencyGate(global_max_concurrency)
+
+        self._global_bucket = None
+        if global_requests_per_sec is not None:
+            self._global_bucket = TokenBucket(global_requests_per_sec,
+                                              global_burst)
+
+        self._gates = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _gate(self, endpoint):
+        if self.max_concurrency is None:
+            return None
+
+        with self._lock:
+            gate = self._gates.get(endpoint)
+            if gate is None:
+                gate = self._gates[endpoint] = self._new_gate(endpoint)
+            return gate
+
+    def _new_gate(self, endpoint):
+        return ConcurrencyGate(self.max_concurrency)
+
+    def _bucket(self, endpoint):
+        if self.requests_per_sec is None:
+            return None
+
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                bucket = self._buckets[endpoint] = TokenBucket(
+                    self.requests_per_sec, self.burst)
+            return bucket
+
+    def acquire(self, endpoint):
+        """Waits until a request may be sent to an endpoint
+
+        Every successful call must be paired with a call to release().
+
+        :param endpoint: URL of the endpoint
+        :raises: DRACDeadlineExceeded if the current deadline passes while
+                 waiting
+        """
+        gates = [gate for gate in (self._gate(endpoint), self._global_gate)
+                 if gate is not None]
+        acquired = []
+        try:
+            # The per-endpoint gate is entered first, so that requests queued
+            # for a busy endpoint do not hold global slots.
+            for gate in gates:
+                gate.acquire()
+                acquired.append(gate)
+
+            for bucket in (self._bucket(endpoint), self._global_bucket):
+                if bucket is not None:
+                    bucket.acquire()
+        except Exception:
+            for gate in acquired:
+                gate.release()
+            raise
+
+    def release(self, endpoint, latency=None, error=None):
+        """Signals that a request to an endpoint has completed
+
+        :param endpoint: URL of the endpoint
+        :param latency: number of seconds the request took
+        :param error: the exception raised by the request, if any
+        """
+        for gate in (self._gate(endpoint), self._global_gate):
+            if gate is not None:
+                gate.release()
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """Rate limiter adapting per-endpoint concurrency to observed behaviour
+
+    The number of requests in flight to each endpoint follows an AIMD
+    (additive increase, multiplicative decrease) scheme: it grows by about
+    one per round of successful requests while their latency stays close to
+    the lowest latency observed for the endpoint, and is cut by
+    decrease_factor when a request times out, fails to connect or receives
+    an invalid (e.g. 5xx) response. Concurrent operations on one DRAC thus
+    converge on the concurrency the card sustains.
+    """
+
+    # Failures treated as a sign of an overloaded DRAC interface
+    OVERLOAD_ERRORS = (exceptions.WSManInvalidResponse,
+                       requests.exceptions.Timeout,
+                       requests.exceptions.ConnectionError)
+
+    def __init__(self, initial_concurrency=2, min_concurrency=1,
+                 max_concurrency=16, decrease_factor=0.5,
+                 latency_tolerance=2.0, **kwargs):
+        """Creates AdaptiveRateLimiter object
+
+        :param initial_concurrency: number of requests in flight allowed per
+                                    endpoint before any feedback
+        :param min_concurrency: lower bound of the per-endpoint concurrency
+        :param max_concurrency: upper bound of the per-endpoint concurrency
+        :param decrease_factor: factor applied to the concurrency on failure
+        :param latency_tolerance: a request is considered fast while its
+                                  latency is below the lowest latency seen for
+                                  the endpoint multiplied by this factor
+        :param kwargs: the remaining RateLimiter arguments
+        """
+        super(AdaptiveRateLimiter, self).__init__(
+            max_concurrency=max_concurrency, **kwargs)
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self._states = {}
+
+    def _new_gate(self, endpoint):
+        self._states[endpoint] = _AdaptiveState(self.initial_concurrency)
+        return ConcurrencyGate(self.initial_concurrency)
+
+    def concurrency(self, endpoint):
+        """Returns the current concurrency limit of an endpoint"""
+
+        return self._gate(endpoint).limit
+
+    def release(self, endpoint, latency=None, error=None):
+        gate = self._gate(endpoint)
+        with self._lock:
+            state = self._states[endpoint]
+            if error is not None:
+                if isinstance(error, self.OVERLOAD_ERRORS):
+                    self._decrease(endpoint, state, latency)
+            elif latency is not None:
+                self._increase(state, latency)
+
+            limit = max(self.min_concurrency,
+                        min(self.max_concurrency, int(state.limit)))
+
+        if limit != gate.limit:
+            LOG.debug('Changing the concurrency limit of %(endpoint)s from '
+                      '%(old)d to %(new)d',
+                      {'endpoint': endpoint, 'old': gate.limit, 'new': limit})
+            gate.set_limit(limit)
+
+        super(AdaptiveRateLimiter, self).release(endpoint, latency, error)
+
+    def _increase(self, state, latency):
+        if state.min_latency is None or latency < state.min_latency:
+            state.min_latency = latency
+
+        if latency <= state.min_latency * self.latency_tolerance:
+            state.limit = min(self.max_concurrency,
+                              state.limit + 1.0 / max(state.limit, 1))
+        else:
+            # Let the baseline follow a lasting latency increase, e.g. after
+            # a firmware update, instead of holding the limit forever.
+            state.min_latency += (latency - state.min_latency) * 0.01
+
+    def _decrease(self, endpoint, state, latency):
+        now = time.time()
+        started = now - (latency or 0)
+        # Requests sent before the last decrease were dispatched under the
+        # previous limit, so their failures must not cut the limit again.
+        if started < state.last_decrease:
+            return
+
+        state.last_decrease = now
+        state.limit = max(self.min_concurrency,
+                          state.limit * self.decrease_factor)
+        LOG.warning('Request to %(endpoint)s failed, reducing its '
+                    'concurrency limit to %(limit).1f',
+                    {'endpoint': endpoint, 'limit': state.limit})
+
+
+class _AdaptiveState(object):
+
+    def __init__(self, limit):
+        self.limit = float(limit)
+        self.min_latency = None
+        self.last_decrease = 0
@@ -130,8 +130,10 @@ class BootManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.DCIM_BootConfigSetting)
+        return self.client.enumerate_parsed(uris.DCIM_BootConfigSetting,
+                                            self._parse_boot_config_settings)
 
+    def _parse_boot_config_settings(self, doc):
         drac_boot_modes = utils.find_xml(doc, 'DCIM_BootConfigSetting',
                                          uris.DCIM_BootConfigSetting,
                                          find_all=True)
@@ -259,6 +261,9 @@ class BootManagement(object):
 class BIOSAttribute(object):
     """Generic BIOS attribute class"""
 
+    # Fields parsed on their own by lazy attributes, with their element
+    _key_fields = {'name': 'AttributeName', 'instance_id': 'InstanceID'}
+
     def __init__(self, name, instance_id, current_value, pending_value,
                  read_only):
         """Creates BIOSAttribute object
@@ -328,7 +333,7 @@ class BIOSEnumerableAttribute(BIOSAttribute):
         """Parses XML and creates BIOSEnumerableAttribute object"""
 
         bios_attr = BIOSAttribute.parse(cls.namespace, bios_attr_xml)
-        possible_values = [attr.text for attr
+        possible_values = [utils.intern_string(attr.text) for attr
                            in utils.find_xml(bios_attr_xml, 'PossibleValues',
                                              cls.namespace, find_all=True)]
 
@@ -473,11 +478,13 @@ class BIOSConfiguration(object):
         """
         self.client = client
 
-    def list_bios_settings(self, by_name=True):
+    def list_bios_settings(self, by_name=True, lazy=False):
         """List the BIOS configuration settings
 
         :param by_name: Controls whether returned dictionary uses BIOS
                         attribute name or instance_id as key.
+        :param lazy: Controls whether the attributes are parsed on first
+                     access rather than up front.
         :returns: a dictionary with the BIOS settings using its name as the
                   key. The attributes are either BIOSEnumerableAttribute,
                   BIOSStringAttribute or BIOSIntegerAttribute objects.
@@ -487,7 +494,8 @@ class BIOSConfiguration(object):
                  interface
         """
 
-        return utils.list_settings(self.client, self.NAMESPACES, by_name)
+        return utils.list_settings(self.client, self.NAMESPACES, by_name,
+                                   lazy=lazy)
 
     def set_bios_settings(self, new_settings):
         """Sets the BIOS configuration
@@ -18,6 +18,10 @@ from dracclient import utils
 class iDRACCardAttribute(object):
     """Generic iDRACCard attribute class"""
 
+    # Fields parsed on their own by lazy attributes, with their element
+    _key_fields = {'name': 'AttributeName', 'instance_id': 'InstanceID',
+                   'fqdd': 'FQDD', 'group_id': 'GroupID'}
+
     def __init__(self, name, instance_id, current_value, pending_value,
                  read_only, fqdd, group_id):
         """Creates iDRACCardAttribute object
@@ -49,9 +53,9 @@ class iDRACCardAttribute(object):
         """Parses XML and creates iDRACCardAttribute object"""
 
         name = utils.get_wsman_resource_attr(
-            idrac_attr_xml, namespace, 'AttributeName')
+            idrac_attr_xml, namespace, 'AttributeName', interned=True)
         instance_id = utils.get_wsman_resource_attr(
-            idrac_attr_xml, namespace, 'InstanceID')
+            idrac_attr_xml, namespace, 'InstanceID', interned=True)
         current_value = utils.get_wsman_resource_attr(
             idrac_attr_xml, namespace, 'CurrentValue', nullable=True)
         pending_value = utils.get_wsman_resource_attr(
@@ -59,9 +63,9 @@ class iDRACCardAttribute(object):
         read_only = utils.get_wsman_resource_attr(
             idrac_attr_xml, namespace, 'IsReadOnly').lower()
         fqdd = utils.get_wsman_resource_attr(
-            idrac_attr_xml, namespace, 'FQDD')
+            idrac_attr_xml, namespace, 'FQDD', interned=True)
         group_id = utils.get_wsman_resource_attr(
-            idrac_attr_xml, namespace, 'GroupID')
+            idrac_attr_xml, namespace, 'GroupID', interned=True)
 
         return cls(name, instance_id, current_value, pending_value,
                    (read_only == 'true'), fqdd, group_id)
@@ -101,12 +105,13 @@ class iDRACCardEnumerableAttribute(iDRACCardAttribute):
         """Parses XML and creates iDRACCardEnumerableAttribute object"""
 
         idrac_attr = iDRACCardAttribute.parse(cls.namespace, idrac_attr_xml)
-        possible_values = [attr.text for attr
+        possible_values = [utils.intern_string(attr.text) for attr
                            in utils.find_xml(idrac_attr_xml, 'PossibleValues',
                                              cls.namespace, find_all=True)]
 
         return cls(idrac_attr.name, idrac_attr.instance_id,
-                   idrac_attr.current_value, idrac_attr.pending_value,
+                   utils.intern_string(idrac_attr.current_value),
+                   utils.intern_string(idrac_attr.pending_value),
                    idrac_attr.read_only, idrac_attr.fqdd, idrac_attr.group_id,
                    possible_values)
 
@@ -260,7 +265,8 @@ class iDRACCardConfiguration(object):
         """
         self.client = client
 
-    def list_idrac_settings(self, by_name=False, fqdd_filter=None):
+    def list_idrac_settings(self, by_name=False, fqdd_filter=None,
+                            lazy=False):
         """List the iDRACCard configuration settings
 
         :param by_name: Controls whether returned dictionary uses iDRAC card
@@ -269,6 +275,8 @@ class iDRACCardConfiguration(object):
                         form "group_id#name".
         :param fqdd_filter: An FQDD used to filter the instances.  Note that
                             this is only used when by_name is True.
+        :param lazy: Controls whether the attributes are parsed on first
+                     access rather than up front.
         :returns: a dictionary with the iDRAC settings using instance_id as the
                   key except when by_name is True. The attributes are either
                   iDRACCArdEnumerableAttribute, iDRACCardStringAttribute or
@@ -283,7 +291,8 @@ class iDRACCardConfiguration(object):
                                    self.NAMESPACES,
                                    by_name=by_name,
                                    fqdd_filter=fqdd_filter,
-                                   name_formatter=_name_formatter)
+                                   name_formatter=_name_formatter,
+                                   lazy=lazy)
 
     def set_idrac_settings(self, new_settings, idrac_fqdd):
         """Set the iDRACCard configuration settings
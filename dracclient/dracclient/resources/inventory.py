@@ -76,8 +76,10 @@ class InventoryManagement(object):
         :raises: DRACOperationFailed on error reported back by the DRAC
         """
 
-        doc = self.client.enumerate(uris.DCIM_CPUView)
+        return self.client.enumerate_parsed(uris.DCIM_CPUView,
+                                            self._parse_cpu_view)
 
+    def _parse_cpu_view(self, doc):
         cpus = utils.find_xml(doc, 'DCIM_CPUView',
                               uris.DCIM_CPUView,
                               find_all=True)
@@ -116,8 +118,10 @@ class InventoryManagement(object):
         :raises: DRACOperationFailed on error reported back by the DRAC
         """
 
-        doc = self.client.enumerate(uris.DCIM_MemoryView)
+        return self.client.enumerate_parsed(uris.DCIM_MemoryView,
+                                            self._parse_memory_view)
 
+    def _parse_memory_view(self, doc):
         installed_memory = utils.find_xml(doc, 'DCIM_MemoryView',
                                           uris.DCIM_MemoryView,
                                           find_all=True)
@@ -148,7 +152,10 @@ class InventoryManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.DCIM_NICView)
+        return self.client.enumerate_parsed(uris.DCIM_NICView,
+                                            self._parse_nic_view)
+
+    def _parse_nic_view(self, doc):
         drac_nics = utils.find_xml(doc, 'DCIM_NICView', uris.DCIM_NICView,
                                    find_all=True)
 
@@ -14,12 +14,19 @@
 import collections
 import logging
 
+from lxml import etree as ElementTree
+
+from dracclient import exceptions
 from dracclient.resources import uris
 from dracclient import utils
 from dracclient import wsman
 
 LOG = logging.getLogger(__name__)
 
+# Selector holding the ID of the job created by an invocation
+_JOB_ID_QUERY = ElementTree.ETXPath(
+    'descendant::{%s}Selector[@Name="InstanceID"]' % wsman.NS_WSMAN)
+
 JobTuple = collections.namedtuple(
     'Job',
     ['id', 'name', 'start_time', 'until_time', 'message', 'status',
@@ -92,11 +99,11 @@ class JobManagement(object):
                  interface
         """
 
-        filter_query = ('select * from DCIM_LifecycleJob where InstanceID="%s"'
-                        % job_id)
-
-        doc = self.client.enumerate(uris.DCIM_LifecycleJob,
-                                    filter_query=filter_query)
+        try:
+            doc = self.client.get(uris.DCIM_LifecycleJob,
+                                  {'InstanceID': str(job_id)})
+        except exceptions.WSManInstanceNotFound:
+            return None
 
         drac_job = utils.find_xml(doc, 'DCIM_LifecycleJob',
                                   uris.DCIM_LifecycleJob)
@@ -150,12 +157,7 @@ class JobManagement(object):
                                  selectors, properties,
                                  expected_return_value=utils.RET_CREATED)
 
-        query = ('.//{%(namespace)s}%(item)s[@%(attribute_name)s='
-                 '"%(attribute_value)s"]' %
-                 {'namespace': wsman.NS_WSMAN, 'item': 'Selector',
-                  'attribute_name': 'Name',
-                  'attribute_value': 'InstanceID'})
-        job_id = doc.find(query).text
+        job_id = _JOB_ID_QUERY(doc)[0].text
         return job_id
 
     def delete_pending_config(
@@ -199,7 +201,8 @@ class JobManagement(object):
                            expected_return_value=utils.RET_SUCCESS)
 
     def _parse_drac_job(self, drac_job):
-        return Job(id=self._get_job_attr(drac_job, 'InstanceID'),
+        return Job(id=self._get_job_attr(drac_job, 'InstanceID',
+                                         interned=False),
                    name=self._get_job_attr(drac_job, 'Name'),
                    start_time=self._get_job_attr(drac_job, 'JobStartTime'),
                    until_time=self._get_job_attr(drac_job, 'JobUntilTime'),
@@ -208,6 +211,6 @@ class JobManagement(object):
                    percent_complete=self._get_job_attr(drac_job,
                                                        'PercentComplete'))
 
-    def _get_job_attr(self, drac_job, attr_name):
+    def _get_job_attr(self, drac_job, attr_name, interned=True):
         return utils.get_wsman_resource_attr(drac_job, uris.DCIM_LifecycleJob,
-                                             attr_name)
+                                             attr_name, interned=interned)
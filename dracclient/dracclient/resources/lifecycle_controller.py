@@ -11,6 +11,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
+from dracclient import cache
 from dracclient.resources import uris
 from dracclient import utils
 from dracclient import wsman
@@ -62,18 +65,23 @@ class LCConfiguration(object):
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        result = {}
+        result = cache.ParsedDict(changed=False)
         namespaces = [(uris.DCIM_LCEnumeration, LCEnumerableAttribute),
                       (uris.DCIM_LCString, LCStringAttribute)]
         for (namespace, attr_cls) in namespaces:
             attribs = self._get_config(namespace, attr_cls)
             result.update(attribs)
+            result.changed = result.changed or attribs.changed
         return result
 
     def _get_config(self, resource, attr_cls):
-        result = {}
+        return self.client.enumerate_parsed(
+            resource, functools.partial(self._parse_config,
+                                        attr_cls=attr_cls),
+            cache_key=attr_cls)
 
-        doc = self.client.enumerate(resource)
+    def _parse_config(self, doc, attr_cls):
+        result = {}
 
         items = doc.find('.//{%s}Items' % wsman.NS_WSMAN)
         for item in items:
@@ -168,8 +168,10 @@ class RAIDManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.DCIM_ControllerView)
+        return self.client.enumerate_parsed(uris.DCIM_ControllerView,
+                                            self._parse_controller_view)
 
+    def _parse_controller_view(self, doc):
         drac_raid_controllers = utils.find_xml(doc, 'DCIM_ControllerView',
                                                uris.DCIM_ControllerView,
                                                find_all=True)
@@ -208,8 +210,10 @@ class RAIDManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.DCIM_VirtualDiskView)
+        return self.client.enumerate_parsed(uris.DCIM_VirtualDiskView,
+                                            self._parse_virtual_disk_view)
 
+    def _parse_virtual_disk_view(self, doc):
         drac_virtual_disks = utils.find_xml(doc, 'DCIM_VirtualDiskView',
                                             uris.DCIM_VirtualDiskView,
                                             find_all=True)
@@ -266,8 +270,10 @@ class RAIDManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.DCIM_PhysicalDiskView)
+        return self.client.enumerate_parsed(uris.DCIM_PhysicalDiskView,
+                                            self._parse_physical_disk_view)
 
+    def _parse_physical_disk_view(self, doc):
         drac_physical_disks = utils.find_xml(doc, 'DCIM_PhysicalDiskView',
                                              uris.DCIM_PhysicalDiskView,
                                              find_all=True)
@@ -285,7 +291,8 @@ class RAIDManagement(object):
     def _parse_drac_physical_disk(self,
                                   drac_disk,
                                   uri=uris.DCIM_PhysicalDiskView):
-        fqdd = self._get_physical_disk_attr(drac_disk, 'FQDD', uri)
+        fqdd = self._get_physical_disk_attr(drac_disk, 'FQDD', uri,
+                                            interned=True)
         size_b = self._get_physical_disk_attr(drac_disk, 'SizeInBytes', uri)
 
         free_size_b = self._get_physical_disk_attr(drac_disk,
@@ -312,11 +319,13 @@ class RAIDManagement(object):
             id=fqdd,
             description=self._get_physical_disk_attr(drac_disk,
                                                      'DeviceDescription',
-                                                     uri),
-            controller=fqdd.split(':')[-1],
+                                                     uri, interned=True),
+            controller=utils.intern_string(fqdd.split(':')[-1]),
             manufacturer=self._get_physical_disk_attr(drac_disk,
-                                                      'Manufacturer', uri),
-            model=self._get_physical_disk_attr(drac_disk, 'Model', uri),
+                                                      'Manufacturer', uri,
+                                                      interned=True),
+            model=self._get_physical_disk_attr(drac_disk, 'Model', uri,
+                                               interned=True),
             media_type=PHYSICAL_DISK_MEDIA_TYPE[drac_media_type],
             interface_type=PHYSICAL_DISK_BUS_PROTOCOL[drac_bus_protocol],
             size_mb=int(size_b) // 2 ** 20,
@@ -324,7 +333,8 @@ class RAIDManagement(object):
             serial_number=self._get_physical_disk_attr(drac_disk,
                                                        'SerialNumber', uri),
             firmware_version=self._get_physical_disk_attr(drac_disk,
-                                                          'Revision', uri),
+                                                          'Revision', uri,
+                                                          interned=True),
             status=constants.PRIMARY_STATUS[drac_status],
             raid_status=raid_status,
             sas_address=self._get_physical_disk_attr(drac_disk, 'SASAddress',
@@ -332,13 +342,14 @@ class RAIDManagement(object):
             device_protocol=self._get_physical_disk_attr(drac_disk,
                                                          'DeviceProtocol',
                                                          uri,
-                                                         allow_missing=True))
+                                                         allow_missing=True,
+                                                         interned=True))
 
     def _get_physical_disk_attr(self, drac_disk, attr_name, uri,
-                                allow_missing=False):
+                                allow_missing=False, interned=False):
         return utils.get_wsman_resource_attr(
             drac_disk, uri, attr_name, nullable=True,
-            allow_missing=allow_missing)
+            allow_missing=allow_missing, interned=interned)
 
     def convert_physical_disks(self, physical_disks, raid_enable):
         """Converts a list of physical disks into or out of RAID mode.
@@ -0,0 +1,277 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Retry policies used by the WS-Man transport and the iDRAC readiness checks.
+"""
+
+import logging
+import random
+import threading
+import time
+
+from dracclient import deadline
+from dracclient import exceptions
+
+LOG = logging.getLogger(__name__)
+
+
+class RetryBudget(object):
+    """Bounds the number of retries relative to the number of requests
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one, so
+    that in steady state at most ``ratio`` retries are sent per request. The
+    budget also accrues ``min_retries_per_sec`` tokens per second to allow
+    retries on otherwise idle clients. A single budget may be shared by any
+    number of clients and threads.
+    """
+
+    def __init__(self, ratio=0.2, min_retries_per_sec=10, max_tokens=None):
+        """Creates RetryBudget object
+
+        :param ratio: number of retries allowed per request
+        :param min_retries_per_sec: number of retries always allowed per
+                                    second, regardless of request volume
+        :param max_tokens: maximum number of retries that can be saved up.
+                           Defaults to ten seconds worth of
+                           min_retries_per_sec.
+        """
+        self.ratio = ratio
+        self.min_retries_per_sec = min_retries_per_sec
+        if max_tokens is None:
+            max_tokens = max(10 * min_retries_per_sec, 1)
+        self.max_tokens = max_tokens
+        self._tokens = float(max_tokens)
+        self._last_refill = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.time()
+        elapsed = max(now - self._last_refill, 0)
+        self._last_refill = now
+        self._tokens = min(self.max_tokens,
+                           self._tokens + elapsed * self.min_retries_per_sec)
+
+    def deposit(self):
+        """Records a request, crediting the budget"""
+
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self):
+        """Attempts to spend one retry from the budget
+
+        :returns: True if the retry is allowed, False if the budget is
+                  exhausted
+        """
+
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+# Shared by every policy created with budget=PROCESS_RETRY_BUDGET, so that a
+# whole process backs off together when a large number of BMCs misbehave.
+PROCESS_RETRY_BUDGET = RetryBudget()
+
+
+class RetryPolicy(object):
+    """Base class for retry policies
+
+    A policy is stateless and can be shared between clients; the state of a
+    single operation is tracked by the object returned by begin().
+    """
+
+    def __init__(self, max_attempts, max_elapsed=None, budget=None):
+        """Creates RetryPolicy object
+
+        :param max_attempts: maximum number of attempts, including the first
+        :param max_elapsed: maximum number of seconds from the first attempt
+                            after which no further attempt is started, or
+                            None for no limit
+        :param budget: a RetryBudget limiting the retries, or None
+        """
+        self.max_attempts = max_attempts
+        self.max_elapsed = max_elapsed
+        self.budget = budget
+
+    def delay(self, attempt):
+        """Returns the number of seconds to wait after a failed attempt
+
+        :param attempt: number of the attempt that failed, starting at 1
+        """
+        raise NotImplementedError()
+
+    def begin(self):
+        """Starts tracking a new operation
+
+        :returns: a RetryState object
+        """
+        if self.budget is not None:
+            self.budget.deposit()
+
+        return RetryState(self)
+
+
+class RetryState(object):
+    """Tracks attempts of a single operation against a RetryPolicy"""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.attempt = 1
+        self.started = time.time()
+
+    def next_delay(self):
+        """Returns the delay before the next attempt
+
+        :returns: number of seconds to wait before the next attempt, or None
+                  if the operation should not be retried
+        :raises: DRACDeadlineExceeded if the next attempt could not start
+                 before the current deadline
+        """
+        policy = self.policy
+        if self.attempt >= policy.max_attempts:
+            return None
+
+        delay = policy.delay(self.attempt)
+        if policy.max_elapsed is not None:
+            elapsed = time.time() - self.started
+            if elapsed + delay > policy.max_elapsed:
+                LOG.debug('Not retrying, %(elapsed).1f seconds elapsed of '
+                          '%(max_elapsed)s allowed',
+                          {'elapsed': elapsed,
+                           'max_elapsed': policy.max_elapsed})
+                return None
+
+        active_deadline = deadline.current()
+        if (active_deadline is not None and
+                delay >= active_deadline.remaining()):
+            # Waiting would take us past the deadline, so give up right away
+            raise exceptions.DRACDeadlineExceeded(
+                timeout=active_deadline.timeout)
+
+        if policy.budget is not None and not policy.budget.try_withdraw():
+            LOG.warning('Not retrying, the retry budget is exhausted')
+            return None
+
+        self.attempt += 1
+        return delay
+
+
+class FixedDelay(RetryPolicy):
+    """Retries after a constant delay"""
+
+    def __init__(self, max_attempts, delay=0, max_elapsed=None, budget=None):
+        """Creates FixedDelay object
+
+        :param max_attempts: maximum number of attempts, including the first
+        :param delay: number of seconds to wait between attempts
+        :param max_elapsed: maximum number of seconds from the first attempt
+                            after which no further attempt is started, or
+                            None for no limit
+        :param budget: a RetryBudget limiting the retries, or None
+        """
+        super(FixedDelay, self).__init__(max_attempts, max_elapsed, budget)
+        self._delay = delay
+
+    def delay(self, attempt):
+        return self._delay
+
+
+class ExponentialBackoff(RetryPolicy):
+    """Retries with exponentially growing delays and full jitter
+
+    The delay after the n-th failed attempt is drawn uniformly from
+    [0, min(max_delay, base_delay * 2 ** (n - 1))], which spreads out the
+    retries of clients that failed at the same time.
+    """
+
+    def __init__(self, max_attempts, base_delay=1, max_delay=60,
+                 max_elapsed=None, budget=None, jitter=True):
+        """Creates ExponentialBackoff object
+
+        :param max_attempts: maximum number of attempts, including the first
+        :param base_delay: number of seconds of the first backoff step
+        :param max_delay: upper bound of a single delay in seconds
+        :param max_elapsed: maximum number of seconds from the first attempt
+                            after which no further attempt is started, or
+                            None for no limit
+        :param budget: a RetryBudget limiting the retries, or None
+        :param jitter: whether to randomize delays (full jitter). If False,
+                       the upper bound of each step is used.
+        """
+        super(ExponentialBackoff, self).__init__(max_attempts, max_elapsed,
+                                                 budget)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt):
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(0, ceiling)
+        return ceiling
+
+
+class PullRetry(object):
+    """Retries the Pull requests of enumerations which failed transiently
+
+    A Pull which failed on a connection error, a timeout or a server error
+    is sent again with the same enumeration context, so the items already
+    received are kept. If the DRAC interface reports that the context is
+    invalid, e.g. because it expired meanwhile, the enumeration is restarted
+    from scratch. A single object may be shared by any number of clients and
+    threads, its counters then cover all of them.
+    """
+
+    def __init__(self, policy=None, max_restarts=1):
+        """Creates PullRetry object
+
+        :param policy: a RetryPolicy applied to every Pull request. Defaults
+                       to 3 attempts with exponential backoff.
+        :param max_restarts: number of times an enumeration is restarted
+                             after its context became invalid
+        """
+        if policy is None:
+            policy = ExponentialBackoff(3, base_delay=1, max_delay=10)
+        self.policy = policy
+        self.max_restarts = max_restarts
+        # Pull requests sent, including the retries
+        self.pulls = 0
+        # Pull requests sent again with the same enumeration context
+        self.retries = 0
+        # Enumerations restarted because their context became invalid
+        self.restarts = 0
+        # Enumerations failed after exhausting the retries or restarts
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def _increment(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_pull(self):
+        self._increment('pulls')
+
+    def record_retry(self):
+        self._increment('retries')
+
+    def record_restart(self):
+        self._increment('restarts')
+
+    def record_failure(self):
+        self._increment('failures')
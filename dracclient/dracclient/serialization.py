@@ -0,0 +1,287 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Compact binary serialization of the results of DRACClient methods.
+
+Records are encoded as rows of field values. The names of the fields are
+stored once per record type in a schema table at the start of the payload,
+so lists of thousands of records do not repeat them. Payloads are encoded
+with msgpack, which can be installed with the ``serialization`` extra, or
+with pickle restricted to builtin types when msgpack is not installed.
+"""
+
+import io
+import pickle
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from dracclient import exceptions
+from dracclient.resources import bios
+from dracclient.resources import idrac_card
+from dracclient.resources import inventory
+from dracclient.resources import job
+from dracclient.resources import lifecycle_controller
+from dracclient.resources import raid
+from dracclient.resources import system
+from dracclient import utils
+
+# Version of the serialization format, stored in the first byte of payloads
+FORMAT_VERSION = 1
+
+# Codecs, stored in the second byte of payloads
+MSGPACK = 'msgpack'
+PICKLE = 'pickle'
+_CODEC_IDS = {MSGPACK: b'M', PICKLE: b'P'}
+
+# Record types which can be serialized, by name
+RECORD_TYPES = dict((cls.__name__, cls) for cls in [
+    bios.BootMode, bios.BootDevice,
+    bios.BIOSEnumerableAttribute, bios.BIOSStringAttribute,
+    bios.BIOSIntegerAttribute,
+    idrac_card.iDRACCardEnumerableAttribute,
+    idrac_card.iDRACCardStringAttribute,
+    idrac_card.iDRACCardIntegerAttribute,
+    inventory.CPU, inventory.Memory, inventory.NIC,
+    job.Job,
+    lifecycle_controller.LCEnumerableAttribute,
+    lifecycle_controller.LCStringAttribute,
+    raid.PhysicalDisk, raid.RAIDController, raid.VirtualDisk,
+    system.SystemEnumerableAttribute, system.SystemStringAttribute,
+    system.SystemIntegerAttribute,
+])
+
+_IDRAC_CARD_INTERNED_FIELDS = frozenset(['name', 'instance_id', 'fqdd',
+                                         'group_id'])
+
+# Fields interned when decoded, by record type: those interned by the
+# parsers, and for the disks those mapped from constants, which the parsed
+# objects share too. Unique values such as serial numbers and job IDs are
+# left alone.
+INTERNED_FIELDS = {
+    'BIOSEnumerableAttribute': frozenset(['possible_values']),
+    'iDRACCardEnumerableAttribute': _IDRAC_CARD_INTERNED_FIELDS.union([
+        'current_value', 'pending_value', 'possible_values']),
+    'iDRACCardStringAttribute': _IDRAC_CARD_INTERNED_FIELDS,
+    'iDRACCardIntegerAttribute': _IDRAC_CARD_INTERNED_FIELDS,
+    'Job': frozenset(['name', 'start_time', 'until_time', 'message',
+                      'status', 'percent_complete']),
+    'PhysicalDisk': frozenset(['id', 'description', 'controller',
+                               'manufacturer', 'model', 'media_type',
+                               'interface_type', 'firmware_version',
+                               'status', 'raid_status', 'device_protocol']),
+}
+
+# Types of the strings decoded from payloads, unicode on Python 2
+_STRING_TYPES = (str, type(u''))
+
+# Nodes of the encoded tree of results
+_RECORD = 'R'
+_RECORDS = 'L'
+_LIST = 'M'
+_DICT = 'D'
+
+
+def _interned(value):
+    # The strings decoded from a payload are copies of their own, those of
+    # the interned fields are interned like the parsers do.
+    if isinstance(value, list):
+        return [_interned(item) for item in value]
+    if isinstance(value, _STRING_TYPES):
+        return utils.intern_string(value)
+    return value
+
+
+def _plain(value):
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+class _SchemaTable(object):
+    """Record types and field names of an encoded payload"""
+
+    def __init__(self):
+        self.entries = []
+        self._indexes = {}
+
+    def encode(self, record):
+        # Returns the index of the schema of a record and its row of values
+        if isinstance(record, utils._LazyAttribute):
+            record._materialize()
+            cls = record._attr_cls
+        else:
+            cls = type(record)
+
+        if RECORD_TYPES.get(cls.__name__) is not cls:
+            raise exceptions.InvalidParameterValue(
+                reason='Cannot serialize %r objects' % cls.__name__)
+
+        if isinstance(record, tuple):
+            fields = record._fields
+            row = [_plain(value) for value in record]
+        else:
+            fields = tuple(sorted(vars(record)))
+            row = [_plain(record.__dict__[field]) for field in fields]
+
+        key = (cls, fields)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = len(self.entries)
+            self.entries.append([cls.__name__, list(fields)])
+        return index, row
+
+
+def _encode_node(value, schemas):
+    if isinstance(value, dict):
+        keys = list(value)
+        return [_DICT, keys, [_encode_node(value[key], schemas)
+                              for key in keys]]
+
+    if isinstance(value, list):
+        nodes = [_encode_node(item, schemas) for item in value]
+        indexes = set(node[1] if node[0] == _RECORD else None
+                      for node in nodes)
+        if len(indexes) == 1 and None not in indexes:
+            # The usual list of records of one type, stored as rows
+            return [_RECORDS, indexes.pop(), [node[2] for node in nodes]]
+        return [_LIST, nodes]
+
+    index, row = schemas.encode(value)
+    return [_RECORD, index, row]
+
+
+class _Schema(object):
+    """Decoder of the rows of one record type"""
+
+    def __init__(self, name, fields):
+        cls = RECORD_TYPES.get(name)
+        if cls is None:
+            raise exceptions.InvalidParameterValue(
+                reason='Unknown record type %r' % name)
+        self.cls = cls
+        self.fields = fields
+        interned_fields = INTERNED_FIELDS.get(name, frozenset())
+        self._interned = [field in interned_fields for field in fields]
+
+    def decode(self, row):
+        row = [_interned(value) if interned else value
+               for (interned, value) in zip(self._interned, row)]
+        if issubclass(self.cls, tuple):
+            # Bypasses the __new__ of the subclasses handling deprecated
+            # fields
+            return self.cls._make(row)
+        return utils._restore_attribute(self.cls, dict(zip(self.fields, row)))
+
+
+def _decode_node(node, schemas):
+    kind = node[0]
+    if kind == _RECORD:
+        return schemas[node[1]].decode(node[2])
+    if kind == _RECORDS:
+        schema = schemas[node[1]]
+        return [schema.decode(row) for row in node[2]]
+    if kind == _LIST:
+        return [_decode_node(item, schemas) for item in node[1]]
+    if kind == _DICT:
+        return dict(zip(_interned(node[1]), [_decode_node(item, schemas)
+                                             for item in node[2]]))
+    raise exceptions.InvalidParameterValue(
+        reason='Invalid serialized result node %r' % kind)
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    """Unpickler refusing anything but builtin types"""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(
+            'Serialized results cannot refer to %s.%s' % (module, name))
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise exceptions.DRACMissingDependency(
+            feature='Serialization with msgpack', dependency='msgpack')
+
+
+def dumps(result, codec=None):
+    """Serializes the result of a DRACClient method
+
+    :param result: a record, a list of records, or a dictionary of records or
+                   of lists of records, e.g. the settings dictionaries and
+                   the boot devices grouped by boot mode. Lazy attributes
+                   are fully parsed.
+    :param codec: MSGPACK or PICKLE. Defaults to MSGPACK when msgpack is
+                  installed, PICKLE otherwise.
+    :returns: the payload, as bytes
+    :raises: InvalidParameterValue on records of unknown types or an unknown
+             codec
+    :raises: DRACMissingDependency if MSGPACK is requested and msgpack is
+             not installed
+    """
+    if codec is None:
+        codec = MSGPACK if msgpack is not None else PICKLE
+    if codec not in _CODEC_IDS:
+        raise exceptions.InvalidParameterValue(
+            reason='Unknown codec %r' % codec)
+    if codec == MSGPACK:
+        _require_msgpack()
+
+    schemas = _SchemaTable()
+    tree = _encode_node(result, schemas)
+    payload = [schemas.entries, tree]
+
+    header = bytearray([FORMAT_VERSION]) + _CODEC_IDS[codec]
+    if codec == MSGPACK:
+        return bytes(header) + msgpack.packb(payload, use_bin_type=True)
+    return bytes(header) + pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+
+
+def loads(data):
+    """Deserializes the output of dumps()
+
+    :param data: the payload, as bytes, a bytearray or a memoryview. The
+                 msgpack payloads are decoded in place.
+    :returns: the result, with plain lists and dictionaries in place of the
+              ParsedList and ParsedDict containers, and lists in place of
+              tuple field values. The strings of the fields listed in
+              INTERNED_FIELDS, and the dictionary keys, are interned in
+              dracclient.utils.INTERN_TABLE.
+    :raises: InvalidParameterValue if the payload format or codec is not
+             supported
+    :raises: DRACMissingDependency if the payload was encoded with msgpack
+             and msgpack is not installed
+    """
+    view = memoryview(data)
+    header = bytearray(view[:2])
+    if len(header) < 2 or header[0] != FORMAT_VERSION:
+        raise exceptions.InvalidParameterValue(
+            reason='Unsupported serialization format %r, expected %d' % (
+                header[0] if header else None, FORMAT_VERSION))
+
+    codec_id = bytes(header[1:])
+    if codec_id == _CODEC_IDS[MSGPACK]:
+        _require_msgpack()
+        payload = msgpack.unpackb(view[2:], raw=False)
+    elif codec_id == _CODEC_IDS[PICKLE]:
+        payload = _RestrictedUnpickler(io.BytesIO(view[2:])).load()
+    else:
+        raise exceptions.InvalidParameterValue(
+            reason='Unknown codec %r' % codec_id)
+
+    entries, tree = payload
+    schemas = [_Schema(name, fields) for (name, fields) in entries]
+    return _decode_node(tree, schemas)
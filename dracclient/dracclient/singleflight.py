@@ -0,0 +1,95 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Coalescing of identical concurrent calls.
+
+When several threads issue the same read-only call at once, only the first
+one runs it. The others wait for it to complete and receive the same result,
+or the same exception.
+"""
+
+import threading
+
+from dracclient import deadline
+from dracclient import exceptions
+
+
+class _Call(object):
+    """A call in flight"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Group(object):
+    """Thread-safe group of calls in flight, identified by keys"""
+
+    def __init__(self):
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """Runs a call, unless an identical one is in flight
+
+        The deadline of the calling thread bounds the wait for a call run by
+        another thread. If that call itself exceeded its deadline, it is run
+        again under the deadline of the calling thread.
+
+        :param key: a hashable value identifying the call
+        :param func: the callable to run
+        :param args: positional arguments of func
+        :param kwargs: keyword arguments of func
+        :returns: the value returned by func
+        :raises: the exception raised by func
+        :raises: DRACDeadlineExceeded if the deadline of the calling thread
+                 passes while waiting
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    break
+                self.shared += 1
+
+            while not call.done.wait(deadline.remaining()):
+                deadline.check()
+
+            if isinstance(call.error, exceptions.DRACDeadlineExceeded):
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        # The followers must not mistake an interrupted call, e.g. by
+        # KeyboardInterrupt or GreenletExit, for one which returned None.
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """Returns the number of calls in flight"""
+
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,250 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Snapshots of the configuration state of a node and their differences.
+"""
+
+import bisect
+import collections
+import json
+import time
+
+from dracclient import exceptions
+
+# Version of the snapshot format, stored in serialized snapshots
+SNAPSHOT_VERSION = 1
+
+# Sections of a snapshot and the DRACClient methods returning them
+SECTIONS = collections.OrderedDict([
+    ('bios_settings', 'list_bios_settings'),
+    ('idrac_settings', 'list_idrac_settings'),
+    ('lifecycle_settings', 'list_lifecycle_settings'),
+    ('system_settings', 'list_system_settings'),
+    ('boot_modes', 'list_boot_modes'),
+    ('boot_devices', 'list_boot_devices'),
+    ('raid_controllers', 'list_raid_controllers'),
+    ('virtual_disks', 'list_virtual_disks'),
+    ('physical_disks', 'list_physical_disks'),
+    ('cpus', 'list_cpus'),
+    ('memory', 'list_memory'),
+    ('nics', 'list_nics'),
+])
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+Delta = collections.namedtuple(
+    'Delta', ['section', 'key', 'change', 'field', 'old', 'new'])
+
+
+def _plain(value):
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _fields(obj):
+    if hasattr(obj, '_asdict'):
+        fields = obj._asdict()
+    else:
+        fields = vars(obj)
+    return dict((name, _plain(value)) for (name, value) in fields.items())
+
+
+def _index(result):
+    """Converts the result of a DRACClient method into a sorted index
+
+    :param result: a dictionary of settings, a list of namedtuples with an id
+                   field, or a dictionary of lists of such namedtuples
+    :returns: a list of (key, fields) tuples sorted by key
+    """
+    if isinstance(result, dict):
+        entries = []
+        for (key, value) in result.items():
+            if isinstance(value, list):
+                # Boot devices, grouped by boot mode
+                entries.extend((item.id, _fields(item)) for item in value)
+            else:
+                entries.append((key, _fields(value)))
+    else:
+        entries = [(item.id, _fields(item)) for item in result]
+
+    entries.sort(key=lambda entry: entry[0])
+    return entries
+
+
+class Snapshot(object):
+    """Configuration state of a node at a point in time
+
+    Every section is a list of (key, fields) tuples sorted by key, fields
+    being a dictionary of plain values. Snapshots can be serialized with
+    to_dict() and to_json().
+    """
+
+    def __init__(self, host, taken_at, sections, version=SNAPSHOT_VERSION):
+        """Creates Snapshot object
+
+        :param host: host the snapshot was taken from
+        :param taken_at: time the snapshot was taken, in seconds since the
+                         epoch
+        :param sections: a dictionary of section names and sorted lists of
+                         (key, fields) tuples
+        :param version: version of the snapshot format
+        """
+        self.host = host
+        self.taken_at = taken_at
+        self.sections = sections
+        self.version = version
+
+    def __eq__(self, other):
+        return self.__dict__ == other.__dict__
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def get(self, section, key):
+        """Returns the fields of an entry, or None if there is none"""
+
+        entries = self.sections.get(section, [])
+        # (key,) sorts right before the entry of key, without comparing any
+        # fields
+        position = bisect.bisect_left(entries, (key,))
+        if position < len(entries) and entries[position][0] == key:
+            return entries[position][1]
+        return None
+
+    def to_dict(self):
+        return {'version': self.version,
+                'host': self.host,
+                'taken_at': self.taken_at,
+                'sections': dict(
+                    (name, [[key, fields] for (key, fields) in entries])
+                    for (name, entries) in self.sections.items())}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Creates a Snapshot object from the output of to_dict()
+
+        :raises: InvalidParameterValue if the snapshot format is not
+                 supported
+        """
+        version = data.get('version')
+        if version != SNAPSHOT_VERSION:
+            raise exceptions.InvalidParameterValue(
+                reason='Unsupported snapshot version %r, expected %d' % (
+                    version, SNAPSHOT_VERSION))
+
+        sections = dict(
+            (name, [(key, fields) for (key, fields) in entries])
+            for (name, entries) in data['sections'].items())
+        return cls(data['host'], data['taken_at'], sections, version)
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+
+def take_snapshot(drac_client, sections=None):
+    """Captures the configuration state of a node
+
+    :param drac_client: a DRACClient object
+    :param sections: names of the sections to capture, keys of SECTIONS.
+                     Defaults to all of them.
+    :returns: a Snapshot object
+    :raises: InvalidParameterValue on unknown sections
+    :raises: WSManRequestFailure on request failures
+    :raises: WSManInvalidResponse when receiving invalid response
+    :raises: DRACOperationFailed on error reported back by the DRAC
+             interface
+    """
+    if sections is None:
+        sections = list(SECTIONS)
+
+    unknown_sections = set(sections) - set(SECTIONS)
+    if unknown_sections:
+        raise exceptions.InvalidParameterValue(
+            reason='Unknown snapshot sections: %s' % ', '.join(
+                sorted(unknown_sections)))
+
+    taken_at = time.time()
+    result = {}
+    for name in sections:
+        result[name] = _index(getattr(drac_client, SECTIONS[name])())
+
+    return Snapshot(drac_client.client.host, taken_at, result)
+
+
+def diff(old, new, sections=None):
+    """Computes the differences between two snapshots
+
+    Each section is compared by walking the sorted entries of both snapshots
+    side by side, so the cost is linear in the number of entries.
+
+    :param old: a Snapshot object
+    :param new: a Snapshot object
+    :param sections: names of the sections to compare. Defaults to the
+                     sections of either snapshot.
+    :returns: a list of Delta namedtuples, ordered by section, key and field.
+              Added and removed entries have a single delta with the field
+              set to None and old or new holding all their fields.
+    """
+    if sections is None:
+        sections = sorted(set(old.sections) | set(new.sections))
+
+    deltas = []
+    for section in sections:
+        _diff_section(section, old.sections.get(section, []),
+                      new.sections.get(section, []), deltas)
+    return deltas
+
+
+def _diff_section(section, old_entries, new_entries, deltas):
+    old_index = new_index = 0
+    while old_index < len(old_entries) or new_index < len(new_entries):
+        if new_index >= len(new_entries):
+            (key, fields) = old_entries[old_index]
+            deltas.append(Delta(section, key, REMOVED, None, fields, None))
+            old_index += 1
+            continue
+
+        if old_index >= len(old_entries):
+            (key, fields) = new_entries[new_index]
+            deltas.append(Delta(section, key, ADDED, None, None, fields))
+            new_index += 1
+            continue
+
+        (old_key, old_fields) = old_entries[old_index]
+        (new_key, new_fields) = new_entries[new_index]
+        if old_key < new_key:
+            deltas.append(Delta(section, old_key, REMOVED, None, old_fields,
+                                None))
+            old_index += 1
+        elif new_key < old_key:
+            deltas.append(Delta(section, new_key, ADDED, None, None,
+                                new_fields))
+            new_index += 1
+        else:
+            if old_fields != new_fields:
+                for field in sorted(set(old_fields) | set(new_fields)):
+                    old_value = old_fields.get(field)
+                    new_value = new_fields.get(field)
+                    if old_value != new_value:
+                        deltas.append(Delta(section, old_key, CHANGED, field,
+                                            old_value, new_value))
+            old_index += 1
+            new_index += 1
@@ -0,0 +1,269 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+import mock
+
+from dracclient import analytics
+from dracclient import exceptions
+from dracclient.resources import inventory as inventory_resource
+from dracclient.resources import raid
+from dracclient.tests import base
+
+
+def _disk(index, media_type, firmware_version, free_size_mb,
+          controller='RAID.Integrated.1-1'):
+    return raid.PhysicalDisk(
+        id='Disk.Bay.%d:Enclosure.Internal.0-1:%s' % (index, controller),
+        description='Disk %d' % index, controller=controller,
+        manufacturer='SEAGATE', model='ST600MM0006', media_type=media_type,
+        interface_type='sas', size_mb=1000, free_size_mb=free_size_mb,
+        serial_number='S0M3EY%d' % index,
+        firmware_version=firmware_version, status='ok',
+        raid_status='online', sas_address='500056B37789ABE%d' % index,
+        device_protocol=None)
+
+
+def _controller(controller_id, model):
+    return raid.RAIDController(
+        id=controller_id, description='Integrated RAID Controller 1',
+        manufacturer='DELL', model=model, primary_status='ok',
+        firmware_version='25.5.0.0018', bus='1')
+
+
+@unittest.skipIf(analytics.numpy is None, 'numpy is not installed')
+class FleetInventoryTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(FleetInventoryTestCase, self).setUp()
+        self.inventory = analytics.FleetInventory()
+        self.inventory.add('node-1', 'physical_disks', [
+            _disk(0, 'ssd', 'LS0A', 50),
+            _disk(1, 'hdd', 'LS0A', 500),
+            _disk(2, 'ssd', 'LS0B', 900)])
+        self.inventory.add('node-2', 'physical_disks', [
+            _disk(0, 'ssd', 'LS0A', 20, controller='RAID.Slot.1-1')])
+        self.inventory.add('node-1', 'raid_controllers', [
+            _controller('RAID.Integrated.1-1', 'PERC H730P Mini')])
+        self.inventory.add('node-2', 'raid_controllers', [
+            _controller('RAID.Slot.1-1', 'PERC H330 Adapter')])
+        self.disks = self.inventory.table('physical_disks')
+
+    def test_table(self):
+        self.assertEqual(4, len(self.disks))
+        self.assertEqual(['node-1', 'node-1', 'node-1', 'node-2'],
+                         list(self.disks['host']))
+        self.assertEqual([50, 500, 900, 20],
+                         list(self.disks['free_size_mb']))
+        self.assertEqual(analytics.INT, self.disks.types['size_mb'])
+        self.assertEqual(analytics.CATEGORY, self.disks.types['model'])
+        self.assertEqual(analytics.OBJECT,
+                         self.disks.types['serial_number'])
+        # Repeated values are stored once
+        self.assertEqual(['SEAGATE'],
+                         self.disks.columns['manufacturer'].categories)
+
+    def test_table_with_missing_values(self):
+        self.assertEqual([None] * 4, list(self.disks['device_protocol']))
+        self.assertFalse(self.disks.eq('device_protocol', 'NVMe').any())
+        self.assertTrue(self.disks.eq('device_protocol', None).all())
+
+    def test_table_with_unknown_kind(self):
+        self.assertRaises(KeyError, self.inventory.table, 'fans')
+
+    def test_table_is_rebuilt_after_add(self):
+        self.inventory.add('node-3', 'physical_disks',
+                           [_disk(0, 'hdd', 'LS0A', 1000)])
+
+        self.assertEqual(5, len(self.inventory.table('physical_disks')))
+        self.assertEqual(4, len(self.disks))
+
+    def test_add_from(self):
+        inventory = analytics.FleetInventory()
+        inventory.add_from([('node-1', 'physical_disks', _disk(0, 'ssd',
+                                                               'LS0A', 50)),
+                            ('node-2', 'physical_disks', _disk(0, 'hdd',
+                                                               'LS0A', 50))])
+
+        self.assertEqual(['ssd', 'hdd'],
+                         list(inventory.table('physical_disks')['media_type']))
+
+    def test_filter(self):
+        result = self.disks.filter(media_type='ssd', firmware_version='LS0A')
+
+        self.assertEqual(['node-1', 'node-2'], list(result['host']))
+
+    def test_filter_with_list(self):
+        result = self.disks.filter(firmware_version=['LS0B', 'unknown'])
+
+        self.assertEqual([900], list(result['free_size_mb']))
+
+    def test_filter_with_unknown_value(self):
+        self.assertEqual(0, len(self.disks.filter(media_type='tape')))
+
+    def test_where(self):
+        mask = (self.disks.eq('media_type', 'ssd') &
+                (self.disks['free_size_mb'] < 0.1 * self.disks['size_mb']))
+
+        result = self.disks.where(mask)
+
+        self.assertEqual([50, 20], list(result['free_size_mb']))
+
+    def test_group_by(self):
+        result = self.disks.group_by(
+            ['host', 'media_type'],
+            {'disks': ('id', 'count'),
+             'free_size_mb': ('free_size_mb', 'sum'),
+             'max_free_size_mb': ('free_size_mb', 'max'),
+             'min_free_size_mb': ('free_size_mb', 'min'),
+             'mean_free_size_mb': ('free_size_mb', 'mean')})
+
+        rows = sorted(result.rows(),
+                      key=lambda row: (row['host'], row['media_type']))
+        self.assertEqual(3, len(rows))
+        self.assertEqual('node-1', rows[1]['host'])
+        self.assertEqual('ssd', rows[1]['media_type'])
+        self.assertEqual(2, rows[1]['disks'])
+        self.assertEqual(950, rows[1]['free_size_mb'])
+        self.assertEqual(900, rows[1]['max_free_size_mb'])
+        self.assertEqual(50, rows[1]['min_free_size_mb'])
+        self.assertEqual(475.0, rows[1]['mean_free_size_mb'])
+        self.assertEqual(analytics.FLOAT,
+                         result.types['mean_free_size_mb'])
+
+    def test_group_by_empty_table(self):
+        empty = self.disks.filter(host='node-3')
+
+        result = empty.group_by(['host'], {'disks': ('id', 'count')})
+
+        self.assertEqual(0, len(result))
+        self.assertEqual([], list(result.rows()))
+
+    def test_group_by_with_missing_values(self):
+        self.inventory.add('node-2', 'physical_disks', [
+            _disk(1, 'ssd', 'LS0A', None, controller='RAID.Slot.1-1')])
+        self.inventory.add('node-3', 'physical_disks', [
+            _disk(0, 'ssd', 'LS0A', None)])
+        disks = self.inventory.table('physical_disks').filter(
+            host=['node-2', 'node-3'])
+
+        result = disks.group_by(
+            ['host'],
+            {'disks': ('id', 'count'),
+             'free_size_mb': ('free_size_mb', 'sum'),
+             'min_free_size_mb': ('free_size_mb', 'min'),
+             'max_free_size_mb': ('free_size_mb', 'max'),
+             'mean_free_size_mb': ('free_size_mb', 'mean')})
+
+        rows = sorted(result.rows(), key=lambda row: row['host'])
+        self.assertEqual(2, rows[0]['disks'])
+        self.assertEqual(20, rows[0]['free_size_mb'])
+        self.assertEqual(20, rows[0]['min_free_size_mb'])
+        self.assertEqual(20, rows[0]['max_free_size_mb'])
+        self.assertEqual(20.0, rows[0]['mean_free_size_mb'])
+        self.assertEqual(1, rows[1]['disks'])
+        self.assertEqual(analytics.INT_MISSING, rows[1]['free_size_mb'])
+        self.assertEqual(analytics.INT_MISSING, rows[1]['min_free_size_mb'])
+        self.assertEqual(analytics.INT_MISSING, rows[1]['max_free_size_mb'])
+        self.assertTrue(analytics.numpy.isnan(rows[1]['mean_free_size_mb']))
+
+    def test_group_by_with_missing_object_keys(self):
+        self.inventory.add('node-3', 'physical_disks', [
+            _disk(index, 'ssd', 'LS0A', 100)._replace(sas_address=None)
+            for index in (0, 1)])
+        disks = self.inventory.table('physical_disks')
+
+        result = disks.group_by(['sas_address'], {'disks': ('id', 'count')})
+
+        self.assertEqual(
+            [(None, 2), ('500056B37789ABE0', 2), ('500056B37789ABE1', 1),
+             ('500056B37789ABE2', 1)],
+            sorted(((row['sas_address'], row['disks'])
+                    for row in result.rows()),
+                   key=lambda row: row[0] or ''))
+
+    def test_group_by_with_bool_column(self):
+        inventory = analytics.FleetInventory()
+        inventory.add('node-1', 'cpus', [
+            inventory_resource.CPU(
+                id='CPU.Socket.%d' % index, cores=8, speed_mhz=2400,
+                model='Intel(R) Xeon(R) CPU E5-2620 v4 @ 2.10GHz',
+                status='ok', ht_enabled=False, turbo_enabled=bool(index),
+                vt_enabled=True, arch64=True)
+            for index in (0, 1)])
+
+        result = inventory.table('cpus').group_by(
+            ['host'],
+            {'ht_enabled': ('ht_enabled', 'max'),
+             'vt_enabled': ('vt_enabled', 'min'),
+             'turbo_enabled': ('turbo_enabled', 'min'),
+             'any_turbo_enabled': ('turbo_enabled', 'max')})
+
+        self.assertEqual([False], list(result['ht_enabled']))
+        self.assertEqual([True], list(result['vt_enabled']))
+        self.assertEqual([False], list(result['turbo_enabled']))
+        self.assertEqual([True], list(result['any_turbo_enabled']))
+        self.assertEqual(bool, result['ht_enabled'].dtype)
+
+    def test_group_by_with_unknown_aggregation(self):
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          self.disks.group_by, ['host'],
+                          {'median': ('size_mb', 'median')})
+
+    def test_group_by_with_categorical_sum(self):
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          self.disks.group_by, ['host'],
+                          {'models': ('model', 'sum')})
+
+    def test_join(self):
+        controllers = self.inventory.table('raid_controllers')
+
+        result = self.disks.join(controllers,
+                                 [('host', 'host'), ('controller', 'id')],
+                                 ['model', 'firmware_version'],
+                                 prefix='controller_')
+
+        self.assertEqual(['PERC H730P Mini'] * 3 + ['PERC H330 Adapter'],
+                         list(result['controller_model']))
+        self.assertEqual(['25.5.0.0018'] * 4,
+                         list(result['controller_firmware_version']))
+        self.assertEqual(['ST600MM0006'] * 4, list(result['model']))
+
+    def test_join_without_match(self):
+        controllers = self.inventory.table('raid_controllers').filter(
+            host='node-2')
+
+        result = self.disks.join(controllers,
+                                 [('host', 'host'), ('controller', 'id')],
+                                 ['model'], prefix='controller_')
+
+        self.assertEqual([None] * 3 + ['PERC H330 Adapter'],
+                         list(result['controller_model']))
+
+    def test_join_on_object_columns(self):
+        controllers = self.inventory.table('raid_controllers')
+        disks = self.disks.where(self.disks.eq('host', 'node-2'))
+
+        result = disks.join(controllers, [('serial_number', 'description')],
+                            ['model'], prefix='controller_')
+
+        self.assertEqual([None], list(result['controller_model']))
+
+
+class MissingNumpyTestCase(base.BaseTest):
+
+    @mock.patch.object(analytics, 'numpy', None)
+    def test_fleet_inventory(self):
+        self.assertRaises(exceptions.DRACMissingDependency,
+                          analytics.FleetInventory)
@@ -0,0 +1,111 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from dracclient import batching
+from dracclient.tests import base
+
+
+class AdaptiveBatchSizerTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(AdaptiveBatchSizerTestCase, self).setUp()
+        self.sizer = batching.AdaptiveBatchSizer(
+            initial=100, minimum=10, maximum=800, target_latency=4,
+            max_response_bytes=1000, ceiling_ttl=60)
+
+    def _size(self, host='1.2.3.4', firmware_version=None):
+        return self.sizer.size(host, 'resource', firmware_version)
+
+    def test_initial(self):
+        self.assertEqual(100, self._size())
+
+    def test_grows_on_fast_responses(self):
+        for expected in (200, 400, 800, 800):
+            self.sizer.record_response('1.2.3.4', 'resource', None,
+                                       self._size(), 1, 100)
+            self.assertEqual(expected, self._size())
+
+        self.assertEqual(100, self._size(host='5.6.7.8'))
+
+    def test_keeps_size_on_moderate_responses(self):
+        self.sizer.record_response('1.2.3.4', 'resource', None, 100, 3)
+        self.sizer.record_response('1.2.3.4', 'resource', None, 100, 1, 600)
+
+        self.assertEqual(100, self._size())
+
+    def test_shrinks_on_slow_responses(self):
+        self.sizer.record_response('1.2.3.4', 'resource', None, 100, 5)
+        self.assertEqual(50, self._size())
+
+        self.sizer.record_response('1.2.3.4', 'resource', None, 50, 1, 2000)
+        self.assertEqual(25, self._size())
+
+    def test_explicit_sizes_do_not_shrink_learned_size(self):
+        self.sizer.record_response('1.2.3.4', 'resource', None, 10, 1)
+
+        self.assertEqual(100, self._size())
+
+    def test_minimum(self):
+        for i in range(5):
+            self.sizer.record_failure('1.2.3.4', 'resource', None,
+                                      self._size())
+
+        self.assertEqual(10, self._size())
+
+    @mock.patch('time.time', autospec=True)
+    def test_failed_size_not_tried_again(self, mock_time):
+        mock_time.return_value = 1000
+        self.sizer.record_failure('1.2.3.4', 'resource', None, 100)
+        self.assertEqual(50, self._size())
+
+        self.sizer.record_response('1.2.3.4', 'resource', None, 50, 1)
+        self.assertEqual(99, self._size())
+        self.sizer.record_response('1.2.3.4', 'resource', None, 99, 1)
+        self.assertEqual(99, self._size())
+
+        mock_time.return_value = 1060
+        self.sizer.record_response('1.2.3.4', 'resource', None, 99, 1)
+        self.assertEqual(198, self._size())
+
+    def test_remembers_size_per_firmware_version(self):
+        self.sizer.record_response('1.2.3.4', 'resource', '2.70.70.70', 100,
+                                   1)
+        self.sizer.record_failure('1.2.3.4', 'resource', '2.70.70.70', 200)
+
+        self.assertEqual(100, self._size(host='5.6.7.8',
+                                         firmware_version='2.70.70.70'))
+        self.assertEqual(100, self._size(host='9.10.11.12'))
+        self.assertEqual(100, self._size(host='13.14.15.16',
+                                         firmware_version='3.00.00.00'))
+
+        # The failed size is not tried on hosts with the same firmware either
+        self.sizer.record_response('5.6.7.8', 'resource', '2.70.70.70', 100,
+                                   1)
+        self.assertEqual(199, self._size(host='5.6.7.8'))
+
+    def test_max_entries(self):
+        sizer = batching.AdaptiveBatchSizer(max_entries=2)
+        sizer.record_response('1.2.3.4', 'resource', None, 100, 1)
+        sizer.record_response('5.6.7.8', 'resource', None, 100, 1)
+        sizer.size('9.10.11.12', 'resource')
+
+        self.assertEqual(200, sizer.size('5.6.7.8', 'resource'))
+        self.assertEqual(100, sizer.size('1.2.3.4', 'resource'))
+
+    def test_clear(self):
+        self.sizer.record_response('1.2.3.4', 'resource', None, 100, 1)
+        self.sizer.clear()
+
+        self.assertEqual(100, self._size())
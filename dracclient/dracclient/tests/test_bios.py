@@ -11,12 +11,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import pickle
 import re
+import threading
+import time
 
 import lxml.etree
 import mock
 import requests_mock
 
+from dracclient import cache
 import dracclient.client
 from dracclient import constants
 from dracclient import exceptions
@@ -24,6 +28,7 @@ from dracclient.resources import bios
 import dracclient.resources.job
 from dracclient.resources import lifecycle_controller
 from dracclient.resources import uris
+from dracclient import singleflight
 from dracclient.tests import base
 from dracclient.tests import utils as test_utils
 from dracclient import utils
@@ -310,6 +315,135 @@ class ClientBIOSConfigurationTestCase(base.BaseTest):
         self.assertIn('Proc1NumCores', bios_settings)
         self.assertEqual(expected_integer_attr, bios_settings['Proc1NumCores'])
 
+    def test_list_bios_settings_with_parse_cache(
+            self, mock_requests, mock_wait_until_idrac_is_ready):
+        drac_client = dracclient.client.DRACClient(
+            parse_cache=cache.ParseCache(), **test_utils.FAKE_ENDPOINT)
+        responses = [
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSEnumeration]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSString]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSInteger]['ok']}]
+        changed_integers = test_utils.BIOSEnumerations[
+            uris.DCIM_BIOSInteger]['ok'].replace(
+                '<n1:CurrentValue>8</n1:CurrentValue>',
+                '<n1:CurrentValue>6</n1:CurrentValue>')
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           responses * 2 + responses[:2] +
+                           [{'text': changed_integers}])
+
+        first = drac_client.list_bios_settings()
+        second = drac_client.list_bios_settings()
+        third = drac_client.list_bios_settings()
+
+        self.assertTrue(first.changed)
+        self.assertFalse(second.changed)
+        self.assertEqual(first, second)
+        self.assertIs(first['MemTest'], third['MemTest'])
+        self.assertTrue(third.changed)
+        self.assertEqual(6, third['Proc1NumCores'].current_value)
+
+    def test_list_bios_settings_lazy(self, mock_requests,
+                                     mock_wait_until_idrac_is_ready):
+        expected_enum_attr = bios.BIOSEnumerableAttribute(
+            name='MemTest',
+            instance_id='BIOS.Setup.1-1:MemTest',
+            read_only=False,
+            current_value='Disabled',
+            pending_value=None,
+            possible_values=['Enabled', 'Disabled'])
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSEnumeration]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSString]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSInteger]['ok']}])
+
+        with mock.patch.object(bios.BIOSEnumerableAttribute, 'parse',
+                               autospec=True) as mock_parse:
+            bios_settings = self.drac_client.list_bios_settings(lazy=True)
+            mem_test = bios_settings['MemTest']
+            self.assertEqual('BIOS.Setup.1-1:MemTest', mem_test.instance_id)
+            self.assertFalse(mock_parse.called)
+
+        self.assertEqual(103, len(bios_settings))
+        self.assertIsInstance(mem_test, bios.BIOSEnumerableAttribute)
+        self.assertEqual(['Enabled', 'Disabled'], mem_test.possible_values)
+        self.assertEqual(expected_enum_attr, mem_test)
+        self.assertEqual(mem_test, expected_enum_attr)
+        self.assertIsNotNone(mem_test.validate('Foo'))
+        self.assertEqual(
+            8, bios_settings['Proc1NumCores'].current_value)
+
+        copied_attr = pickle.loads(pickle.dumps(
+            bios_settings['SystemModelName']))
+        self.assertIs(bios.BIOSStringAttribute, type(copied_attr))
+        self.assertEqual(bios_settings['SystemModelName'], copied_attr)
+
+    def test_list_bios_settings_lazy_with_parse_cache(
+            self, mock_requests, mock_wait_until_idrac_is_ready):
+        parse_cache = cache.ParseCache()
+        drac_client = dracclient.client.DRACClient(
+            parse_cache=parse_cache, coalesce_requests=True,
+            **test_utils.FAKE_ENDPOINT)
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSEnumeration]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSString]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSInteger]['ok']}] * 2)
+
+        with mock.patch.object(singleflight.Group, 'do',
+                               autospec=True) as mock_do:
+            first = drac_client.list_bios_settings(lazy=True)
+            second = drac_client.list_bios_settings(lazy=True)
+
+        # Lazy attributes hold on to the response, they are neither cached
+        # nor shared with other calls
+        self.assertFalse(mock_do.called)
+        self.assertEqual(0, len(parse_cache._entries))
+        self.assertTrue(second.changed)
+        self.assertIsNot(first['MemTest'], second['MemTest'])
+        self.assertEqual(first, second)
+
+    def test_list_bios_settings_lazy_read_by_threads(
+            self, mock_requests, mock_wait_until_idrac_is_ready):
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSEnumeration]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSString]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSInteger]['ok']}])
+        mem_test = self.drac_client.list_bios_settings(lazy=True)['MemTest']
+        parse = bios.BIOSEnumerableAttribute.parse
+        results = []
+
+        def slow_parse(item):
+            time.sleep(0.01)
+            return parse(item)
+
+        def read():
+            try:
+                results.append(mem_test.current_value)
+            except Exception as ex:
+                results.append(ex)
+
+        with mock.patch.object(bios.BIOSEnumerableAttribute, 'parse',
+                               side_effect=slow_parse) as mock_parse:
+            threads = [threading.Thread(target=read) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(['Disabled'] * 8, results)
+        self.assertEqual(1, mock_parse.call_count)
+
     def test_list_bios_settings_by_name_with_colliding_attrs(
             self, mock_requests, mock_wait_until_idrac_is_ready):
         mock_requests.post('https://1.2.3.4:443/wsman', [
@@ -0,0 +1,126 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from dracclient import cache
+from dracclient.resources import uris
+from dracclient.tests import base
+from dracclient.tests import utils as test_utils
+
+
+def _digest(*contents):
+    items_digest = cache.ItemsDigest()
+    for content in contents:
+        items_digest.update(content.encode('utf-8'))
+    return items_digest.hexdigest()
+
+
+class ItemsDigestTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ItemsDigestTestCase, self).setUp()
+        self.content = test_utils.InventoryEnumerations[
+            uris.DCIM_CPUView]['ok']
+
+    def test_ignores_headers(self):
+        other_content = self.content.replace(
+            'uuid:247e710c-29de-19de-93c9-f148d4fe83b0',
+            'uuid:00000000-29de-19de-93c9-f148d4fe83b0')
+
+        self.assertNotEqual(self.content, other_content)
+        self.assertEqual(_digest(self.content), _digest(other_content))
+
+    def test_detects_changed_items(self):
+        other_content = self.content.replace(
+            '<n1:NumberOfProcessorCores>6',
+            '<n1:NumberOfProcessorCores>8')
+
+        self.assertNotEqual(self.content, other_content)
+        self.assertNotEqual(_digest(self.content), _digest(other_content))
+
+    def test_ignores_enumeration_context(self):
+        contents = test_utils.WSManEnumerations['context']
+        other_first = contents[0].replace('enum-context-uuid',
+                                          'other-context-uuid')
+
+        self.assertNotEqual(contents[0], other_first)
+        self.assertEqual(_digest(*contents),
+                         _digest(other_first, *contents[1:]))
+
+    def test_empty_items(self):
+        self.assertIsNotNone(_digest('<s:Body><wsman:Items/></s:Body>'))
+
+    def test_missing_items(self):
+        self.assertIsNone(_digest(self.content, '<s:Body></s:Body>'))
+
+    def test_reset(self):
+        items_digest = cache.ItemsDigest()
+        items_digest.update(b'<s:Body></s:Body>')
+        self.assertIsNone(items_digest.hexdigest())
+
+        items_digest.reset()
+        items_digest.update(self.content.encode('utf-8'))
+
+        self.assertEqual(_digest(self.content), items_digest.hexdigest())
+
+
+class ParseCacheTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ParseCacheTestCase, self).setUp()
+        self.cache = cache.ParseCache(max_entries=2)
+
+    def test_get(self):
+        result = ['cpu']
+        self.cache.put('key', 'digest', result)
+
+        self.assertIs(result, self.cache.get('key', 'digest'))
+        self.assertEqual(1, self.cache.hits)
+
+    def test_get_with_other_digest(self):
+        self.cache.put('key', 'digest', ['cpu'])
+
+        self.assertIsNone(self.cache.get('key', 'other-digest'))
+        self.assertIsNone(self.cache.get('key', None))
+        self.assertIsNone(self.cache.get('other-key', 'digest'))
+        self.assertEqual(3, self.cache.misses)
+
+    def test_put_without_digest(self):
+        self.cache.put('key', None, ['cpu'])
+
+        self.assertIsNone(self.cache.get('key', None))
+
+    def test_eviction(self):
+        self.cache.put('key-1', 'digest', ['cpu-1'])
+        self.cache.put('key-2', 'digest', ['cpu-2'])
+        self.cache.get('key-1', 'digest')
+        self.cache.put('key-3', 'digest', ['cpu-3'])
+
+        self.assertEqual(['cpu-1'], self.cache.get('key-1', 'digest'))
+        self.assertIsNone(self.cache.get('key-2', 'digest'))
+        self.assertEqual(['cpu-3'], self.cache.get('key-3', 'digest'))
+
+    def test_clear(self):
+        self.cache.put('key', 'digest', ['cpu'])
+
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get('key', 'digest'))
+
+    def test_mark_changed(self):
+        parsed_list = cache.mark_changed(['cpu'], False)
+        parsed_dict = cache.mark_changed({'name': 'attribute'}, True)
+
+        self.assertEqual(['cpu'], parsed_list)
+        self.assertFalse(parsed_list.changed)
+        self.assertEqual({'name': 'attribute'}, parsed_dict)
+        self.assertTrue(parsed_dict.changed)
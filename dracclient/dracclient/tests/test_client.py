@@ -12,12 +12,16 @@
 #    under the License.
 
 import mock
+import requests.exceptions
 import requests_mock
 
+import dracclient.cache
 import dracclient.client
 from dracclient import constants
 from dracclient import exceptions
 from dracclient.resources import uris
+import dracclient.retry
+import dracclient.wsman
 from dracclient.tests import base
 from dracclient.tests import utils as test_utils
 
@@ -50,6 +54,98 @@ class WSManClientTestCase(base.BaseTest):
         self.assertFalse(mock_wait_until_idrac_is_ready.called)
         self.assertEqual('yay!', resp.text)
 
+    @mock.patch.object(dracclient.client.WSManClient,
+                       'wait_until_idrac_is_ready', spec_set=True,
+                       autospec=True)
+    def test_enumerate_selectors(self, mock_requests,
+                                 mock_wait_until_idrac_is_ready):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['epr'][0]},
+             {'text': test_utils.WSManEnumerations['epr'][1]}])
+
+        client = dracclient.client.WSManClient(**test_utils.FAKE_ENDPOINT)
+        selectors = client.enumerate_selectors(uris.DCIM_PhysicalDiskView)
+        mock_wait_until_idrac_is_ready.assert_called_once_with(client)
+        self.assertEqual(
+            ['Disk.Bay.0:Enclosure.Internal.0-1:RAID.Integrated.1-1',
+             'Disk.Bay.1:Enclosure.Internal.0-1:RAID.Integrated.1-1'],
+            [selector['InstanceID'] for selector in selectors])
+
+    @mock.patch.object(dracclient.client.WSManClient,
+                       'wait_until_idrac_is_ready', spec_set=True,
+                       autospec=True)
+    def test_enumerate_parsed_with_parse_cache_and_filter_dialect(
+            self, mock_requests, mock_wait_until_idrac_is_ready):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=test_utils.WSManEnumerations['context'][3])
+        parse = mock.Mock(return_value=['item'])
+
+        client = dracclient.client.WSManClient(
+            parse_cache=dracclient.cache.ParseCache(),
+            **test_utils.FAKE_ENDPOINT)
+        cql = client.enumerate_parsed('http://resource', parse,
+                                      filter_query='Foo', filter_dialect='cql')
+        wql = client.enumerate_parsed('http://resource', parse,
+                                      filter_query='Foo', filter_dialect='wql')
+        wql_again = client.enumerate_parsed('http://resource', parse,
+                                            filter_query='Foo',
+                                            filter_dialect='wql')
+
+        self.assertTrue(cql.changed)
+        self.assertTrue(wql.changed)
+        self.assertFalse(wql_again.changed)
+        self.assertEqual(2, parse.call_count)
+
+    @mock.patch.object(dracclient.client.WSManClient,
+                       'wait_until_idrac_is_ready', spec_set=True,
+                       autospec=True)
+    def test_enumerate_parsed_from_parse_cache_skips_parsing(
+            self, mock_requests, mock_wait_until_idrac_is_ready):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['context'][index]}
+             for index in range(4)] * 2)
+        parse = mock.Mock(return_value=['item'])
+        client = dracclient.client.WSManClient(
+            parse_cache=dracclient.cache.ParseCache(),
+            **test_utils.FAKE_ENDPOINT)
+        first = client.enumerate_parsed('http://resource', parse)
+
+        with mock.patch.object(dracclient.wsman, 'parse_response',
+                               autospec=True) as mock_parse_response:
+            second = client.enumerate_parsed('http://resource', parse)
+
+        self.assertTrue(first.changed)
+        self.assertFalse(second.changed)
+        self.assertEqual(8, mock_requests.call_count)
+        self.assertEqual(1, parse.call_count)
+        self.assertFalse(mock_parse_response.called)
+
+    @mock.patch.object(dracclient.client.WSManClient,
+                       'wait_until_idrac_is_ready', spec_set=True,
+                       autospec=True)
+    def test_iter_items(self, mock_requests, mock_wait_until_idrac_is_ready):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=test_utils.WSManEnumerations['context'][3])
+
+        client = dracclient.client.WSManClient(**test_utils.FAKE_ENDPOINT)
+        items = client.iter_items('http://resource')
+        mock_wait_until_idrac_is_ready.assert_called_once_with(client)
+        self.assertEqual(['5'], [item[0].text for item in items])
+
+    @mock.patch.object(dracclient.client.WSManClient,
+                       'wait_until_idrac_is_ready', spec_set=True,
+                       autospec=True)
+    def test_get(self, mock_requests, mock_wait_until_idrac_is_ready):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+
+        client = dracclient.client.WSManClient(**test_utils.FAKE_ENDPOINT)
+        resp = client.get('http://resource', {'InstanceID': 'foo'})
+        mock_wait_until_idrac_is_ready.assert_called_once_with(client)
+        self.assertEqual('yay!', resp.text)
+
     @mock.patch.object(dracclient.client.WSManClient,
                        'wait_until_idrac_is_ready', spec_set=True,
                        autospec=True)
@@ -210,6 +306,43 @@ class WSManClientTestCase(base.BaseTest):
         self.assertEqual(mock_ts.call_count, retries - 1)
         mock_ts.assert_called_with(retry_delay)
 
+    @mock.patch.object(dracclient.client.WSManClient, 'is_idrac_ready',
+                       autospec=True)
+    @mock.patch('time.sleep', autospec=True)
+    def test_wait_until_idrac_is_ready_with_ready_retry_policy(
+            self, mock_requests, mock_ts, mock_is_idrac_ready):
+        mock_is_idrac_ready.side_effect = [False, False, True]
+        ready_retry_policy = dracclient.retry.ExponentialBackoff(
+            5, base_delay=3, jitter=False)
+
+        client = dracclient.client.WSManClient(
+            ready_retry_policy=ready_retry_policy, **test_utils.FAKE_ENDPOINT)
+        client.wait_until_idrac_is_ready()
+
+        self.assertEqual(3, mock_is_idrac_ready.call_count)
+        self.assertEqual([mock.call(3), mock.call(6)], mock_ts.call_args_list)
+
+    @mock.patch.object(dracclient.client.WSManClient, 'is_idrac_ready',
+                       autospec=True)
+    @mock.patch('time.sleep', autospec=True)
+    @mock.patch('time.time', autospec=True)
+    def test_wait_until_idrac_is_ready_with_deadline(
+            self, mock_requests, mock_time, mock_ts, mock_is_idrac_ready):
+        mock_time.return_value = 100
+        mock_is_idrac_ready.return_value = False
+
+        def sleep(seconds):
+            mock_time.return_value += seconds
+        mock_ts.side_effect = sleep
+
+        drac_client = dracclient.client.DRACClient(
+            **test_utils.FAKE_ENDPOINT)
+        with drac_client.deadline(35):
+            self.assertRaises(exceptions.DRACDeadlineExceeded,
+                              drac_client.wait_until_idrac_is_ready)
+
+        self.assertEqual(3, mock_ts.call_count)
+
     def test_wait_until_idrac_is_ready_ready(self, mock_requests):
         expected_text = test_utils.LifecycleControllerInvocations[
             uris.DCIM_LCService]['GetRemoteServicesAPIStatus']['is_ready']
@@ -236,3 +369,50 @@ class WSManClientTestCase(base.BaseTest):
         client = dracclient.client.WSManClient(**test_utils.FAKE_ENDPOINT)
         self.assertRaises(exceptions.DRACOperationFailed,
                           client.wait_until_idrac_is_ready)
+
+
+@requests_mock.Mocker()
+class DRACClientIdentifyTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(DRACClientIdentifyTestCase, self).setUp()
+        self.drac_client = dracclient.client.DRACClient(
+            **test_utils.FAKE_ENDPOINT)
+
+    def test_identify(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=test_utils.WSManIdentify['ok'])
+
+        identity = self.drac_client.identify()
+
+        self.assertEqual(
+            dracclient.client.WSManIdentity(
+                protocol_version=(
+                    'http://schemas.dmtf.org/wbem/wsman/1/wsman.xsd'),
+                product_vendor='Fake Dell Open Manage Server Node',
+                product_version='1.0'),
+            identity)
+
+    def test_is_alive(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=test_utils.WSManIdentify['ok'])
+
+        self.assertTrue(self.drac_client.is_alive())
+
+    def test_is_alive_with_connection_error(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           exc=requests.exceptions.ConnectionError)
+
+        self.assertFalse(self.drac_client.is_alive())
+        self.assertEqual(1, mock_requests.call_count)
+
+    def test_is_alive_with_server_error(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', status_code=500)
+
+        self.assertFalse(self.drac_client.is_alive())
+        self.assertEqual(1, mock_requests.call_count)
+
+    def test_is_alive_with_invalid_response(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', text='<result>')
+
+        self.assertFalse(self.drac_client.is_alive())
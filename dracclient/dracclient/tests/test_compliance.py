@@ -0,0 +1,130 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+import mock
+
+from dracclient import compliance
+from dracclient import exceptions
+from dracclient.resources import bios
+from dracclient.tests import base
+
+
+def _enum(name, current_value, pending_value=None, read_only=False):
+    return bios.BIOSEnumerableAttribute(
+        name, 'BIOS.Setup.1-1:%s' % name, current_value, pending_value,
+        read_only, ['Enabled', 'Disabled', 'Bios', 'Uefi'])
+
+
+def _integer(name, current_value, pending_value=None, read_only=False):
+    return bios.BIOSIntegerAttribute(
+        name, 'BIOS.Setup.1-1:%s' % name, current_value, pending_value,
+        read_only, 0, 65535)
+
+
+def _settings(*attributes):
+    return dict((attribute.name, attribute) for attribute in attributes)
+
+
+@unittest.skipIf(compliance.numpy is None, 'numpy is not installed')
+class BIOSComplianceTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(BIOSComplianceTestCase, self).setUp()
+        self.checker = compliance.BIOSComplianceChecker(
+            {'BootMode': 'Uefi', 'ProcVirtualization': 'Enabled',
+             'SerialComm': 'Disabled', 'AcPwrRcvryUserDelay': '60'})
+
+    def test_compliant_node(self):
+        report = self.checker.check({'node-1': _settings(
+            _enum('BootMode', 'Uefi'),
+            _enum('ProcVirtualization', 'Enabled'),
+            _enum('SerialComm', 'Disabled'),
+            _integer('AcPwrRcvryUserDelay', 60),
+            _enum('MemTest', 'Disabled'))})
+
+        self.assertEqual([True], list(report.compliant()))
+        self.assertEqual([], report.noncompliant_hosts())
+        self.assertEqual({}, report.change_sets())
+        self.assertEqual(
+            [compliance.NodeCompliance('node-1', [], [], [], [], {})],
+            list(report.nodes()))
+
+    def test_drift(self):
+        report = self.checker.check([
+            ('node-1', _settings(_enum('BootMode', 'Bios'),
+                                 _enum('ProcVirtualization', 'Enabled'),
+                                 _enum('SerialComm', 'Disabled'),
+                                 _integer('AcPwrRcvryUserDelay', 120))),
+            ('node-2', _settings(_enum('BootMode', 'Uefi'),
+                                 _enum('ProcVirtualization', 'Enabled'),
+                                 _enum('SerialComm', 'Disabled'),
+                                 _integer('AcPwrRcvryUserDelay', 60)))])
+
+        self.assertEqual([False, True], list(report.compliant()))
+        self.assertEqual(['node-1'], report.noncompliant_hosts())
+        self.assertEqual(
+            {'node-1': {'BootMode': 'Uefi', 'AcPwrRcvryUserDelay': '60'}},
+            report.change_sets())
+
+    def test_pending_values(self):
+        report = self.checker.check({'node-1': _settings(
+            _enum('BootMode', 'Bios', pending_value='Uefi'),
+            _enum('ProcVirtualization', 'Disabled', pending_value='Disabled'),
+            _enum('SerialComm', 'Disabled', pending_value='Enabled'),
+            _integer('AcPwrRcvryUserDelay', 60))})
+
+        node = next(report.nodes())
+        self.assertEqual(['BootMode', 'ProcVirtualization'], node.drift)
+        self.assertEqual(['ProcVirtualization', 'SerialComm'],
+                         node.pending_drift)
+        # BootMode is already pending the expected value
+        self.assertEqual({'ProcVirtualization': 'Enabled',
+                          'SerialComm': 'Disabled'}, node.changes)
+
+    def test_read_only_conflicts(self):
+        report = self.checker.check({'node-1': _settings(
+            _enum('BootMode', 'Bios', read_only=True),
+            _enum('ProcVirtualization', 'Enabled', read_only=True),
+            _enum('SerialComm', 'Disabled'),
+            _integer('AcPwrRcvryUserDelay', 60))})
+
+        node = next(report.nodes())
+        self.assertEqual(['BootMode'], node.read_only_conflicts)
+        self.assertEqual({}, node.changes)
+
+    def test_missing_attributes(self):
+        report = self.checker.check({'node-1': _settings(
+            _enum('BootMode', 'Uefi'),
+            _enum('ProcVirtualization', 'Enabled'))})
+
+        node = next(report.nodes())
+        self.assertEqual(['AcPwrRcvryUserDelay', 'SerialComm'], node.missing)
+        self.assertEqual({}, node.changes)
+        self.assertEqual([False], list(report.compliant()))
+
+    def test_no_nodes(self):
+        report = self.checker.check({})
+
+        self.assertEqual([], report.noncompliant_hosts())
+        self.assertEqual({}, report.change_sets())
+        self.assertEqual([], list(report.nodes()))
+
+
+class MissingNumpyTestCase(base.BaseTest):
+
+    @mock.patch.object(compliance, 'numpy', None)
+    def test_checker(self):
+        self.assertRaises(exceptions.DRACMissingDependency,
+                          compliance.BIOSComplianceChecker, {})
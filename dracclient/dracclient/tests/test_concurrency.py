@@ -0,0 +1,242 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import re
+import threading
+import time
+
+try:
+    from http import server as http_server
+    import socketserver
+except ImportError:
+    import BaseHTTPServer as http_server
+    import SocketServer as socketserver
+
+import dracclient.client
+from dracclient import pool
+from dracclient.resources import uris
+from dracclient.tests import base
+from dracclient.tests import utils as test_utils
+
+_ACTION_RE = re.compile(r'<wsa:Action[^>]*>([^<]*)</wsa:Action>')
+_RESOURCE_URI_RE = re.compile(
+    r'<wsman:ResourceURI[^>]*>([^<]*)</wsman:ResourceURI>')
+
+# Time spent by the fake server on every request, so that requests overlap
+_LATENCY_SEC = 0.01
+
+
+class _FakeWSManServer(socketserver.ThreadingMixIn, http_server.HTTPServer):
+    """WS-Man server answering with canned responses
+
+    It records the highest number of reads, i.e. enumerations and readiness
+    checks, and of writes it was handling at the same time, as well as the
+    number of connections accepted.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, responses):
+        http_server.HTTPServer.__init__(self, ('127.0.0.1', 0),
+                                        _FakeWSManHandler)
+        self.responses = responses
+        self.lock = threading.Lock()
+        self.in_flight = {'read': 0, 'write': 0}
+        self.max_in_flight = {'read': 0, 'write': 0}
+        self.connections = 0
+
+    def get_request(self):
+        request = http_server.HTTPServer.get_request(self)
+        with self.lock:
+            self.connections += 1
+        return request
+
+    def enter(self, kind):
+        with self.lock:
+            self.in_flight[kind] += 1
+            self.max_in_flight[kind] = max(self.max_in_flight[kind],
+                                           self.in_flight[kind])
+
+    def leave(self, kind):
+        with self.lock:
+            self.in_flight[kind] -= 1
+
+
+class _FakeWSManHandler(http_server.BaseHTTPRequestHandler):
+
+    # Keep connections open between requests
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        body = self.rfile.read(length).decode('utf-8')
+        action = _ACTION_RE.search(body).group(1).rsplit('/', 1)[-1]
+        resource_uri = _RESOURCE_URI_RE.search(body).group(1)
+
+        # Readiness checks are invocations too, but read-only ones
+        kind = 'read'
+        if action not in ('Enumerate', 'GetRemoteServicesAPIStatus'):
+            kind = 'write'
+
+        self.server.enter(kind)
+        try:
+            time.sleep(_LATENCY_SEC)
+            content = self.server.responses[(resource_uri, action)]
+        finally:
+            self.server.leave(kind)
+
+        content = content.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/soap+xml')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadSafeClientTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ThreadSafeClientTestCase, self).setUp()
+        responses = {
+            (uris.DCIM_LCService, 'GetRemoteServicesAPIStatus'):
+                test_utils.LifecycleControllerInvocations[
+                    uris.DCIM_LCService]['GetRemoteServicesAPIStatus'][
+                        'is_ready'],
+            (uris.DCIM_LifecycleJob, 'Enumerate'):
+                test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['ok'],
+            (uris.DCIM_BIOSService, 'SetAttributes'):
+                test_utils.BIOSInvocations[uris.DCIM_BIOSService][
+                    'SetAttributes']['ok'],
+            (uris.DCIM_BIOSService, 'CreateTargetedConfigJob'):
+                test_utils.JobInvocations[uris.DCIM_BIOSService][
+                    'CreateTargetedConfigJob']['ok'],
+        }
+        for resource_uri in (uris.DCIM_BIOSEnumeration,
+                             uris.DCIM_BIOSString, uris.DCIM_BIOSInteger):
+            responses[(resource_uri, 'Enumerate')] = (
+                test_utils.BIOSEnumerations[resource_uri]['ok'])
+
+        self.server = _FakeWSManServer(responses)
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.addCleanup(self._stop_server)
+
+        self.drac_client = dracclient.client.DRACClient(
+            '127.0.0.1', 'username', 'password',
+            port=self.server.server_address[1], protocol='http',
+            thread_safe=True)
+
+    def _stop_server(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+
+    def _run_threads(self, target, num_threads=8, iterations=5):
+        errors = []
+
+        def run(index):
+            try:
+                for iteration in range(iterations):
+                    target(index, iteration)
+            except Exception as ex:
+                errors.append(ex)
+
+        threads = [threading.Thread(target=run, args=(index,))
+                   for index in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+
+    def test_concurrent_reads_and_changes(self):
+        results = []
+
+        def work(index, iteration):
+            if index % 2:
+                result = self.drac_client.set_bios_settings(
+                    {'ProcVirtualization': 'Disabled'})
+                self.assertTrue(result['is_commit_required'])
+                self.drac_client.commit_pending_bios_changes()
+            else:
+                results.append(len(self.drac_client.list_jobs()))
+                results.append(len(self.drac_client.list_bios_settings()))
+
+        self._run_threads(work)
+
+        self.assertEqual(1, self.server.max_in_flight['write'])
+        self.assertGreater(self.server.max_in_flight['read'], 1)
+        self.assertEqual(40, len(results))
+        self.assertEqual(2, len(set(results)))
+
+    def test_concurrent_readiness_checks(self):
+        def work(index, iteration):
+            self.drac_client.wait_until_idrac_is_ready()
+
+        self._run_threads(work, iterations=3)
+
+        # Concurrent checks share a single request
+        self.assertEqual(1, self.server.max_in_flight['read'])
+        self.assertEqual(0, self.server.max_in_flight['write'])
+
+    def test_concurrent_changes_from_clients_of_same_node(self):
+        other_client = dracclient.client.DRACClient(
+            '127.0.0.1', 'username', 'password',
+            port=self.server.server_address[1], protocol='http',
+            thread_safe=True)
+        clients = [self.drac_client, other_client]
+
+        def work(index, iteration):
+            result = clients[index % 2].set_bios_settings(
+                {'ProcVirtualization': 'Disabled'})
+            self.assertTrue(result['is_commit_required'])
+
+        self._run_threads(work)
+
+        self.assertEqual(1, self.server.max_in_flight['write'])
+        self.assertIs(self.drac_client.client._invoke_gate,
+                      other_client.client._invoke_gate)
+
+    def test_clients_of_other_nodes_do_not_share_gate(self):
+        other_client = dracclient.client.DRACClient(
+            '127.0.0.2', 'username', 'password',
+            port=self.server.server_address[1], protocol='http',
+            thread_safe=True)
+
+        self.assertIsNot(self.drac_client.client._invoke_gate,
+                         other_client.client._invoke_gate)
+
+    def test_pooled_clients_reuse_connections(self):
+        client_pool = pool.DRACClientPool(max_open=1, max_connections=2)
+        self.addCleanup(client_pool.close)
+        clients = set()
+
+        def work(index, iteration):
+            with client_pool.client(
+                    '127.0.0.1', 'username', 'password',
+                    port=self.server.server_address[1],
+                    protocol='http') as client:
+                clients.add(client)
+                client.list_jobs()
+
+        self._run_threads(work)
+
+        self.assertEqual(1, len(clients))
+        self.assertLessEqual(self.server.max_in_flight['read'], 2)
+        self.assertLessEqual(self.server.connections, 2)
@@ -0,0 +1,64 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from dracclient import deadline
+from dracclient import exceptions
+from dracclient import retry
+from dracclient.tests import base
+
+
+@mock.patch('time.time', autospec=True)
+class DeadlineTestCase(base.BaseTest):
+
+    def test_no_deadline(self, mock_time):
+        self.assertIsNone(deadline.current())
+        self.assertIsNone(deadline.remaining())
+        self.assertEqual((10, 300), deadline.clamp_timeout((10, 300)))
+        deadline.check()
+
+    def test_nested_deadlines(self, mock_time):
+        mock_time.return_value = 100
+        with deadline.Deadline(30) as outer:
+            with deadline.Deadline(60):
+                self.assertIs(outer, deadline.current())
+                self.assertEqual(30, deadline.remaining())
+            with deadline.Deadline(5) as inner:
+                self.assertIs(inner, deadline.current())
+
+        self.assertIsNone(deadline.current())
+
+    def test_clamp_timeout(self, mock_time):
+        mock_time.return_value = 100
+        with deadline.Deadline(20):
+            self.assertEqual((10, 20), deadline.clamp_timeout((10, 300)))
+            self.assertEqual((20, 20), deadline.clamp_timeout((None, None)))
+            self.assertEqual(15, deadline.clamp_timeout(15))
+            self.assertEqual(20, deadline.clamp_timeout(None))
+
+    def test_check(self, mock_time):
+        mock_time.return_value = 100
+        with deadline.Deadline(20):
+            deadline.check()
+            mock_time.return_value = 120
+            self.assertRaises(exceptions.DRACDeadlineExceeded, deadline.check)
+
+    def test_retry_stops_at_deadline(self, mock_time):
+        mock_time.return_value = 100
+        state = retry.FixedDelay(10, 8).begin()
+        with deadline.Deadline(20):
+            self.assertEqual(8, state.next_delay())
+            mock_time.return_value = 113
+            self.assertRaises(exceptions.DRACDeadlineExceeded,
+                              state.next_delay)
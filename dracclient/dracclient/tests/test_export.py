@@ -0,0 +1,146 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+
+import mock
+
+import dracclient.client
+from dracclient import exceptions
+from dracclient import export
+from dracclient.resources import inventory
+from dracclient.resources import raid
+from dracclient.tests import base
+
+
+def _fake_client(host, fail=False):
+    drac_client = mock.Mock(spec=dracclient.client.DRACClient)
+    drac_client.client = mock.Mock(host=host)
+    drac_client.list_cpus.return_value = [
+        inventory.CPU(id='CPU.Socket.%d' % i, cores=8, speed_mhz=2400,
+                      model='Xeon', status='ok', ht_enabled=True,
+                      turbo_enabled=True, vt_enabled=True, arch64=True)
+        for i in (1, 2)]
+    drac_client.list_virtual_disks.return_value = [
+        raid.VirtualDisk(id='Disk.Virtual.0:RAID.Integrated.1-1',
+                         name='disk 0', description='Virtual Disk 0',
+                         controller='RAID.Integrated.1-1', raid_level='1',
+                         size_mb=571776, status='ok', raid_status='online',
+                         span_depth=1, span_length=2, pending_operations=None,
+                         physical_disks=['Disk.Bay.0', 'Disk.Bay.1'])]
+    if fail:
+        drac_client.list_cpus.side_effect = exceptions.WSManRequestFailure()
+    return drac_client
+
+
+class IterInventoryTestCase(base.BaseTest):
+
+    def test_iter_inventory(self):
+        clients = [_fake_client('1.2.3.4'), _fake_client('5.6.7.8')]
+
+        items = list(export.iter_inventory(
+            clients, kinds=['cpus', 'virtual_disks']))
+
+        self.assertEqual(6, len(items))
+        self.assertEqual(('1.2.3.4', 'cpus'), items[0][:2])
+        self.assertEqual('CPU.Socket.1', items[0][2].id)
+        self.assertEqual(('5.6.7.8', 'virtual_disks'), items[-1][:2])
+
+    def test_iter_inventory_concurrently(self):
+        clients = (_fake_client('10.0.0.%d' % i) for i in range(20))
+
+        items = list(export.iter_inventory(clients, kinds=['cpus'],
+                                           workers=4))
+
+        self.assertEqual(40, len(items))
+        self.assertEqual(20, len(set(host for (host, _, _) in items)))
+
+    def test_iter_inventory_with_error(self):
+        on_error = mock.Mock()
+        clients = [_fake_client('1.2.3.4', fail=True)]
+
+        items = list(export.iter_inventory(
+            clients, kinds=['cpus', 'virtual_disks'], on_error=on_error))
+
+        self.assertEqual(1, len(items))
+        on_error.assert_called_once_with('1.2.3.4', 'cpus', mock.ANY)
+
+    def test_iter_inventory_concurrently_with_failing_clients(self):
+        def clients():
+            yield _fake_client('1.2.3.4')
+            raise exceptions.WSManRequestFailure()
+
+        self.assertRaises(exceptions.WSManRequestFailure, list,
+                          export.iter_inventory(clients(), kinds=['cpus'],
+                                                workers=2))
+
+    def test_iter_inventory_with_unknown_kind(self):
+        self.assertRaises(ValueError, list,
+                          export.iter_inventory([], kinds=['gpus']))
+
+
+class InventoryExporterTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(InventoryExporterTestCase, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.prefix = os.path.join(self.tmpdir, 'inventory')
+
+    def test_export_ndjson_with_rotation(self):
+        writer = export.NDJSONWriter(self.prefix, max_records=4)
+        exporter = export.InventoryExporter([writer],
+                                            kinds=['cpus', 'virtual_disks'])
+
+        counts = exporter.export([_fake_client('1.2.3.4'),
+                                  _fake_client('5.6.7.8')])
+
+        self.assertEqual({'cpus': 4, 'virtual_disks': 2}, counts)
+        self.assertEqual([self.prefix + '-00000.ndjson',
+                          self.prefix + '-00001.ndjson'], writer.paths)
+        with io.open(writer.paths[1], encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(2, len(records))
+        self.assertEqual('5.6.7.8', records[1]['host'])
+        self.assertEqual('virtual_disks', records[1]['kind'])
+        self.assertEqual(['Disk.Bay.0', 'Disk.Bay.1'],
+                         records[1]['physical_disks'])
+
+    def test_export_csv_compressed(self):
+        writer = export.CSVWriter(self.prefix, compress=True)
+        exporter = export.InventoryExporter([writer],
+                                            kinds=['cpus', 'virtual_disks'])
+
+        exporter.export([_fake_client('1.2.3.4')])
+
+        self.assertEqual([self.prefix + '-cpus-00000.csv.gz',
+                          self.prefix + '-virtual_disks-00000.csv.gz'],
+                         writer.paths)
+        with gzip.open(writer.paths[1], 'rt') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual('host', rows[0][0])
+        self.assertEqual('Disk.Bay.0;Disk.Bay.1', rows[1][-1])
+
+    @mock.patch.object(export, '_PY2', True)
+    def test_csv_format_on_python2(self):
+        self.assertEqual(b'Disk.Bay.0;Disk.Bay.1',
+                         export.CSVWriter._format([u'Disk.Bay.0',
+                                                   u'Disk.Bay.1']))
+        self.assertEqual(b'caf\xc3\xa9', export.CSVWriter._format(u'caf\xe9'))
+        self.assertEqual(8, export.CSVWriter._format(8))
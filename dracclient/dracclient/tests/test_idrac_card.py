@@ -183,6 +183,40 @@ class ClientiDRACCardConfigurationTestCase(base.BaseTest):
         self.assertEqual(expected_enum_attr, idrac_settings[
                          'Info.1#Type'])
 
+    def test_list_idrac_settings_lazy(
+            self, mock_requests, mock_wait_until_idrac_is_ready):
+        expected_integer_attr = idrac_card.iDRACCardIntegerAttribute(
+            name='Port',
+            instance_id='iDRAC.Embedded.1#SSH.1#Port',
+            read_only=False,
+            current_value=22,
+            pending_value=None,
+            fqdd='iDRAC.Embedded.1',
+            group_id='SSH.1',
+            lower_bound=1,
+            upper_bound=65535)
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'text': test_utils.iDracCardEnumerations[
+                uris.DCIM_iDRACCardEnumeration]['ok']},
+            {'text': test_utils.iDracCardEnumerations[
+                uris.DCIM_iDRACCardString]['ok']},
+            {'text': test_utils.iDracCardEnumerations[
+                uris.DCIM_iDRACCardInteger]['ok']}])
+
+        with mock.patch.object(idrac_card.iDRACCardIntegerAttribute, 'parse',
+                               autospec=True) as mock_parse:
+            idrac_settings = self.drac_client.list_idrac_settings(
+                by_name=True, lazy=True)
+            port = idrac_settings['SSH.1#Port']
+            self.assertEqual('iDRAC.Embedded.1', port.fqdd)
+            self.assertFalse(mock_parse.called)
+
+        self.assertEqual(630, len(idrac_settings))
+        self.assertIsInstance(port, idrac_card.iDRACCardIntegerAttribute)
+        self.assertEqual(65535, port.upper_bound)
+        self.assertEqual(expected_integer_attr, port)
+        self.assertIsNone(port.validate(2222))
+
     @mock.patch.object(dracclient.client.WSManClient, 'invoke',
                        spec_set=True, autospec=True)
     def test_set_idrac_settings(
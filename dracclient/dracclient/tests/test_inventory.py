@@ -14,6 +14,7 @@
 import mock
 import requests_mock
 
+from dracclient import cache
 import dracclient.client
 from dracclient.resources import inventory
 import dracclient.resources.job
@@ -52,6 +53,29 @@ class ClientInventoryManagementTestCase(base.BaseTest):
             expected_cpu,
             self.drac_client.list_cpus())
 
+    def test_list_cpus_with_parse_cache(self, mock_requests,
+                                        mock_wait_until_idrac_is_ready):
+        drac_client = dracclient.client.DRACClient(
+            parse_cache=cache.ParseCache(), **test_utils.FAKE_ENDPOINT)
+        cpu_view = test_utils.InventoryEnumerations[uris.DCIM_CPUView]
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': cpu_view['ok']},
+             {'text': cpu_view['ok'].replace('uuid:247e710c',
+                                             'uuid:347e710c')},
+             {'text': cpu_view['missing_flags']}])
+
+        first = drac_client.list_cpus()
+        second = drac_client.list_cpus()
+        third = drac_client.list_cpus()
+
+        self.assertTrue(first.changed)
+        self.assertFalse(second.changed)
+        self.assertIs(first[0], second[0])
+        self.assertTrue(third.changed)
+        self.assertEqual(1900, third[0].speed_mhz)
+        self.assertEqual(3, mock_requests.call_count)
+
     def test_list_cpus_with_missing_flags(self, mock_requests,
                                           mock_wait_until_idrac_is_ready):
         expected_cpu = [inventory.CPU(
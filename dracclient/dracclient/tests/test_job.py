@@ -63,43 +63,39 @@ class ClientJobManagementTestCase(base.BaseTest):
             mock.ANY, uris.DCIM_LifecycleJob,
             filter_query=expected_filter_query)
 
-    @mock.patch.object(dracclient.client.WSManClient, 'enumerate',
+    @mock.patch.object(dracclient.client.WSManClient, 'get',
                        spec_set=True, autospec=True)
-    def test_get_job(self, mock_enumerate):
-        expected_filter_query = ('select * from DCIM_LifecycleJob'
-                                 ' where InstanceID="42"')
-        # NOTE: This is the first job in the xml. Filtering the job is the
-        #       responsibility of the controller, so not testing it.
-        expected_job = dracclient.resources.job.Job(id='JID_CLEARALL',
-                                                    name='CLEARALL',
-                                                    start_time='TIME_NA',
-                                                    until_time='TIME_NA',
-                                                    message='NA',
-                                                    status='Pending',
-                                                    percent_complete='0')
-        mock_enumerate.return_value = lxml.etree.fromstring(
-            test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['ok'])
-
-        job = self.drac_client.get_job(42)
-
-        mock_enumerate.assert_called_once_with(
+    def test_get_job(self, mock_get):
+        expected_job = dracclient.resources.job.Job(
+            id='JID_001436912645',
+            name='ConfigBIOS:BIOS.Setup.1-1',
+            start_time='00000101000000',
+            until_time='TIME_NA',
+            message='Job completed successfully',
+            status='Completed',
+            percent_complete='100')
+        mock_get.return_value = lxml.etree.fromstring(
+            test_utils.JobGets[uris.DCIM_LifecycleJob]['ok'])
+
+        job = self.drac_client.get_job('JID_001436912645')
+
+        mock_get.assert_called_once_with(
             mock.ANY, uris.DCIM_LifecycleJob,
-            filter_query=expected_filter_query)
+            {'InstanceID': 'JID_001436912645'})
         self.assertEqual(expected_job, job)
 
-    @mock.patch.object(dracclient.client.WSManClient, 'enumerate',
-                       spec_set=True, autospec=True)
-    def test_get_job_not_found(self, mock_enumerate):
-        expected_filter_query = ('select * from DCIM_LifecycleJob'
-                                 ' where InstanceID="42"')
-        mock_enumerate.return_value = lxml.etree.fromstring(
-            test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['not_found'])
+    @requests_mock.Mocker()
+    @mock.patch.object(dracclient.client.WSManClient,
+                       'wait_until_idrac_is_ready', spec_set=True,
+                       autospec=True)
+    def test_get_job_not_found(self, mock_requests,
+                               mock_wait_until_idrac_is_ready):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman', status_code=400,
+            text=test_utils.JobGets[uris.DCIM_LifecycleJob]['not_found'])
 
         job = self.drac_client.get_job(42)
 
-        mock_enumerate.assert_called_once_with(
-            mock.ANY, uris.DCIM_LifecycleJob,
-            filter_query=expected_filter_query)
         self.assertIsNone(job)
 
     @mock.patch.object(dracclient.client.WSManClient, 'invoke',
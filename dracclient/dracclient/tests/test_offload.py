@@ -0,0 +1,169 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+
+import mock
+import requests_mock
+
+import dracclient.client
+from dracclient import exceptions
+from dracclient import offload
+from dracclient.resources import bios
+from dracclient.resources import uris
+from dracclient.tests import base
+from dracclient.tests import utils as test_utils
+from dracclient import utils
+from dracclient import wsman
+
+
+def _parse_missing_field(doc):
+    return utils.get_wsman_resource_attr(doc, uris.DCIM_BIOSEnumeration,
+                                         'Foo')
+
+
+def _parse_items(doc):
+    return [bios.BootMode(id=item[0].text, name=None, is_current=False,
+                          is_next=False)
+            for item in doc.find('.//{%s}Items' % wsman.NS_WSMAN)]
+
+
+class ParsePoolTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ParsePoolTestCase, self).setUp()
+        self.pool = offload.ParsePool(processes=1, min_bytes=0)
+        self.addCleanup(self.pool.close)
+        self.contents = [test_utils.BIOSEnumerations[
+            uris.DCIM_BIOSEnumeration]['ok'].encode('utf-8')]
+        self.doc = wsman.parse_enumeration(self.contents)
+        self.parse = functools.partial(
+            utils._parse_config, attr_cls=bios.BIOSEnumerableAttribute,
+            by_name=True, fqdd_filter=None, name_formatter=None)
+
+    def test_parse(self):
+        with mock.patch.object(wsman, 'parse_enumeration',
+                               autospec=True) as mock_parse_enumeration:
+            result = self.pool.parse(self.parse, self.contents)
+
+        # Only the worker process parses the responses
+        self.assertFalse(mock_parse_enumeration.called)
+
+        self.assertEqual(self.parse(self.doc), result)
+        self.assertIs(bios.BIOSEnumerableAttribute, type(result['MemTest']))
+        self.assertEqual(1, self.pool.offloaded)
+        self.assertEqual(0, self.pool.fallbacks)
+
+    def test_parse_interns_strings(self):
+        first = self.pool.parse(self.parse, self.contents)
+        second = self.pool.parse(self.parse, self.contents)
+
+        self.assertEqual(2, self.pool.offloaded)
+        self.assertIs(next(key for key in first if key == 'MemTest'),
+                      next(key for key in second if key == 'MemTest'))
+        self.assertIs(first['MemTest'].possible_values[0],
+                      second['MemTest'].possible_values[0])
+
+    def test_parse_pulled_items(self):
+        contents = [test_utils.WSManEnumerations['context'][index].encode(
+            'utf-8') for index in range(4)]
+
+        result = self.pool.parse(_parse_items, contents)
+
+        self.assertEqual(['1', '2', '3', '4', '5'],
+                         [boot_mode.id for boot_mode in result])
+        self.assertEqual(1, self.pool.offloaded)
+
+    def test_parse_small_response(self):
+        self.pool.min_bytes = len(self.contents[0]) + 1
+
+        with mock.patch.object(self.pool, '_pool',
+                               autospec=True) as mock_pool:
+            result = self.pool.parse(self.parse, self.contents)
+
+        self.assertEqual(self.parse(self.doc), result)
+        self.assertFalse(mock_pool.apply_async.called)
+        self.assertEqual(0, self.pool.offloaded)
+
+    def test_parse_unpicklable_callable(self):
+        result = self.pool.parse(lambda doc: self.parse(doc), self.contents)
+
+        self.assertEqual(self.parse(self.doc), result)
+        self.assertEqual(1, self.pool.fallbacks)
+
+    def test_parse_error(self):
+        # Raised by the worker process
+        self.assertRaises(exceptions.DRACMissingResponseField,
+                          self.pool.parse, _parse_missing_field, self.contents)
+        self.assertEqual(0, self.pool.offloaded)
+        self.assertEqual(0, self.pool.fallbacks)
+
+    def test_parse_timeout(self):
+        self.pool.timeout = 1
+        with mock.patch.object(self.pool, '_pool',
+                               autospec=True) as mock_pool:
+            mock_pool.apply_async.return_value.get.side_effect = (
+                offload.multiprocessing.TimeoutError)
+
+            result = self.pool.parse(self.parse, self.contents)
+
+        mock_pool.apply_async.assert_called_once_with(
+            offload._parse_in_worker, (self.parse, self.contents, None))
+        mock_pool.apply_async.return_value.get.assert_called_once_with(1)
+        self.assertEqual(self.parse(self.doc), result)
+        self.assertEqual(1, self.pool.fallbacks)
+
+
+@requests_mock.Mocker()
+@mock.patch.object(dracclient.client.WSManClient, 'wait_until_idrac_is_ready',
+                   spec_set=True, autospec=True)
+class ClientParsePoolTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ClientParsePoolTestCase, self).setUp()
+        self.pool = offload.ParsePool(processes=1, min_bytes=0)
+        self.addCleanup(self.pool.close)
+        self.drac_client = dracclient.client.DRACClient(
+            parse_pool=self.pool, **test_utils.FAKE_ENDPOINT)
+
+    def test_list_bios_settings(self, mock_requests,
+                                mock_wait_until_idrac_is_ready):
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSEnumeration]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSString]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSInteger]['ok']}])
+
+        bios_settings = self.drac_client.list_bios_settings()
+
+        self.assertEqual(103, len(bios_settings))
+        self.assertTrue(bios_settings.changed)
+        self.assertEqual(8, bios_settings['Proc1NumCores'].current_value)
+        self.assertEqual(3, self.pool.offloaded)
+
+    def test_lazy_settings_not_offloaded(self, mock_requests,
+                                         mock_wait_until_idrac_is_ready):
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSEnumeration]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSString]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSInteger]['ok']}])
+
+        bios_settings = self.drac_client.list_bios_settings(lazy=True)
+
+        self.assertEqual(103, len(bios_settings))
+        self.assertEqual(0, self.pool.offloaded)
@@ -0,0 +1,231 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+import mock
+import requests
+import requests_mock
+
+from dracclient import deadline
+from dracclient import exceptions
+from dracclient import pool
+from dracclient.tests import base
+from dracclient.tests import utils as test_utils
+
+
+@mock.patch.object(requests.Session, 'close', autospec=True)
+class DRACClientPoolTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(DRACClientPoolTestCase, self).setUp()
+        self.pool = pool.DRACClientPool(max_open=2, max_idle=1,
+                                        idle_timeout=60)
+
+    def test_checkout(self, mock_close):
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+
+        self.assertEqual('1.2.3.4', client.client.host)
+        self.assertIsNotNone(client.client.session)
+        self.assertIsNotNone(client.client._invoke_gate)
+        self.assertEqual(1, self.pool.open_count)
+        self.assertEqual(0, self.pool.idle_count)
+
+    def test_checkout_shares_client(self, mock_close):
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        other_client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        self.pool.checkin(client)
+
+        self.assertIs(client, other_client)
+        self.assertEqual(0, self.pool.idle_count)
+
+        self.pool.checkin(other_client)
+
+        self.assertEqual(1, self.pool.idle_count)
+
+    def test_checkout_reuses_idle_client(self, mock_close):
+        with self.pool.client('1.2.3.4', 'username', 'password') as client:
+            pass
+        self.assertEqual(1, self.pool.idle_count)
+
+        with self.pool.client('1.2.3.4', 'username',
+                              'password') as other_client:
+            self.assertEqual(0, self.pool.idle_count)
+
+        self.assertIs(client, other_client)
+        self.assertFalse(mock_close.called)
+
+    def test_checkout_with_other_key(self, mock_close):
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        other_client = self.pool.checkout('1.2.3.4', 'root', 'password')
+
+        self.assertIsNot(client, other_client)
+        self.assertEqual(2, self.pool.open_count)
+
+    def test_checkout_with_other_password(self, mock_close):
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        self.pool.checkin(client)
+
+        other_client = self.pool.checkout('1.2.3.4', 'username', 'secret')
+
+        self.assertIsNot(client, other_client)
+        self.assertEqual('secret', other_client.client.password)
+        self.assertEqual(1, mock_close.call_count)
+        self.assertEqual(1, self.pool.open_count)
+
+    def test_checkout_with_other_password_while_checked_out(self,
+                                                            mock_close):
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        other_client = self.pool.checkout('1.2.3.4', 'username', 'secret')
+
+        self.assertIsNot(client, other_client)
+        self.assertFalse(mock_close.called)
+
+        self.pool.checkin(client)
+
+        self.assertEqual(1, mock_close.call_count)
+        self.assertEqual(1, self.pool.open_count)
+        self.assertEqual(0, self.pool.idle_count)
+
+    def test_checkin_evicts_least_recently_used(self, mock_close):
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        other_client = self.pool.checkout('5.6.7.8', 'username', 'password')
+        self.pool.checkin(client)
+        self.pool.checkin(other_client)
+
+        self.assertEqual(1, self.pool.idle_count)
+        self.assertEqual(1, self.pool.open_count)
+        mock_close.assert_called_once_with(client.client.session)
+
+    def test_checkout_evicts_idle_client_when_full(self, mock_close):
+        self.pool.max_idle = 2
+        clients = [self.pool.checkout(host, 'username', 'password')
+                   for host in ('1.2.3.4', '5.6.7.8')]
+        for client in clients:
+            self.pool.checkin(client)
+
+        self.pool.checkout('9.10.11.12', 'username', 'password')
+
+        self.assertEqual(2, self.pool.open_count)
+        mock_close.assert_called_once_with(clients[0].client.session)
+
+    def test_checkout_blocks_when_full(self, mock_close):
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        self.pool.checkout('5.6.7.8', 'username', 'password')
+        checked_out = threading.Event()
+
+        def checkout():
+            self.pool.checkout('9.10.11.12', 'username', 'password')
+            checked_out.set()
+
+        thread = threading.Thread(target=checkout)
+        thread.start()
+        self.assertFalse(checked_out.wait(0.05))
+
+        self.pool.checkin(client)
+
+        self.assertTrue(checked_out.wait(1))
+        thread.join()
+        self.assertEqual(2, self.pool.open_count)
+
+    def test_checkout_with_deadline_when_full(self, mock_close):
+        self.pool.checkout('1.2.3.4', 'username', 'password')
+        self.pool.checkout('5.6.7.8', 'username', 'password')
+
+        with deadline.Deadline(0.05):
+            self.assertRaises(exceptions.DRACDeadlineExceeded,
+                              self.pool.checkout, '9.10.11.12', 'username',
+                              'password')
+
+    @mock.patch.object(time, 'time', autospec=True)
+    def test_reap(self, mock_time, mock_close):
+        mock_time.return_value = 1000
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        self.pool.checkin(client)
+
+        mock_time.return_value = 1059
+        self.pool.reap()
+        self.assertEqual(1, self.pool.idle_count)
+
+        mock_time.return_value = 1060
+        self.pool.reap()
+        self.assertEqual(0, self.pool.idle_count)
+        self.assertEqual(0, self.pool.open_count)
+        mock_close.assert_called_once_with(client.client.session)
+
+    @mock.patch.object(time, 'time', autospec=True)
+    def test_checkout_reaps_idle_clients(self, mock_time, mock_close):
+        mock_time.return_value = 1000
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        self.pool.checkin(client)
+
+        mock_time.return_value = 1100
+        other_client = self.pool.checkout('1.2.3.4', 'username', 'password')
+
+        self.assertIsNot(client, other_client)
+        mock_close.assert_called_once_with(client.client.session)
+
+    def test_close(self, mock_close):
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        other_client = self.pool.checkout('5.6.7.8', 'username', 'password')
+        self.pool.checkin(other_client)
+
+        self.pool.close()
+
+        self.assertEqual(2, mock_close.call_count)
+        self.assertEqual(0, self.pool.open_count)
+        # Checking in after closing is harmless
+        self.pool.checkin(client)
+
+    def test_client_kwargs(self, mock_close):
+        rate_limiter = mock.Mock()
+        client_pool = pool.DRACClientPool(rate_limiter=rate_limiter,
+                                          thread_safe=False)
+
+        client = client_pool.checkout('1.2.3.4', 'username', 'password')
+
+        self.assertIs(rate_limiter, client.client.rate_limiter)
+        self.assertIsNone(client.client._invoke_gate)
+
+    @requests_mock.Mocker()
+    def test_requests_use_session(self, mock_close, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=test_utils.WSManIdentify['ok'])
+
+        with self.pool.client(**test_utils.FAKE_ENDPOINT) as client:
+            with mock.patch.object(client.client.session, 'post',
+                                   wraps=client.client.session.post) as post:
+                self.assertTrue(client.is_alive())
+
+        self.assertEqual(1, post.call_count)
+
+    def test_session_keeps_no_cookies(self, mock_close):
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+        session = client.client.session
+        request = requests.Request('POST', client.client.endpoint).prepare()
+
+        # As done by the session with the cookies of every response
+        session.cookies.set_cookie_if_ok(
+            requests.cookies.create_cookie('sessionid', '42',
+                                           domain='1.2.3.4'),
+            requests.cookies.MockRequest(request))
+
+        self.assertEqual(0, len(session.cookies))
+
+    def test_session_connections(self, mock_close):
+        client = self.pool.checkout('1.2.3.4', 'username', 'password')
+
+        adapter = client.client.session.get_adapter('https://1.2.3.4')
+        self.assertEqual(4, adapter._pool_maxsize)
+        self.assertTrue(adapter._pool_block)
@@ -0,0 +1,166 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+import mock
+import requests.exceptions
+
+from dracclient import deadline
+from dracclient import exceptions
+from dracclient import ratelimit
+from dracclient.tests import base
+
+
+class TokenBucketTestCase(base.BaseTest):
+
+    def test_acquire_within_burst(self):
+        bucket = ratelimit.TokenBucket(1, burst=3)
+
+        started = time.time()
+        for _ in range(3):
+            bucket.acquire()
+
+        self.assertLess(time.time() - started, 0.5)
+
+    def test_acquire_waits_for_refill(self):
+        bucket = ratelimit.TokenBucket(20, burst=1)
+
+        started = time.time()
+        bucket.acquire()
+        bucket.acquire()
+
+        self.assertGreaterEqual(time.time() - started, 0.04)
+
+    def test_acquire_with_deadline(self):
+        bucket = ratelimit.TokenBucket(0.1, burst=1)
+        bucket.acquire()
+
+        with deadline.Deadline(0.05):
+            self.assertRaises(exceptions.DRACDeadlineExceeded,
+                              bucket.acquire)
+
+
+class ConcurrencyGateTestCase(base.BaseTest):
+
+    def test_acquire_blocks_until_release(self):
+        gate = ratelimit.ConcurrencyGate(1)
+        gate.acquire()
+        entered = threading.Event()
+
+        def enter():
+            gate.acquire()
+            entered.set()
+
+        thread = threading.Thread(target=enter)
+        thread.start()
+        self.assertFalse(entered.wait(0.05))
+
+        gate.release()
+        self.assertTrue(entered.wait(1))
+        thread.join()
+        self.assertEqual(1, gate.in_flight)
+
+
+class RateLimiterTestCase(base.BaseTest):
+
+    def test_per_endpoint_concurrency(self):
+        limiter = ratelimit.RateLimiter(max_concurrency=1)
+        limiter.acquire('https://1.2.3.4:443/wsman')
+        limiter.acquire('https://5.6.7.8:443/wsman')
+
+        with deadline.Deadline(0.05):
+            self.assertRaises(exceptions.DRACDeadlineExceeded,
+                              limiter.acquire, 'https://1.2.3.4:443/wsman')
+
+        limiter.release('https://1.2.3.4:443/wsman')
+        limiter.acquire('https://1.2.3.4:443/wsman')
+
+    def test_global_concurrency(self):
+        limiter = ratelimit.RateLimiter(max_concurrency=2,
+                                        global_max_concurrency=1)
+        limiter.acquire('https://1.2.3.4:443/wsman')
+
+        with deadline.Deadline(0.05):
+            self.assertRaises(exceptions.DRACDeadlineExceeded,
+                              limiter.acquire, 'https://5.6.7.8:443/wsman')
+
+        # the endpoint slot taken before timing out must have been returned
+        self.assertEqual(
+            0, limiter._gate('https://5.6.7.8:443/wsman').in_flight)
+
+        limiter.release('https://1.2.3.4:443/wsman')
+        limiter.acquire('https://5.6.7.8:443/wsman')
+
+
+class AdaptiveRateLimiterTestCase(base.BaseTest):
+
+    endpoint = 'https://1.2.3.4:443/wsman'
+
+    def setUp(self):
+        super(AdaptiveRateLimiterTestCase, self).setUp()
+        self.limiter = ratelimit.AdaptiveRateLimiter(initial_concurrency=2,
+                                                     max_concurrency=4)
+
+    def _request(self, latency, error=None):
+        self.limiter.acquire(self.endpoint)
+        self.limiter.release(self.endpoint, latency=latency, error=error)
+
+    def test_additive_increase(self):
+        for _ in range(4):
+            self._request(0.1)
+
+        self.assertEqual(3, self.limiter.concurrency(self.endpoint))
+
+        for _ in range(20):
+            self._request(0.1)
+
+        self.assertEqual(4, self.limiter.concurrency(self.endpoint))
+
+    def test_no_increase_on_slow_responses(self):
+        self._request(0.1)
+        for _ in range(10):
+            self._request(1.0)
+
+        self.assertEqual(2, self.limiter.concurrency(self.endpoint))
+
+    def test_multiplicative_decrease(self):
+        for _ in range(20):
+            self._request(0.1)
+        self.assertEqual(4, self.limiter.concurrency(self.endpoint))
+
+        self._request(30, requests.exceptions.ReadTimeout())
+        self.assertEqual(2, self.limiter.concurrency(self.endpoint))
+
+    @mock.patch('time.time', autospec=True)
+    def test_decrease_once_per_congestion(self, mock_time):
+        mock_time.return_value = 100
+        for _ in range(20):
+            self._request(0.1)
+
+        error = exceptions.WSManInvalidResponse(status_code=500,
+                                                reason='error')
+        self._request(1, error)
+        # started before the first decrease
+        self._request(2, error)
+        self.assertEqual(2, self.limiter.concurrency(self.endpoint))
+
+        mock_time.return_value = 110
+        self._request(1, error)
+        self.assertEqual(1, self.limiter.concurrency(self.endpoint))
+
+    def test_other_errors_ignored(self):
+        self._request(0.1, exceptions.WSManRequestFailure())
+
+        self.assertEqual(2, self.limiter.concurrency(self.endpoint))
@@ -0,0 +1,112 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from dracclient import retry
+from dracclient.tests import base
+
+
+class FixedDelayTestCase(base.BaseTest):
+
+    def test_next_delay(self):
+        state = retry.FixedDelay(3, 5).begin()
+
+        self.assertEqual(5, state.next_delay())
+        self.assertEqual(5, state.next_delay())
+        self.assertIsNone(state.next_delay())
+        self.assertEqual(3, state.attempt)
+
+    @mock.patch('time.time', autospec=True)
+    def test_next_delay_with_max_elapsed(self, mock_time):
+        mock_time.return_value = 100
+        state = retry.FixedDelay(10, 5, max_elapsed=12).begin()
+
+        self.assertEqual(5, state.next_delay())
+        mock_time.return_value = 106
+        self.assertEqual(5, state.next_delay())
+        mock_time.return_value = 111
+        self.assertIsNone(state.next_delay())
+
+
+class ExponentialBackoffTestCase(base.BaseTest):
+
+    def test_delay_without_jitter(self):
+        policy = retry.ExponentialBackoff(10, base_delay=1, max_delay=5,
+                                          jitter=False)
+
+        self.assertEqual([1, 2, 4, 5, 5],
+                         [policy.delay(attempt) for attempt in range(1, 6)])
+
+    @mock.patch('random.uniform', autospec=True)
+    def test_delay_with_jitter(self, mock_uniform):
+        mock_uniform.return_value = 0.5
+        policy = retry.ExponentialBackoff(10, base_delay=2, max_delay=60)
+
+        self.assertEqual(0.5, policy.delay(3))
+        mock_uniform.assert_called_once_with(0, 8)
+
+
+class RetryBudgetTestCase(base.BaseTest):
+
+    @mock.patch('time.time', autospec=True)
+    def test_try_withdraw(self, mock_time):
+        mock_time.return_value = 100
+        budget = retry.RetryBudget(ratio=0.5, min_retries_per_sec=1,
+                                   max_tokens=2)
+
+        self.assertTrue(budget.try_withdraw())
+        self.assertTrue(budget.try_withdraw())
+        self.assertFalse(budget.try_withdraw())
+
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.try_withdraw())
+        self.assertFalse(budget.try_withdraw())
+
+        mock_time.return_value = 101
+        self.assertTrue(budget.try_withdraw())
+
+    @mock.patch('time.time', autospec=True)
+    def test_policy_with_exhausted_budget(self, mock_time):
+        mock_time.return_value = 100
+        budget = retry.RetryBudget(ratio=0, min_retries_per_sec=0,
+                                   max_tokens=1)
+        policy = retry.FixedDelay(5, 0, budget=budget)
+
+        state = policy.begin()
+        self.assertEqual(0, state.next_delay())
+        self.assertIsNone(state.next_delay())
+
+
+class PullRetryTestCase(base.BaseTest):
+
+    def test_defaults(self):
+        pull_retry = retry.PullRetry()
+
+        self.assertIsInstance(pull_retry.policy, retry.ExponentialBackoff)
+        self.assertEqual(3, pull_retry.policy.max_attempts)
+        self.assertEqual(1, pull_retry.max_restarts)
+
+    def test_counters(self):
+        pull_retry = retry.PullRetry(retry.FixedDelay(2))
+
+        pull_retry.record_pull()
+        pull_retry.record_pull()
+        pull_retry.record_retry()
+        pull_retry.record_restart()
+        pull_retry.record_failure()
+
+        self.assertEqual((2, 1, 1, 1),
+                         (pull_retry.pulls, pull_retry.retries,
+                          pull_retry.restarts, pull_retry.failures))
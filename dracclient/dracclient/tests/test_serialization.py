@@ -0,0 +1,225 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import pickle
+import unittest
+
+import lxml.etree
+import mock
+
+from dracclient import cache
+from dracclient import exceptions
+from dracclient.resources import bios
+from dracclient.resources import job
+from dracclient.resources import raid
+from dracclient.resources import uris
+from dracclient import serialization
+from dracclient.tests import base
+from dracclient.tests import utils as test_utils
+from dracclient import utils
+
+
+def _disk(index):
+    return raid.PhysicalDisk(
+        id='Disk.Bay.%d:Enclosure.Internal.0-1:RAID.Integrated.1-1' % index,
+        description='Disk %d in Backplane 1' % index,
+        controller='RAID.Integrated.1-1', manufacturer='SEAGATE',
+        model='ST600MM0006', media_type='hdd', interface_type='sas',
+        size_mb=571776, free_size_mb=571776, serial_number='S0M3EY2Z',
+        firmware_version='LS0A', status='ok', raid_status='ready',
+        sas_address='5000C5007764F409', device_protocol=None)
+
+
+def _pickle_payload(data):
+    # Returns the schema table and the tree of a pickled payload
+    return pickle.loads(data[2:])
+
+
+class SerializationTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(SerializationTestCase, self).setUp()
+        self.settings = {
+            'MemTest': bios.BIOSEnumerableAttribute(
+                name='MemTest', instance_id='BIOS.Setup.1-1:MemTest',
+                read_only=False, current_value='Disabled',
+                pending_value=None, possible_values=['Enabled', 'Disabled']),
+            'Proc1NumCores': bios.BIOSIntegerAttribute(
+                name='Proc1NumCores',
+                instance_id='BIOS.Setup.1-1:Proc1NumCores', read_only=True,
+                current_value=8, pending_value=None, lower_bound=0,
+                upper_bound=65535),
+            'ProcVirtualization': bios.BIOSEnumerableAttribute(
+                name='ProcVirtualization',
+                instance_id='BIOS.Setup.1-1:ProcVirtualization',
+                read_only=False, current_value='Enabled',
+                pending_value=None, possible_values=['Enabled', 'Disabled'])}
+
+    def test_list_of_records(self):
+        disks = cache.ParsedList([_disk(0), _disk(1)])
+
+        data = serialization.dumps(disks, codec=serialization.PICKLE)
+
+        self.assertEqual([_disk(0), _disk(1)], serialization.loads(data))
+        entries, tree = _pickle_payload(data)
+        self.assertEqual([['PhysicalDisk', list(raid.PhysicalDisk._fields)]],
+                         entries)
+        self.assertEqual(['L', 0], tree[:2])
+
+    @mock.patch.object(job, 'LOG', autospec=True)
+    def test_subclass_of_namedtuple(self, mock_log):
+        jobs = [job.Job(id='JID_001436912645',
+                        name='ConfigBIOS:BIOS.Setup.1-1',
+                        start_time='00000101000000', until_time='TIME_NA',
+                        message='Job completed successfully',
+                        status='Completed', percent_complete='100')]
+
+        result = serialization.loads(serialization.dumps(
+            jobs, codec=serialization.PICKLE))
+
+        self.assertEqual(jobs, result)
+        self.assertIs(job.Job, type(result[0]))
+        self.assertFalse(mock_log.warning.called)
+
+    def test_settings(self):
+        data = serialization.dumps(self.settings,
+                                   codec=serialization.PICKLE)
+
+        result = serialization.loads(data)
+        self.assertEqual(self.settings, result)
+        self.assertIs(bios.BIOSIntegerAttribute,
+                      type(result['Proc1NumCores']))
+        self.assertEqual(['BIOSEnumerableAttribute', 'BIOSIntegerAttribute'],
+                         sorted(name for (name, fields)
+                                in _pickle_payload(data)[0]))
+
+    def test_lazy_settings(self):
+        doc = lxml.etree.fromstring(
+            test_utils.BIOSEnumerations[uris.DCIM_BIOSEnumeration]['ok'])
+        settings = utils._parse_config(doc, bios.BIOSEnumerableAttribute,
+                                       True, None, None, lazy=True)
+
+        result = serialization.loads(serialization.dumps(
+            settings, codec=serialization.PICKLE))
+
+        self.assertIs(bios.BIOSEnumerableAttribute, type(result['MemTest']))
+        self.assertEqual(settings, result)
+
+    def test_loads_interns_strings(self):
+        data = serialization.dumps(self.settings,
+                                   codec=serialization.PICKLE)
+
+        first = serialization.loads(data)
+        second = serialization.loads(data)
+
+        self.assertIs(first['MemTest'].possible_values[0],
+                      second['MemTest'].possible_values[0])
+        self.assertIs(next(key for key in first if key == 'MemTest'),
+                      next(key for key in second if key == 'MemTest'))
+
+    def test_loads_interns_shared_fields_only(self):
+        utils.INTERN_TABLE.clear()
+        self.addCleanup(utils.INTERN_TABLE.clear)
+        data = serialization.dumps([_disk(0)], codec=serialization.PICKLE)
+
+        result = serialization.loads(data)
+
+        self.assertIs(utils.intern_string(u'SEAGATE'),
+                      result[0].manufacturer)
+        self.assertIs(utils.intern_string(u'RAID.Integrated.1-1'),
+                      result[0].controller)
+        self.assertNotIn(u'S0M3EY2Z', utils.INTERN_TABLE._strings)
+        self.assertNotIn(u'5000C5007764F409', utils.INTERN_TABLE._strings)
+
+    def test_boot_devices(self):
+        boot_devices = {
+            'IPL': [bios.BootDevice(
+                id='IPL:NIC.Embedded.1-1:082927b7c62a9f52ef0d65a33416d76c',
+                boot_mode='IPL', current_assigned_sequence=0,
+                pending_assigned_sequence=0,
+                bios_boot_string='Embedded NIC 1 Port 1 Partition 1')],
+            'OneTime': []}
+
+        self.assertEqual(boot_devices, serialization.loads(
+            serialization.dumps(boot_devices, codec=serialization.PICKLE)))
+
+    def test_single_record(self):
+        boot_mode = bios.BootMode(id='IPL', name='BootSeq', is_current=True,
+                                  is_next=True)
+
+        self.assertEqual(boot_mode, serialization.loads(
+            serialization.dumps(boot_mode, codec=serialization.PICKLE)))
+
+    def test_loads_memoryview(self):
+        data = serialization.dumps([_disk(0)], codec=serialization.PICKLE)
+
+        self.assertEqual([_disk(0)], serialization.loads(
+            memoryview(bytearray(data))))
+
+    def test_dumps_unknown_type(self):
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          serialization.dumps, [object()])
+
+    def test_dumps_unknown_codec(self):
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          serialization.dumps, [_disk(0)], codec='json')
+
+    def test_loads_unsupported_version(self):
+        data = serialization.dumps([_disk(0)], codec=serialization.PICKLE)
+
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          serialization.loads, b'\x02' + data[1:])
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          serialization.loads, b'')
+
+    def test_loads_unknown_record_type(self):
+        data = b'\x01P' + pickle.dumps([[['Foo', ['id']]], ['R', 0, [1]]])
+
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          serialization.loads, data)
+
+    def test_loads_refuses_globals(self):
+        data = b'\x01P' + pickle.dumps(io.BytesIO())
+
+        self.assertRaises(pickle.UnpicklingError, serialization.loads, data)
+
+    @mock.patch.object(serialization, 'msgpack', None)
+    def test_msgpack_missing(self):
+        data = serialization.dumps([_disk(0)])
+
+        self.assertEqual(b'\x01P', data[:2])
+        self.assertRaises(exceptions.DRACMissingDependency,
+                          serialization.dumps, [_disk(0)],
+                          codec=serialization.MSGPACK)
+        self.assertRaises(exceptions.DRACMissingDependency,
+                          serialization.loads, b'\x01M')
+
+
+@unittest.skipIf(serialization.msgpack is None, 'msgpack is not installed')
+class MsgpackSerializationTestCase(base.BaseTest):
+
+    def test_list_of_records(self):
+        data = serialization.dumps([_disk(0), _disk(1)])
+
+        self.assertEqual(b'\x01M', data[:2])
+        self.assertEqual([_disk(0), _disk(1)], serialization.loads(data))
+
+    def test_settings(self):
+        settings = {'MemTest': bios.BIOSEnumerableAttribute(
+            name='MemTest', instance_id='BIOS.Setup.1-1:MemTest',
+            read_only=False, current_value='Disabled', pending_value=None,
+            possible_values=['Enabled', 'Disabled'])}
+
+        self.assertEqual(settings, serialization.loads(
+            memoryview(serialization.dumps(settings))))
@@ -0,0 +1,237 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+import mock
+import requests_mock
+
+import dracclient.client
+from dracclient import deadline
+from dracclient import exceptions
+from dracclient.resources import uris
+from dracclient import singleflight
+from dracclient.tests import base
+from dracclient.tests import utils as test_utils
+
+
+class _Interrupted(BaseException):
+    """Stands for KeyboardInterrupt and the like"""
+
+
+class _Leader(object):
+    """Runs a blocking call of a group in a thread"""
+
+    def __init__(self, group, key, result=None, error=None):
+        self.release = threading.Event()
+        self.calls = 0
+        self._result = result
+        self._error = error
+        self._thread = threading.Thread(target=self._run,
+                                        args=(group, key))
+
+    def func(self):
+        self.calls += 1
+        self.release.wait(5)
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _run(self, group, key):
+        try:
+            group.do(key, self.func)
+        except BaseException:
+            pass
+
+    def start(self, group):
+        self._thread.start()
+        _wait_for(lambda: group.in_flight() == 1)
+
+    def finish(self):
+        self.release.set()
+        self._thread.join()
+
+
+def _wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError('Condition not met')
+
+
+class GroupTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(GroupTestCase, self).setUp()
+        self.group = singleflight.Group()
+
+    def _follow(self, key, func, results):
+        def follow():
+            try:
+                results.append(self.group.do(key, func))
+            except BaseException as ex:
+                results.append(ex)
+
+        thread = threading.Thread(target=follow)
+        thread.start()
+        return thread
+
+    def test_do(self):
+        self.assertEqual(42, self.group.do('key', lambda x: x * 2, 21))
+        self.assertEqual(0, self.group.in_flight())
+        self.assertEqual(0, self.group.shared)
+
+    def test_do_shares_result(self):
+        result = ['cpu']
+        leader = _Leader(self.group, 'key', result=result)
+        leader.start(self.group)
+        other_func = mock.Mock()
+        results = []
+
+        threads = [self._follow('key', other_func, results)
+                   for _ in range(3)]
+        _wait_for(lambda: self.group.shared == 3)
+        leader.finish()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, leader.calls)
+        self.assertFalse(other_func.called)
+        self.assertEqual(3, len(results))
+        for follower_result in results:
+            self.assertIs(result, follower_result)
+        self.assertEqual(0, self.group.in_flight())
+
+    def test_do_shares_exception(self):
+        error = exceptions.WSManRequestFailure(reason='Connection refused')
+        leader = _Leader(self.group, 'key', error=error)
+        leader.start(self.group)
+        results = []
+
+        thread = self._follow('key', mock.Mock(), results)
+        _wait_for(lambda: self.group.shared == 1)
+        leader.finish()
+        thread.join()
+
+        self.assertEqual([error], results)
+
+    def test_do_shares_base_exception(self):
+        error = _Interrupted()
+        leader = _Leader(self.group, 'key', error=error)
+        leader.start(self.group)
+        results = []
+
+        thread = self._follow('key', mock.Mock(), results)
+        _wait_for(lambda: self.group.shared == 1)
+        leader.finish()
+        thread.join()
+
+        self.assertEqual([error], results)
+        self.assertEqual(0, self.group.in_flight())
+
+    def test_do_with_other_key(self):
+        leader = _Leader(self.group, 'key')
+        leader.start(self.group)
+
+        self.assertEqual('other', self.group.do('other-key',
+                                                lambda: 'other'))
+
+        leader.finish()
+        self.assertEqual(0, self.group.shared)
+
+    def test_do_after_leader_exceeded_its_deadline(self):
+        error = exceptions.DRACDeadlineExceeded(timeout=1)
+        leader = _Leader(self.group, 'key', error=error)
+        leader.start(self.group)
+        results = []
+
+        thread = self._follow('key', lambda: 'retried', results)
+        _wait_for(lambda: self.group.shared == 1)
+        leader.finish()
+        thread.join()
+
+        self.assertEqual(['retried'], results)
+
+    def test_do_with_deadline(self):
+        leader = _Leader(self.group, 'key')
+        leader.start(self.group)
+
+        try:
+            with deadline.Deadline(0.05):
+                self.assertRaises(exceptions.DRACDeadlineExceeded,
+                                  self.group.do, 'key', mock.Mock())
+        finally:
+            leader.finish()
+
+
+@requests_mock.Mocker()
+@mock.patch.object(dracclient.client.WSManClient, 'wait_until_idrac_is_ready',
+                   spec_set=True, autospec=True)
+class ClientCoalescingTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ClientCoalescingTestCase, self).setUp()
+        self.drac_client = dracclient.client.DRACClient(
+            coalesce_requests=True, **test_utils.FAKE_ENDPOINT)
+
+    def test_list_jobs(self, mock_requests, mock_wait_until_idrac_is_ready):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=test_utils.JobEnumerations[
+                               uris.DCIM_LifecycleJob]['ok'])
+        flights = self.drac_client.client._flights
+        release = threading.Event()
+        original_do = flights.do
+
+        def blocking_do(key, func, *args, **kwargs):
+            def blocked():
+                release.wait(5)
+                return func(*args, **kwargs)
+            return original_do(key, blocked)
+
+        results = []
+
+        def list_jobs():
+            results.append(self.drac_client.list_jobs(only_unfinished=True))
+
+        with mock.patch.object(flights, 'do', side_effect=blocking_do):
+            threads = [threading.Thread(target=list_jobs) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            _wait_for(lambda: flights.shared == 3)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(1, mock_requests.call_count)
+        self.assertEqual(4, len(results))
+        self.assertEqual([results[0]] * 4, results)
+
+    def test_list_jobs_sequentially(self, mock_requests,
+                                    mock_wait_until_idrac_is_ready):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=test_utils.JobEnumerations[
+                               uris.DCIM_LifecycleJob]['ok'])
+
+        self.drac_client.list_jobs(only_unfinished=True)
+        self.drac_client.list_jobs(only_unfinished=True)
+
+        self.assertEqual(2, mock_requests.call_count)
+        self.assertEqual(0, self.drac_client.client._flights.shared)
+
+    def test_without_coalescing(self, mock_requests,
+                                mock_wait_until_idrac_is_ready):
+        drac_client = dracclient.client.DRACClient(**test_utils.FAKE_ENDPOINT)
+
+        self.assertIsNone(drac_client.client._flights)
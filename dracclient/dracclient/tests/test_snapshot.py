@@ -0,0 +1,181 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+import dracclient.client
+from dracclient import exceptions
+from dracclient.resources import bios
+from dracclient.resources import raid
+from dracclient import snapshot
+from dracclient.tests import base
+from dracclient.tests import utils as test_utils
+
+
+def _fake_client(boot_mode='Uefi', virtual_disks=1):
+    drac_client = mock.Mock(spec=dracclient.client.DRACClient)
+    drac_client.client = mock.Mock(host='1.2.3.4')
+    drac_client.list_bios_settings.return_value = {
+        'BootMode': bios.BIOSEnumerableAttribute(
+            'BootMode', 'BIOS.Setup.1-1:BootMode', boot_mode, None, False,
+            ['Bios', 'Uefi']),
+        'MemTest': bios.BIOSEnumerableAttribute(
+            'MemTest', 'BIOS.Setup.1-1:MemTest', 'Disabled', None, False,
+            ['Enabled', 'Disabled'])}
+    drac_client.list_boot_devices.return_value = {
+        'IPL': [bios.BootDevice(
+            id='IPL:BIOS.Setup.1-1#BootSeq#NIC.Integrated.1-1-1',
+            boot_mode='IPL', current_assigned_sequence=0,
+            pending_assigned_sequence=0,
+            bios_boot_string='Integrated NIC 1 Port 1 Partition 1')]}
+    drac_client.list_virtual_disks.return_value = [
+        raid.VirtualDisk(
+            id='Disk.Virtual.%d:RAID.Integrated.1-1' % index,
+            name='disk %d' % index, description='Virtual Disk %d' % index,
+            controller='RAID.Integrated.1-1', raid_level='1',
+            size_mb=571776, status='ok', raid_status='online',
+            span_depth=1, span_length=2, pending_operations=None,
+            physical_disks=['Disk.Bay.%d:Enclosure.Internal.0-1' % disk
+                            for disk in (index * 2, index * 2 + 1)])
+        for index in range(virtual_disks)]
+    return drac_client
+
+
+class SnapshotTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(SnapshotTestCase, self).setUp()
+        self.sections = ['bios_settings', 'boot_devices', 'virtual_disks']
+
+    def test_take_snapshot(self):
+        result = snapshot.take_snapshot(_fake_client(), self.sections)
+
+        self.assertEqual('1.2.3.4', result.host)
+        self.assertEqual(snapshot.SNAPSHOT_VERSION, result.version)
+        self.assertEqual(self.sections, sorted(result.sections))
+        self.assertEqual(['BootMode', 'MemTest'],
+                         [key for (key, _) in result.sections[
+                             'bios_settings']])
+        self.assertEqual('Uefi', result.get('bios_settings',
+                                            'BootMode')['current_value'])
+        self.assertEqual(
+            ['Disk.Bay.0:Enclosure.Internal.0-1',
+             'Disk.Bay.1:Enclosure.Internal.0-1'],
+            result.get('virtual_disks', 'Disk.Virtual.0:RAID.Integrated.1-1')[
+                'physical_disks'])
+        self.assertEqual(
+            'IPL',
+            result.get('boot_devices',
+                       'IPL:BIOS.Setup.1-1#BootSeq#NIC.Integrated.1-1-1')[
+                           'boot_mode'])
+        self.assertIsNone(result.get('bios_settings', 'SerialComm'))
+
+    def test_get(self):
+        entries = [('Disk.Bay.%d' % index, {'index': index})
+                   for index in range(10)]
+        result = snapshot.Snapshot('1.2.3.4', 0, {'physical_disks': entries})
+
+        self.assertEqual({'index': 0},
+                         result.get('physical_disks', 'Disk.Bay.0'))
+        self.assertEqual({'index': 9},
+                         result.get('physical_disks', 'Disk.Bay.9'))
+        self.assertIsNone(result.get('physical_disks', 'Disk.Bay'))
+        self.assertIsNone(result.get('physical_disks', 'Disk.Bay.10'))
+        self.assertIsNone(result.get('physical_disks', 'Disk.Bay.99'))
+        self.assertIsNone(result.get('virtual_disks', 'Disk.Bay.0'))
+
+    def test_take_snapshot_with_unknown_section(self):
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          snapshot.take_snapshot, _fake_client(),
+                          ['bios_settings', 'fans'])
+
+    def test_json_round_trip(self):
+        original = snapshot.take_snapshot(_fake_client(), self.sections)
+
+        restored = snapshot.Snapshot.from_json(original.to_json())
+
+        self.assertEqual(original, restored)
+        self.assertEqual([], snapshot.diff(original, restored))
+
+    def test_from_dict_with_unsupported_version(self):
+        data = snapshot.take_snapshot(_fake_client(),
+                                      self.sections).to_dict()
+        data['version'] = 42
+
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          snapshot.Snapshot.from_dict, data)
+
+    def test_diff(self):
+        before = snapshot.take_snapshot(_fake_client(), self.sections)
+        after = snapshot.take_snapshot(
+            _fake_client(boot_mode='Bios', virtual_disks=2), self.sections)
+
+        deltas = snapshot.diff(before, after)
+
+        self.assertEqual(2, len(deltas))
+        self.assertEqual(
+            snapshot.Delta('bios_settings', 'BootMode', snapshot.CHANGED,
+                           'current_value', 'Uefi', 'Bios'),
+            deltas[0])
+        self.assertEqual('virtual_disks', deltas[1].section)
+        self.assertEqual('Disk.Virtual.1:RAID.Integrated.1-1', deltas[1].key)
+        self.assertEqual(snapshot.ADDED, deltas[1].change)
+        self.assertEqual('disk 1', deltas[1].new['name'])
+
+    def test_diff_with_removed_entries(self):
+        before = snapshot.take_snapshot(_fake_client(virtual_disks=3),
+                                        self.sections)
+        after = snapshot.take_snapshot(_fake_client(virtual_disks=1),
+                                       self.sections)
+
+        deltas = snapshot.diff(before, after)
+
+        self.assertEqual([snapshot.REMOVED] * 2,
+                         [delta.change for delta in deltas])
+        self.assertEqual(['Disk.Virtual.1:RAID.Integrated.1-1',
+                          'Disk.Virtual.2:RAID.Integrated.1-1'],
+                         [delta.key for delta in deltas])
+
+    def test_diff_with_sections(self):
+        before = snapshot.take_snapshot(_fake_client(), self.sections)
+        after = snapshot.take_snapshot(
+            _fake_client(boot_mode='Bios', virtual_disks=2), self.sections)
+
+        deltas = snapshot.diff(before, after, sections=['virtual_disks'])
+
+        self.assertEqual(['virtual_disks'],
+                         [delta.section for delta in deltas])
+
+    def test_diff_with_missing_section(self):
+        before = snapshot.take_snapshot(_fake_client(), ['bios_settings'])
+        after = snapshot.take_snapshot(_fake_client(), self.sections)
+
+        deltas = snapshot.diff(before, after)
+
+        self.assertEqual(2, len(deltas))
+        self.assertEqual(['boot_devices', 'virtual_disks'],
+                         [delta.section for delta in deltas])
+
+
+class ClientSnapshotTestCase(base.BaseTest):
+
+    @mock.patch.object(snapshot, 'take_snapshot', spec_set=True,
+                       autospec=True)
+    def test_snapshot(self, mock_take_snapshot):
+        drac_client = dracclient.client.DRACClient(
+            **test_utils.FAKE_ENDPOINT)
+
+        result = drac_client.snapshot(['cpus'])
+
+        mock_take_snapshot.assert_called_once_with(drac_client, ['cpus'])
+        self.assertEqual(mock_take_snapshot.return_value, result)
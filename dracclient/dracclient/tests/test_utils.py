@@ -27,6 +27,29 @@ class UtilsTestCase(base.BaseTest):
     def setUp(self):
         super(UtilsTestCase, self).setUp()
 
+    def test_qname(self):
+        name = utils.qname(uris.DCIM_CPUView, 'CPUFamily')
+
+        self.assertEqual('{%s}CPUFamily' % uris.DCIM_CPUView, name)
+        self.assertIs(name, utils.qname(uris.DCIM_CPUView, 'CPUFamily'))
+
+    def test_find_xml(self):
+        doc = etree.fromstring(
+            '<a xmlns="http://resource"><b><c>1</c></b><c>2</c></a>')
+
+        self.assertEqual('1', utils.find_xml(doc, 'c', 'http://resource').text)
+        self.assertEqual(['1', '2'],
+                         [elem.text for elem in utils.find_xml(
+                             doc, 'c', 'http://resource', find_all=True)])
+        self.assertIsNone(utils.find_xml(doc, 'd', 'http://resource'))
+        self.assertEqual([], utils.find_xml(doc, 'd', 'http://resource',
+                                            find_all=True))
+
+    def test_find_xml_skips_element_itself(self):
+        doc = etree.fromstring('<a xmlns="http://resource"><b/></a>')
+
+        self.assertIsNone(utils.find_xml(doc, 'a', 'http://resource'))
+
     def test__is_attr_non_nil_True(self):
         doc = etree.fromstring(
             test_utils.RAIDEnumerations[
@@ -61,6 +84,19 @@ class UtilsTestCase(base.BaseTest):
 
         self.assertEqual('1', val)
 
+    def test_get_wsman_resource_attr_interned(self):
+        content = test_utils.InventoryEnumerations[uris.DCIM_CPUView]['ok']
+        values = []
+        for i in range(2):
+            cpus = utils.find_xml(etree.fromstring(content), 'DCIM_CPUView',
+                                  uris.DCIM_CPUView, find_all=True)
+            values.append(utils.get_wsman_resource_attr(
+                cpus[0], uris.DCIM_CPUView, 'Model', interned=True))
+
+        self.assertEqual('Intel(R) Xeon(R) CPU E5-2620 v3 @ 2.40GHz',
+                         values[0])
+        self.assertIs(values[0], values[1])
+
     def test_get_wsman_resource_attr_missing_attr(self):
         expected_message = ("Attribute 'HyperThreadingEnabled' is missing "
                             "from the response")
@@ -173,3 +209,34 @@ class UtilsTestCase(base.BaseTest):
                           doc=None,
                           resource_uri=None,
                           is_reboot_required_value='foo')
+
+
+class InternTableTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(InternTableTestCase, self).setUp()
+        self.table = utils.InternTable(max_size=2)
+
+    def test_intern(self):
+        value = ''.join(['RAID.Integrated', '.1-1'])
+        other = ''.join(['RAID.Integrated.', '1-1'])
+
+        self.assertIs(value, self.table.intern(value))
+        self.assertIs(value, self.table.intern(other))
+        self.assertIsNone(self.table.intern(None))
+        self.assertEqual(1, len(self.table))
+
+    def test_intern_full(self):
+        for value in ('NIC.1', 'NIC.2', 'NIC.3'):
+            self.table.intern(value)
+
+        # The table was emptied before adding NIC.3
+        self.assertEqual(1, len(self.table))
+        value = ''.join(['NIC', '.1'])
+        self.assertIs(value, self.table.intern(value))
+
+    def test_clear(self):
+        self.table.intern('NIC.1')
+        self.table.clear()
+
+        self.assertEqual(0, len(self.table))
@@ -0,0 +1,165 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+
+import lxml.etree
+import mock
+import requests_mock
+
+from dracclient.resources import uris
+from dracclient.tests import base
+from dracclient.tests import utils as test_utils
+from dracclient import wirelog
+import dracclient.wsman
+
+
+class RedactTestCase(base.BaseTest):
+
+    def test_redact_invoke_request(self):
+        payload = dracclient.wsman._InvokePayload(
+            'http://host:443/wsman', uris.DCIM_iDRACCardService,
+            'SetAttributes', {'CreationClassName': 'DCIM_iDRACCardService'},
+            {'Target': 'iDRAC.Embedded.1',
+             'AttributeName': ['Users.2#UserName', 'Users.2#Password'],
+             'AttributeValue': ['root', 's3cr3t']}).build()
+
+        doc = lxml.etree.fromstring(wirelog.redact(payload))
+
+        self.assertEqual(
+            ['root', wirelog.REDACTED],
+            [elem.text for elem in doc.iter(
+                '{%s}AttributeValue' % uris.DCIM_iDRACCardService)])
+        self.assertNotIn(b's3cr3t', wirelog.redact(payload))
+
+    def test_redact_enumeration_response(self):
+        content = b"""
+<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope"
+            xmlns:n1="http://resource">
+  <s:Body>
+    <n1:Item>
+      <n1:AttributeName>SNMPCommunity</n1:AttributeName>
+      <n1:CurrentValue>public</n1:CurrentValue>
+      <n1:PendingValue>private</n1:PendingValue>
+    </n1:Item>
+    <n1:Item>
+      <n1:AttributeName>Name</n1:AttributeName>
+      <n1:CurrentValue>idrac</n1:CurrentValue>
+    </n1:Item>
+  </s:Body>
+</s:Envelope>
+"""
+
+        doc = lxml.etree.fromstring(wirelog.redact(content))
+
+        self.assertEqual(
+            [wirelog.REDACTED, wirelog.REDACTED, 'idrac'],
+            [elem.text for elem in doc.iter('{http://resource}CurrentValue',
+                                            '{http://resource}PendingValue')])
+
+    def test_redact_without_sensitive_attributes(self):
+        content = test_utils.WSManEnumerations['context'][0].encode('utf-8')
+
+        self.assertIs(content, wirelog.redact(content))
+
+    def test_redact_invalid_content(self):
+        self.assertEqual(b'<password>', wirelog.redact(b'<password>'))
+
+    def test_truncate(self):
+        self.assertEqual(b'0123... (6 bytes truncated)',
+                         wirelog.truncate(b'0123456789', 4))
+        self.assertEqual(b'0123', wirelog.truncate(b'0123', 4))
+        self.assertEqual(b'0123456789', wirelog.truncate(b'0123456789', None))
+
+
+class WireLogTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(WireLogTestCase, self).setUp()
+        self.wire_log = wirelog.WireLog('1.2.3.4', max_bytes=8)
+        self.mock_logger = mock.Mock(spec=logging.Logger)
+        self.wire_log.logger = self.mock_logger
+
+    def test_logger_shared_by_hosts(self):
+        self.assertIs(logging.getLogger('dracclient.wire'),
+                      wirelog.WireLog('1.2.3.4').logger)
+        self.assertIs(logging.getLogger('dracclient.wire'),
+                      wirelog.WireLog('5.6.7.8').logger)
+
+    @mock.patch.object(wirelog, '_traced_hosts', None)
+    def test_traced_hosts(self):
+        self.mock_logger.isEnabledFor.return_value = True
+        other_wire_log = wirelog.WireLog('1.2.3.40')
+        other_wire_log.logger = self.mock_logger
+
+        self.assertTrue(self.wire_log.enabled())
+        self.assertTrue(other_wire_log.enabled())
+
+        wirelog.set_traced_hosts(['1.2.3.4'])
+
+        self.assertTrue(self.wire_log.enabled())
+        self.assertFalse(other_wire_log.enabled())
+
+        wirelog.set_traced_hosts(None)
+
+        self.assertTrue(other_wire_log.enabled())
+
+    @mock.patch.object(wirelog, 'redact', autospec=True)
+    def test_request(self, mock_redact):
+        self.mock_logger.isEnabledFor.return_value = True
+        mock_redact.return_value = b'<payload/>'
+
+        self.wire_log.request('https://1.2.3.4:443/wsman', b'<request/>')
+
+        mock_redact.assert_called_once_with(b'<request/>')
+        self.mock_logger.debug.assert_called_once_with(
+            mock.ANY, {'endpoint': 'https://1.2.3.4:443/wsman',
+                       'payload': b'<payload... (2 bytes truncated)'})
+
+    @mock.patch.object(wirelog, 'redact', autospec=True)
+    def test_response_without_redaction(self, mock_redact):
+        self.mock_logger.isEnabledFor.return_value = True
+        self.wire_log.redact = False
+
+        self.wire_log.response('https://1.2.3.4:443/wsman', 200, b'<resp/>')
+
+        self.assertFalse(mock_redact.called)
+        self.mock_logger.debug.assert_called_once_with(
+            mock.ANY, {'endpoint': 'https://1.2.3.4:443/wsman',
+                       'status_code': 200, 'payload': b'<resp/>'})
+
+    @mock.patch.object(wirelog, 'redact', autospec=True)
+    def test_disabled(self, mock_redact):
+        self.mock_logger.isEnabledFor.return_value = False
+
+        self.wire_log.request('https://1.2.3.4:443/wsman', b'<request/>')
+        self.wire_log.response('https://1.2.3.4:443/wsman', 200, b'<resp/>')
+
+        self.assertFalse(mock_redact.called)
+        self.assertFalse(self.mock_logger.debug.called)
+
+    @requests_mock.Mocker()
+    def test_client_requests(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+        client = dracclient.wsman.Client(**test_utils.FAKE_ENDPOINT)
+        client.wire_log = self.wire_log
+        self.mock_logger.isEnabledFor.return_value = True
+
+        client.enumerate('resource', auto_pull=False)
+
+        self.assertEqual(2, self.mock_logger.debug.call_count)
+        self.assertEqual(
+            {'endpoint': 'https://1.2.3.4:443/wsman', 'status_code': 200,
+             'payload': b'<result>... (13 bytes truncated)'},
+            self.mock_logger.debug.call_args[0][1])
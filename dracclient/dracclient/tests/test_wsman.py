@@ -12,6 +12,7 @@
 #    under the License.
 
 import collections
+import threading
 import uuid
 
 import lxml.etree
@@ -21,8 +22,13 @@ import requests.exceptions
 import requests_mock
 
 from dracclient import exceptions
+from dracclient.resources import uris
 from dracclient.tests import base
 from dracclient.tests import utils as test_utils
+import dracclient.batching
+import dracclient.deadline
+import dracclient.ratelimit
+import dracclient.retry
 import dracclient.wsman
 
 
@@ -90,6 +96,116 @@ class ClientTestCase(base.BaseTest):
         mock_pull.assert_called_once_with(self.client, 'FooResource',
                                           'enum-context-uuid', 42)
 
+    @requests_mock.Mocker()
+    def test_enumerate_with_enumeration_mode(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            text=test_utils.WSManEnumerations['object_and_epr'])
+
+        resp_xml = self.client.enumerate(
+            'FooResource',
+            enumeration_mode=dracclient.wsman.ENUMERATION_MODE_OBJECT_AND_EPR)
+
+        self.assertIn(b'<wsman:EnumerationMode>EnumerateObjectAndEPR<',
+                      mock_requests.last_request.body)
+        self.assertEqual(
+            1, len(resp_xml.findall('.//{http://FooResource}FooResource')))
+        self.assertEqual([{'InstanceID': '1'}],
+                         dracclient.wsman.get_epr_selectors(resp_xml))
+
+    @requests_mock.Mocker()
+    def test_enumerate_selectors(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['epr'][0]},
+             {'text': test_utils.WSManEnumerations['epr'][1]}])
+
+        selectors = self.client.enumerate_selectors(
+            uris.DCIM_PhysicalDiskView)
+
+        self.assertEqual(
+            [{'InstanceID':
+              'Disk.Bay.0:Enclosure.Internal.0-1:RAID.Integrated.1-1',
+              '__cimnamespace': 'root/dcim'},
+             {'InstanceID':
+              'Disk.Bay.1:Enclosure.Internal.0-1:RAID.Integrated.1-1',
+              '__cimnamespace': 'root/dcim'}],
+            selectors)
+        self.assertIn(b'<wsman:EnumerationMode>EnumerateEPR<',
+                      mock_requests.request_history[0].body)
+
+    def test_enumerate_with_session(self):
+        session = mock.Mock()
+        session.post.return_value = mock.Mock(
+            status_code=200, content=b'<result>yay!</result>')
+        client = dracclient.wsman.Client(session=session,
+                                         **test_utils.FAKE_ENDPOINT)
+
+        resp = client.enumerate('resource', auto_pull=False)
+
+        self.assertEqual('yay!', resp.text)
+        self.assertEqual('https://1.2.3.4:443/wsman',
+                         session.post.call_args[0][0])
+
+        client.close()
+
+        session.close.assert_called_once_with()
+
+    @requests_mock.Mocker()
+    def test_iter_items(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['context'][0]},
+             {'text': test_utils.WSManEnumerations['context'][1]},
+             {'text': test_utils.WSManEnumerations['context'][2]},
+             {'text': test_utils.WSManEnumerations['context'][3]}])
+
+        instance_ids = []
+        for item in self.client.iter_items('FooResource', max_elems=42,
+                                           chunk_size=16):
+            instance_ids.append(item[0].text)
+            # Items already processed are dropped from the document
+            self.assertLessEqual(len(item.getparent()), 2)
+
+        self.assertEqual(['1', '2', '3', '4', '5'], instance_ids)
+        self.assertEqual(4, mock_requests.call_count)
+        pull_body = lxml.etree.fromstring(mock_requests.last_request.body)
+        self.assertEqual(
+            'enum-context-uuid',
+            pull_body.find('.//{%s}EnumerationContext'
+                           % dracclient.wsman.NS_WSMAN_ENUM).text)
+        self.assertEqual(
+            '42',
+            pull_body.find('.//{%s}MaxElements'
+                           % dracclient.wsman.NS_WSMAN).text)
+
+    @requests_mock.Mocker()
+    def test_iter_items_without_context(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=test_utils.WSManEnumerations['context'][3])
+
+        items = list(self.client.iter_items('FooResource'))
+
+        self.assertEqual(1, len(items))
+        self.assertEqual(1, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    def test_iter_items_with_invalid_status_code(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', status_code=500,
+                           reason='dumb request')
+
+        self.assertRaises(exceptions.WSManInvalidResponse, list,
+                          self.client.iter_items('FooResource'))
+
+    @requests_mock.Mocker()
+    def test_iter_items_with_truncated_response(self, mock_requests):
+        content = test_utils.WSManEnumerations['context'][3]
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=content[:len(content) // 2])
+
+        self.assertRaises(lxml.etree.XMLSyntaxError, list,
+                          self.client.iter_items('FooResource'))
+
     @requests_mock.Mocker()
     def test_pull(self, mock_requests):
         expected_resp = '<result>yay!</result>'
@@ -99,6 +215,76 @@ class ClientTestCase(base.BaseTest):
 
         self.assertEqual('yay!', resp.text)
 
+    @requests_mock.Mocker()
+    def test_identify(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=test_utils.WSManIdentify['ok'])
+
+        resp_xml = self.client.identify()
+
+        self.assertEqual(
+            '1.0',
+            resp_xml.find('.//{%s}ProductVersion'
+                          % dracclient.wsman.NS_WSMAN_IDENTITY).text)
+        self.assertNotIn('Authorization', mock_requests.last_request.headers)
+
+    @requests_mock.Mocker()
+    def test_identify_with_retry_policy(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           exc=requests.exceptions.ConnectionError)
+
+        self.assertRaises(exceptions.WSManRequestFailure,
+                          self.client.identify,
+                          retry_policy=dracclient.retry.FixedDelay(1))
+        self.assertEqual(1, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    def test_get(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            text=test_utils.JobGets[uris.DCIM_LifecycleJob]['ok'])
+
+        resp_xml = self.client.get(uris.DCIM_LifecycleJob,
+                                   {'InstanceID': 'JID_001436912645'})
+
+        self.assertEqual(
+            'JID_001436912645',
+            resp_xml.find('.//{%s}InstanceID' % uris.DCIM_LifecycleJob).text)
+        self.assertIn(
+            b'http://schemas.xmlsoap.org/ws/2004/09/transfer/Get<',
+            mock_requests.last_request.body)
+
+    @requests_mock.Mocker()
+    def test_get_not_found(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman', status_code=400,
+            text=test_utils.JobGets[uris.DCIM_LifecycleJob]['not_found'])
+
+        self.assertRaises(exceptions.WSManInstanceNotFound,
+                          self.client.get, uris.DCIM_LifecycleJob,
+                          {'InstanceID': 'JID_42'})
+
+    @requests_mock.Mocker()
+    def test_get_with_other_fault(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman', status_code=500,
+            text=test_utils.JobGets[uris.DCIM_LifecycleJob][
+                'not_found'].replace('wsman:InvalidSelectors',
+                                     'wsman:InternalError'))
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          self.client.get, uris.DCIM_LifecycleJob,
+                          {'InstanceID': 'JID_42'})
+
+    @requests_mock.Mocker()
+    def test_get_with_invalid_response(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', status_code=401,
+                           text='Unauthorized')
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          self.client.get, uris.DCIM_LifecycleJob,
+                          {'InstanceID': 'JID_42'})
+
     @requests_mock.Mocker()
     def test_invoke(self, mock_requests):
         expected_resp = '<result>yay!</result>'
@@ -177,6 +363,510 @@ class ClientTestCase(base.BaseTest):
         self.assertEqual('yay!', resp.text)
         mock_ts.assert_called_once_with(ssl_retry_delay)
 
+    @requests_mock.Mocker()
+    @mock.patch('time.sleep', autospec=True)
+    def test_client_retry_policy(self, mock_requests, mock_ts):
+        retry_policy = dracclient.retry.ExponentialBackoff(
+            3, base_delay=2, jitter=False)
+        client = dracclient.wsman.Client(retry_policy=retry_policy,
+                                         **test_utils.FAKE_ENDPOINT)
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           exc=requests.exceptions.ConnectionError)
+
+        self.assertRaises(exceptions.WSManRequestFailure,
+                          client.invoke, 'http://resource', 'method',
+                          {'selector': 'foo'}, {'property': 'bar'})
+        self.assertEqual(3, mock_requests.call_count)
+        self.assertEqual([mock.call(2), mock.call(4)],
+                         mock_ts.call_args_list)
+
+    @requests_mock.Mocker()
+    def test_request_timeout(self, mock_requests):
+        client = dracclient.wsman.Client(connect_timeout=5, read_timeout=60,
+                                         **test_utils.FAKE_ENDPOINT)
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+
+        client.enumerate('resource', auto_pull=False)
+        self.assertEqual((5, 60), mock_requests.last_request.timeout)
+
+    @requests_mock.Mocker()
+    @mock.patch('time.time', autospec=True)
+    def test_request_timeout_with_deadline(self, mock_requests, mock_time):
+        mock_time.return_value = 100
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+
+        with dracclient.deadline.Deadline(30):
+            self.client.enumerate('resource', auto_pull=False)
+
+        self.assertEqual((10, 30), mock_requests.last_request.timeout)
+
+    @requests_mock.Mocker()
+    @mock.patch('time.time', autospec=True)
+    def test_request_with_expired_deadline(self, mock_requests, mock_time):
+        mock_time.return_value = 100
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+
+        with dracclient.deadline.Deadline(30):
+            mock_time.return_value = 130
+            self.assertRaises(exceptions.DRACDeadlineExceeded,
+                              self.client.enumerate, 'resource')
+
+        self.assertFalse(mock_requests.called)
+
+    @requests_mock.Mocker()
+    def test_request_with_rate_limiter(self, mock_requests):
+        rate_limiter = mock.Mock(spec=dracclient.ratelimit.RateLimiter)
+        client = dracclient.wsman.Client(rate_limiter=rate_limiter,
+                                         **test_utils.FAKE_ENDPOINT)
+        mock_requests.post('https://1.2.3.4:443/wsman', status_code=500,
+                           reason='dumb request')
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          client.enumerate, 'resource')
+        rate_limiter.acquire.assert_called_once_with(
+            'https://1.2.3.4:443/wsman')
+        (endpoint,), kwargs = rate_limiter.release.call_args
+        self.assertEqual('https://1.2.3.4:443/wsman', endpoint)
+        self.assertIsInstance(kwargs['error'],
+                              exceptions.WSManInvalidResponse)
+
+    @requests_mock.Mocker()
+    def test_iter_items_with_rate_limiter(self, mock_requests):
+        rate_limiter = mock.Mock(spec=dracclient.ratelimit.RateLimiter)
+        client = dracclient.wsman.Client(rate_limiter=rate_limiter,
+                                         **test_utils.FAKE_ENDPOINT)
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['context'][0]},
+             {'text': test_utils.WSManEnumerations['context'][1]},
+             {'text': test_utils.WSManEnumerations['context'][2]},
+             {'text': test_utils.WSManEnumerations['context'][3]}])
+
+        items = client.iter_items('FooResource', chunk_size=16)
+        next(items)
+
+        # The permit is held while the response is being received
+        self.assertEqual(1, rate_limiter.acquire.call_count)
+        self.assertFalse(rate_limiter.release.called)
+
+        list(items)
+
+        self.assertEqual(4, rate_limiter.acquire.call_count)
+        self.assertEqual(4, rate_limiter.release.call_count)
+        for (endpoint,), kwargs in rate_limiter.release.call_args_list:
+            self.assertEqual('https://1.2.3.4:443/wsman', endpoint)
+            self.assertIsNone(kwargs['error'])
+
+    @requests_mock.Mocker()
+    def test_iter_items_closed_with_rate_limiter(self, mock_requests):
+        rate_limiter = mock.Mock(spec=dracclient.ratelimit.RateLimiter)
+        client = dracclient.wsman.Client(rate_limiter=rate_limiter,
+                                         **test_utils.FAKE_ENDPOINT)
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text=test_utils.WSManEnumerations['context'][0])
+
+        items = client.iter_items('FooResource', chunk_size=16)
+        next(items)
+        items.close()
+
+        rate_limiter.release.assert_called_once_with(
+            'https://1.2.3.4:443/wsman', latency=mock.ANY, error=None)
+
+
+class PullRetryTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(PullRetryTestCase, self).setUp()
+        self.pull_retry = dracclient.retry.PullRetry(
+            dracclient.retry.FixedDelay(3), max_restarts=1)
+        self.client = dracclient.wsman.Client(pull_retry=self.pull_retry,
+                                              **test_utils.FAKE_ENDPOINT)
+        self.context = test_utils.WSManEnumerations['context']
+        self.invalid_context = test_utils.WSManPulls['invalid_context']
+
+    def _count_items(self, resp_xml):
+        return len(resp_xml.findall('.//{http://FooResource}FooResource'))
+
+    def _actions(self, mock_requests):
+        return [lxml.etree.fromstring(request.body).findtext(
+                    './/{%s}Action' % dracclient.wsman.NS_WS_ADDR
+                ).rsplit('/', 1)[-1]
+                for request in mock_requests.request_history]
+
+    @requests_mock.Mocker()
+    def test_enumerate_retries_pull(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': self.context[0]},
+             {'status_code': 500, 'reason': 'busy'},
+             {'exc': requests.exceptions.ReadTimeout},
+             {'text': self.context[1]},
+             {'text': self.context[2]},
+             {'text': self.context[3]}])
+
+        resp_xml = self.client.enumerate('FooResource')
+
+        self.assertEqual(4, self._count_items(resp_xml))
+        self.assertEqual(['Enumerate'] + ['Pull'] * 5,
+                         self._actions(mock_requests))
+        # The failed pull is sent again with the same context
+        contexts = [lxml.etree.fromstring(request.body).findtext(
+                        './/{%s}EnumerationContext'
+                        % dracclient.wsman.NS_WSMAN_ENUM)
+                    for request in mock_requests.request_history[1:4]]
+        self.assertEqual(['enum-context-uuid'] * 3, contexts)
+        self.assertEqual(5, self.pull_retry.pulls)
+        self.assertEqual(2, self.pull_retry.retries)
+        self.assertEqual(0, self.pull_retry.restarts)
+
+    @requests_mock.Mocker()
+    def test_enumerate_with_pull_retries_exhausted(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': self.context[0]},
+             {'status_code': 500, 'reason': 'busy'}])
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          self.client.enumerate, 'FooResource')
+        self.assertEqual(4, mock_requests.call_count)
+        self.assertEqual(2, self.pull_retry.retries)
+        self.assertEqual(1, self.pull_retry.failures)
+
+    @requests_mock.Mocker()
+    def test_enumerate_with_client_error(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': self.context[0]},
+             {'status_code': 401, 'reason': 'unauthorized'}])
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          self.client.enumerate, 'FooResource')
+        self.assertEqual(2, mock_requests.call_count)
+        self.assertEqual(0, self.pull_retry.retries)
+
+    @requests_mock.Mocker()
+    def test_enumerate_restarts_on_invalid_context(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': self.context[0]},
+             {'text': self.context[1]},
+             {'text': self.invalid_context, 'status_code': 400,
+              'reason': 'Bad Request'},
+             {'text': self.context[0]},
+             {'text': self.context[1]},
+             {'text': self.context[2]},
+             {'text': self.context[3]}])
+
+        resp_xml = self.client.enumerate('FooResource')
+
+        # The items received before the restart are not duplicated
+        self.assertEqual(4, self._count_items(resp_xml))
+        self.assertEqual(['Enumerate', 'Pull', 'Pull', 'Enumerate', 'Pull',
+                          'Pull', 'Pull'], self._actions(mock_requests))
+        self.assertEqual(0, self.pull_retry.retries)
+        self.assertEqual(1, self.pull_retry.restarts)
+        self.assertEqual(0, self.pull_retry.failures)
+
+    @requests_mock.Mocker()
+    def test_enumerate_with_restarts_exhausted(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': self.context[0]},
+             {'text': self.invalid_context, 'status_code': 400,
+              'reason': 'Bad Request'},
+             {'text': self.context[0]},
+             {'text': self.invalid_context, 'status_code': 400,
+              'reason': 'Bad Request'}])
+
+        self.assertRaises(exceptions.WSManEnumerationContextExpired,
+                          self.client.enumerate, 'FooResource')
+        self.assertEqual(1, self.pull_retry.restarts)
+        self.assertEqual(1, self.pull_retry.failures)
+
+    @requests_mock.Mocker()
+    def test_enumerate_restart_resets_items_digest(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': self.context[0]},
+             {'text': self.context[1]},
+             {'text': self.invalid_context, 'status_code': 400,
+              'reason': 'Bad Request'},
+             {'text': self.context[0]},
+             {'text': self.context[1]},
+             {'text': self.context[2]},
+             {'text': self.context[3]}])
+        items_digest = mock.Mock()
+
+        self.client._enumerate('FooResource', items_digest=items_digest)
+
+        items_digest.reset.assert_called_once_with()
+        self.assertEqual(6, items_digest.update.call_count)
+
+    @requests_mock.Mocker()
+    def test_enumerate_raw(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': self.context[0]},
+             {'text': self.context[1]},
+             {'text': self.invalid_context, 'status_code': 400,
+              'reason': 'Bad Request'},
+             {'text': self.context[0]},
+             {'text': self.context[1]},
+             {'text': self.context[2]},
+             {'text': self.context[3]}])
+
+        with mock.patch.object(
+                dracclient.wsman, 'parse_response',
+                wraps=dracclient.wsman.parse_response) as mock_parse_response:
+            contents = self.client._enumerate('FooResource', raw=True)
+
+        # Only the fault is parsed
+        self.assertEqual(
+            set([self.invalid_context.encode('utf-8')]),
+            set(args[0] for (args, _) in mock_parse_response.call_args_list))
+        self.assertEqual([context.encode('utf-8')
+                          for context in self.context], contents)
+        self.assertEqual(1, self.pull_retry.restarts)
+
+    @requests_mock.Mocker()
+    def test_enumerate_without_pull_retry(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': self.context[0]},
+             {'text': self.invalid_context, 'status_code': 400,
+              'reason': 'Bad Request'}])
+        client = dracclient.wsman.Client(**test_utils.FAKE_ENDPOINT)
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          client.enumerate, 'FooResource')
+        self.assertEqual(2, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    def test_iter_items_retries_pull(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': self.context[0]},
+             {'status_code': 503, 'reason': 'unavailable'},
+             {'text': self.context[1]},
+             {'text': self.context[2]},
+             {'text': self.context[3]}])
+
+        items = list(self.client.iter_items('FooResource'))
+
+        self.assertEqual(5, len(items))
+        self.assertEqual(1, self.pull_retry.retries)
+
+    @requests_mock.Mocker()
+    def test_iter_items_with_invalid_context(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': self.context[0]},
+             {'text': self.invalid_context, 'status_code': 400,
+              'reason': 'Bad Request'}])
+
+        self.assertRaises(exceptions.WSManEnumerationContextExpired,
+                          list, self.client.iter_items('FooResource'))
+        self.assertEqual(0, self.pull_retry.restarts)
+        self.assertEqual(1, self.pull_retry.failures)
+
+
+class AdaptiveBatchSizeTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(AdaptiveBatchSizeTestCase, self).setUp()
+        self.sizer = dracclient.batching.AdaptiveBatchSizer(
+            target_latency=60)
+        self.client = dracclient.wsman.Client(batch_sizer=self.sizer,
+                                              **test_utils.FAKE_ENDPOINT)
+        self.context = test_utils.WSManEnumerations['context']
+        self.system_view = test_utils.LifecycleControllerEnumerations[
+            uris.DCIM_SystemView]['ok']
+
+    def _max_elems(self, mock_requests):
+        # The first request reads the firmware version
+        return [int(lxml.etree.fromstring(request.body).findtext(
+                    './/{%s}MaxElements' % dracclient.wsman.NS_WSMAN))
+                for request in mock_requests.request_history[1:]]
+
+    def _responses(self, firmware_version='2.1.0'):
+        system_view = self.system_view.replace(
+            '>2.1.0<', '>%s<' % firmware_version)
+        return ([{'text': system_view}] +
+                [{'text': text} for text in self.context])
+
+    @requests_mock.Mocker()
+    def test_enumerate_grows_batches(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', self._responses())
+
+        self.client.enumerate('FooResource')
+
+        self.assertEqual([100, 200, 400, 800],
+                         self._max_elems(mock_requests))
+        self.assertEqual(1000, self.sizer.size('1.2.3.4', 'FooResource'))
+
+    @requests_mock.Mocker()
+    def test_enumerate_with_max_elems(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           [{'text': text} for text in self.context])
+
+        self.client.enumerate('FooResource', max_elems=42)
+
+        self.assertEqual([42] * 4, [
+            int(lxml.etree.fromstring(request.body).findtext(
+                './/{%s}MaxElements' % dracclient.wsman.NS_WSMAN))
+            for request in mock_requests.request_history])
+        self.assertIsNone(self.client.firmware_version)
+
+    @requests_mock.Mocker()
+    def test_enumerate_shrinks_batches_on_failure(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            self._responses()[:2] + [{'status_code': 500, 'reason': 'busy'}])
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          self.client.enumerate, 'FooResource')
+        self.assertEqual([100, 200], self._max_elems(mock_requests))
+        self.assertEqual(100, self.sizer.size('1.2.3.4', 'FooResource'))
+
+    @requests_mock.Mocker()
+    def test_iter_items_grows_batches(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', self._responses())
+
+        list(self.client.iter_items('FooResource'))
+
+        self.assertEqual([100, 200, 400, 800],
+                         self._max_elems(mock_requests))
+
+    @requests_mock.Mocker()
+    def test_without_batch_sizer(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           [{'text': text} for text in self.context])
+        client = dracclient.wsman.Client(**test_utils.FAKE_ENDPOINT)
+
+        client.enumerate('FooResource')
+
+        self.assertEqual(4, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    def test_reads_firmware_version_once(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           self._responses() + self._responses()[1:])
+
+        self.client.enumerate('FooResource')
+        self.client.enumerate('FooResource')
+
+        self.assertEqual('2.1.0', self.client.firmware_version)
+        self.assertEqual(9, mock_requests.call_count)
+        self.assertIn(uris.DCIM_SystemView,
+                      mock_requests.request_history[0].text)
+
+    @requests_mock.Mocker()
+    def test_firmware_version_unreadable(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'status_code': 500, 'reason': 'busy'}] +
+            self._responses()[1:])
+
+        self.client.enumerate('FooResource')
+
+        self.assertIsNone(self.client.firmware_version)
+        self.assertEqual([100, 200, 400, 800],
+                         self._max_elems(mock_requests))
+
+    @requests_mock.Mocker()
+    def test_sizes_learned_per_firmware_version(self, mock_requests):
+        hosts = [('1.2.3.4', '2.1.0'), ('5.6.7.8', '2.1.0'),
+                 ('9.10.11.12', '3.0.0')]
+        for (host, firmware_version) in hosts:
+            mock_requests.post('https://%s:443/wsman' % host,
+                               self._responses(firmware_version))
+
+        self.client.enumerate('FooResource')
+        clients = [dracclient.wsman.Client(host, 'admin', 's3cr3t',
+                                           batch_sizer=self.sizer)
+                   for (host, _) in hosts[1:]]
+        for client in clients:
+            client.enumerate('FooResource')
+
+        self.assertEqual(['2.1.0', '3.0.0'],
+                         [client.firmware_version for client in clients])
+        # The host running the same firmware starts from the size learned
+        # on the first one, the other one from the initial size.
+        self.assertEqual(
+            [1000, 100],
+            [int(lxml.etree.fromstring(
+                [request for request in mock_requests.request_history
+                 if request.hostname == host][1].body).findtext(
+                     './/{%s}MaxElements' % dracclient.wsman.NS_WSMAN))
+             for (host, _) in hosts[1:]])
+
+
+class ParseResponseTestCase(base.BaseTest):
+
+    def test_parse_response(self):
+        doc = dracclient.wsman.parse_response(
+            b'<a xmlns:n1="http://resource">\n  <n1:b> x </n1:b>\n</a>')
+
+        self.assertEqual(' x ', doc[0].text)
+        self.assertIsNone(doc.text)
+        self.assertIsNone(doc[0].tail)
+
+    def test_parse_response_does_not_resolve_entities(self):
+        doc = dracclient.wsman.parse_response(
+            b'<!DOCTYPE a [<!ENTITY e SYSTEM "file:///etc/passwd">]>'
+            b'<a>&e;</a>')
+
+        self.assertIsNone(doc.text)
+
+    def test_parse_enumeration(self):
+        contents = [test_utils.WSManEnumerations['context'][index].encode(
+            'utf-8') for index in range(4)]
+
+        doc = dracclient.wsman.parse_enumeration(contents)
+
+        items = doc.find('.//{%s}Items' % dracclient.wsman.NS_WSMAN)
+        self.assertEqual(['1', '2', '3', '4', '5'],
+                         [item[0].text for item in items])
+        self.assertIsNone(doc.find('.//{%s}EnumerationContext'
+                                   % dracclient.wsman.NS_WSMAN_ENUM))
+
+    def test_scan_enum_context(self):
+        contents = test_utils.WSManEnumerations['context']
+
+        self.assertEqual(
+            ['enum-context-uuid', 'enum-context-uuid', 'enum-context-uuid',
+             None],
+            [dracclient.wsman._scan_enum_context(content.encode('utf-8'))
+             for content in contents])
+
+    def test_scan_enum_context_skips_items(self):
+        content = (b'<s:Body><wsen:PullResponse>'
+                   b'<wsen:Items><n1:Foo><n1:EnumerationContext>item'
+                   b'</n1:EnumerationContext></n1:Foo></wsen:Items>'
+                   b'<wsen:EnumerationContext>a&amp;b'
+                   b'</wsen:EnumerationContext>'
+                   b'</wsen:PullResponse></s:Body>')
+
+        self.assertEqual('a&b',
+                         dracclient.wsman._scan_enum_context(content))
+        self.assertIsNone(dracclient.wsman._scan_enum_context(
+            b'<wsen:Items><n1:EnumerationContext>item'
+            b'</n1:EnumerationContext></wsen:Items>'
+            b'<wsen:EnumerationContext/>'))
+
+    def test_parser_per_thread(self):
+        parsers = []
+        thread = threading.Thread(
+            target=lambda: parsers.append(dracclient.wsman._parser()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(dracclient.wsman._parser(), dracclient.wsman._parser())
+        self.assertIsNot(dracclient.wsman._parser(), parsers[0])
+
 
 class PayloadTestCase(base.BaseTest):
 
@@ -268,6 +958,27 @@ class PayloadTestCase(base.BaseTest):
         self.assertEqual(lxml.etree.tostring(expected_payload_obj),
                          lxml.etree.tostring(payload_obj))
 
+    def test_build_enum_with_enumeration_mode(self):
+        payload = dracclient.wsman._EnumeratePayload(
+            'http://host:443/wsman', 'http://resource_uri',
+            filter_query='DROP TABLE users', filter_dialect='cql',
+            enumeration_mode=dracclient.wsman.ENUMERATION_MODE_EPR).build()
+        payload_xml = lxml.etree.fromstring(payload)
+
+        enum_elem = payload_xml.find(
+            './/{%s}Enumerate' % dracclient.wsman.NS_WSMAN_ENUM)
+        self.assertEqual(
+            ['Filter', 'EnumerationMode', 'OptimizeEnumeration',
+             'MaxElements'],
+            [lxml.etree.QName(elem).localname for elem in enum_elem])
+        self.assertEqual('EnumerateEPR', enum_elem[1].text)
+
+    def test_build_enum_with_invalid_enumeration_mode(self):
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          dracclient.wsman._EnumeratePayload,
+                          'http://host:443/wsman', 'http://resource_uri',
+                          enumeration_mode='EnumerateEverything')
+
     def test_build_enum_with_invalid_filter_dialect(self):
         invalid_dialect = 'foo'
         self.assertRaises(exceptions.WSManInvalidFilterDialect,
@@ -383,3 +1094,54 @@ class PayloadTestCase(base.BaseTest):
 
         self.assertEqual(lxml.etree.tostring(expected_payload_obj),
                          lxml.etree.tostring(payload_obj))
+
+    @mock.patch.object(uuid, 'uuid4', autospec=True)
+    def test_build_get(self, mock_uuid):
+        expected_payload = """<?xml version="1.0" ?>
+<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope"
+            xmlns:wsa="http://schemas.xmlsoap.org/ws/2004/08/addressing"
+            xmlns:wsman="http://schemas.dmtf.org/wbem/wsman/1/wsman.xsd">
+    <s:Header>
+        <wsa:To s:mustUnderstand="true">http://host:443/wsman</wsa:To>
+        <wsman:ResourceURI s:mustUnderstand="true">http://resource_uri</wsman:ResourceURI>
+        <wsa:MessageID s:mustUnderstand="true">uuid:1234-12</wsa:MessageID>
+        <wsa:ReplyTo>
+            <wsa:Address>http://schemas.xmlsoap.org/ws/2004/08/addressing/role/anonymous</wsa:Address>
+        </wsa:ReplyTo>
+        <wsa:Action s:mustUnderstand="true">http://schemas.xmlsoap.org/ws/2004/09/transfer/Get</wsa:Action>
+        <wsman:SelectorSet>
+            <wsman:Selector Name="InstanceID">JID_42</wsman:Selector>
+        </wsman:SelectorSet>
+    </s:Header>
+    <s:Body/>
+</s:Envelope>
+"""  # noqa
+        expected_payload_obj = lxml.objectify.fromstring(expected_payload)
+
+        mock_uuid.return_value = '1234-12'
+        payload = dracclient.wsman._GetPayload(
+            'http://host:443/wsman', 'http://resource_uri',
+            {'InstanceID': 'JID_42'}).build()
+        payload_obj = lxml.objectify.fromstring(payload)
+
+        self.assertEqual(lxml.etree.tostring(expected_payload_obj),
+                         lxml.etree.tostring(payload_obj))
+
+    def test_build_identify(self):
+        expected_payload = """<?xml version="1.0" ?>
+<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope"
+            xmlns:wsa="http://schemas.xmlsoap.org/ws/2004/08/addressing"
+            xmlns:wsman="http://schemas.dmtf.org/wbem/wsman/1/wsman.xsd">
+    <s:Header/>
+    <s:Body>
+        <wsmid:Identify xmlns:wsmid="http://schemas.dmtf.org/wbem/wsman/identity/1/wsmanidentity.xsd"/>
+    </s:Body>
+</s:Envelope>
+"""  # noqa
+        expected_payload_obj = lxml.objectify.fromstring(expected_payload)
+
+        payload = dracclient.wsman._IdentifyPayload().build()
+        payload_obj = lxml.objectify.fromstring(payload)
+
+        self.assertEqual(lxml.etree.tostring(expected_payload_obj),
+                         lxml.etree.tostring(payload_obj))
@@ -40,7 +40,20 @@ WSManEnumerations = {
         load_wsman_xml('wsman-enum_context-2'),
         load_wsman_xml('wsman-enum_context-3'),
         load_wsman_xml('wsman-enum_context-4'),
-    ]
+    ],
+    'epr': [
+        load_wsman_xml('wsman-enum_epr-1'),
+        load_wsman_xml('wsman-enum_epr-2'),
+    ],
+    'object_and_epr': load_wsman_xml('wsman-enum_object_and_epr'),
+}
+
+WSManPulls = {
+    'invalid_context': load_wsman_xml('wsman-pull-invalid_context'),
+}
+
+WSManIdentify = {
+    'ok': load_wsman_xml('wsman-identify-ok'),
 }
 
 BIOSEnumerations = {
@@ -118,6 +131,13 @@ JobEnumerations = {
     },
 }
 
+JobGets = {
+    uris.DCIM_LifecycleJob: {
+        'ok': load_wsman_xml('lifecycle_job-get-ok'),
+        'not_found': load_wsman_xml('lifecycle_job-get-not_found'),
+    },
+}
+
 JobInvocations = {
     uris.DCIM_BIOSService: {
         'CreateTargetedConfigJob': {
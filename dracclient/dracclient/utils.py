@@ -16,14 +16,18 @@ Common functionalities shared between different DRAC modules.
 """
 
 from dracclient import constants
+import functools
 import logging
+import threading
 
+from dracclient import cache
 from dracclient import exceptions
 from dracclient import wsman
 
 LOG = logging.getLogger(__name__)
 
 NS_XMLSchema_Instance = 'http://www.w3.org/2001/XMLSchema-instance'
+_XSI_NIL = '{%s}nil' % NS_XMLSchema_Instance
 
 # ReturnValue constants
 RET_SUCCESS = '0'
@@ -37,9 +41,86 @@ REBOOT_REQUIRED = {
 }
 
 
+# Names of the elements looked up in Clark notation, e.g. '{namespace}item',
+# per namespace and element name
+_QNAMES = {}
+
+
+def qname(namespace, item):
+    """Returns the name of an element in Clark notation.
+
+    :param namespace: the namespace of the element.
+    :param item: the element name.
+    :returns: the '{namespace}item' string, built once per element name.
+    """
+    try:
+        return _QNAMES[namespace][item]
+    except KeyError:
+        name = '{%s}%s' % (namespace, item)
+        _QNAMES.setdefault(namespace, {})[item] = name
+        return name
+
+
+class InternTable(object):
+    """Bounded table of the strings shared between parsed objects
+
+    The objects parsed from the responses of different nodes repeat the same
+    FQDDs, attribute names and statuses. Interning them makes every object
+    refer to a single copy of each string rather than to the copy created by
+    lxml for its response. The table is emptied once it holds max_size
+    strings, so that rare strings do not pile up.
+    """
+
+    def __init__(self, max_size=constants.DEFAULT_INTERN_TABLE_SIZE):
+        """Creates InternTable object
+
+        :param max_size: maximum number of strings held
+        """
+        self.max_size = max_size
+        self._strings = {}
+
+    def __len__(self):
+        return len(self._strings)
+
+    def intern(self, value):
+        """Returns the copy of a string held by the table
+
+        :param value: a string, or None
+        :returns: the string held by the table equal to value, which is
+                  added to the table if it holds none
+        """
+        if value is None:
+            return None
+
+        # Single dictionary operations are atomic, threads parsing at the
+        # same time need no lock.
+        interned = self._strings.get(value)
+        if interned is None:
+            if len(self._strings) >= self.max_size:
+                self._strings.clear()
+            interned = self._strings.setdefault(value, value)
+        return interned
+
+    def clear(self):
+        self._strings.clear()
+
+
+# Intern table shared by the parsers
+INTERN_TABLE = InternTable()
+
+
+def intern_string(value):
+    """Interns a string of a parsed object in INTERN_TABLE"""
+
+    return INTERN_TABLE.intern(value)
+
+
 def find_xml(doc, item, namespace, find_all=False):
     """Find the first or all elements in an ElementTree object.
 
+    Descendants are matched on their name directly, which spares the
+    formatting and compiling of an ElementPath query on every lookup.
+
     :param doc: the element tree object.
     :param item: the element name.
     :param namespace: the namespace of the element.
@@ -51,11 +132,10 @@ def find_xml(doc, item, namespace, find_all=False):
               elements were found.
 
     """
-    query = ('.//{%(namespace)s}%(item)s' % {'namespace': namespace,
-                                             'item': item})
+    descendants = doc.iterdescendants(qname(namespace, item))
     if find_all:
-        return doc.findall(query)
-    return doc.find(query)
+        return list(descendants)
+    return next(descendants, None)
 
 
 def _is_attr_non_nil(elem):
@@ -64,11 +144,11 @@ def _is_attr_non_nil(elem):
     :param elem: the element object.
     :returns: whether the element is nil.
     """
-    return elem.attrib.get('{%s}nil' % NS_XMLSchema_Instance) != 'true'
+    return elem.get(_XSI_NIL) != 'true'
 
 
 def get_wsman_resource_attr(doc, resource_uri, attr_name, nullable=False,
-                            allow_missing=False):
+                            allow_missing=False, interned=False):
     """Find an attribute of a resource in an ElementTree object.
 
     :param doc: the element tree object.
@@ -80,6 +160,8 @@ def get_wsman_resource_attr(doc, resource_uri, attr_name, nullable=False,
     :param allow_missing: if set to True, attributes missing from the XML
                           document will return None instead of raising
                           DRACMissingResponseField.
+    :param interned: if set to True, the value is interned in INTERN_TABLE.
+                     Use it for values repeated across objects and nodes.
     :raises: DRACMissingResponseField if the attribute is missing from the XML
              doc and allow_missing is False.
     :raises: DRACEmptyResponseField if the attribute is present in the XML doc
@@ -97,10 +179,15 @@ def get_wsman_resource_attr(doc, resource_uri, attr_name, nullable=False,
     if not nullable:
         if item.text is None:
             raise exceptions.DRACEmptyResponseField(attr=attr_name)
-        return item.text.strip()
+        value = item.text.strip()
+    elif _is_attr_non_nil(item):
+        value = item.text.strip()
     else:
-        if _is_attr_non_nil(item):
-            return item.text.strip()
+        return
+
+    if interned:
+        return INTERN_TABLE.intern(value)
+    return value
 
 
 def get_all_wsman_resource_attrs(doc, resource_uri, attr_name, nullable=False):
@@ -250,8 +337,97 @@ def validate_integer_value(value, attr_name, error_msgs):
         error_msgs.append("'%s' is not an integer value" % attr_name)
 
 
+# Lock held while lazy attributes are parsed. Parsing holds the GIL anyway,
+# so a single lock costs little parallelism, and no memory per attribute.
+_MATERIALIZE_LOCK = threading.Lock()
+
+
+class _LazyAttribute(object):
+    """Settings attribute parsed from its item element on first access
+
+    Mixed into the attribute classes by _lazy_class(). The fields listed in
+    the _key_fields of the attribute class, which identify the attribute,
+    are parsed on their own. Reading any other field parses the whole
+    attribute, after which the item element is released.
+    """
+
+    @classmethod
+    def from_item(cls, item):
+        attribute = cls.__new__(cls)
+        attribute._item = item
+        return attribute
+
+    def __getattr__(self, name):
+        # Only called for the fields which were not parsed yet
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        item = self.__dict__.get('_item')
+        if item is not None:
+            elem_name = self._key_fields.get(name)
+            if elem_name is not None:
+                value = get_wsman_resource_attr(item, self.namespace,
+                                                elem_name)
+                self.__dict__[name] = value
+                return value
+
+            self._materialize()
+
+        # The attribute may have been parsed by another thread since the
+        # field was looked up
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __eq__(self, other):
+        self._materialize()
+        if isinstance(other, _LazyAttribute):
+            other._materialize()
+        return self.__dict__ == other.__dict__
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __reduce_ex__(self, protocol):
+        # Pickled and copied as an instance of the attribute class, the
+        # item element cannot be pickled.
+        self._materialize()
+        return (_restore_attribute, (self._attr_cls, dict(self.__dict__)))
+
+    def _materialize(self):
+        # Parsing is serialized, so that an attribute read by several threads
+        # is parsed once and its item element is not read after it was
+        # released. The fields are all set before the item is released.
+        with _MATERIALIZE_LOCK:
+            item = self.__dict__.get('_item')
+            if item is not None:
+                self.__dict__.update(self._attr_cls.parse(item).__dict__)
+                del self.__dict__['_item']
+
+
+def _restore_attribute(attr_cls, fields):
+    attribute = attr_cls.__new__(attr_cls)
+    attribute.__dict__.update(fields)
+    return attribute
+
+
+# Lazy subclasses of the attribute classes, per attribute class
+_LAZY_CLASSES = {}
+
+
+def _lazy_class(attr_cls):
+    try:
+        return _LAZY_CLASSES[attr_cls]
+    except KeyError:
+        lazy_cls = type('Lazy' + attr_cls.__name__,
+                        (_LazyAttribute, attr_cls),
+                        {'_attr_cls': attr_cls})
+        return _LAZY_CLASSES.setdefault(attr_cls, lazy_cls)
+
+
 def list_settings(client, namespaces, by_name=True, fqdd_filter=None,
-                  name_formatter=None):
+                  name_formatter=None, lazy=False):
     """List the configuration settings
 
     :param client: an instance of WSManClient.
@@ -263,6 +439,11 @@ def list_settings(client, namespaces, by_name=True, fqdd_filter=None,
     :param name_formatter: a method used to format the keys in the
                            returned dictionary.  By default,
                            attribute.name will be used.
+    :param lazy: whether the attributes are parsed on first access rather
+                 than up front. Lazy attributes are instances of the
+                 attribute classes holding on to the response until they
+                 are fully parsed. The errors about missing or empty fields
+                 are raised when the fields are read.
     :returns: a dictionary with the settings using name or instance_id as
               the key.
     :raises: WSManRequestFailure on request failures
@@ -271,27 +452,44 @@ def list_settings(client, namespaces, by_name=True, fqdd_filter=None,
              interface
     """
 
-    result = {}
+    result = cache.ParsedDict(changed=False)
     for (namespace, attr_cls) in namespaces:
         attribs = _get_config(client, namespace, attr_cls, by_name,
-                              fqdd_filter, name_formatter)
+                              fqdd_filter, name_formatter, lazy)
         if not set(result).isdisjoint(set(attribs)):
             raise exceptions.DRACOperationFailed(
                 drac_messages=('Colliding attributes %r' % (
                     set(result) & set(attribs))))
         result.update(attribs)
+        result.changed = result.changed or attribs.changed
     return result
 
 
 def _get_config(client, resource, attr_cls, by_name, fqdd_filter,
-                name_formatter):
+                name_formatter, lazy=False):
+    # Lazy attributes refer to the response, they are parsed in process and
+    # neither cached nor shared, which would keep the whole response alive.
+    return client.enumerate_parsed(
+        resource,
+        functools.partial(_parse_config, attr_cls=attr_cls, by_name=by_name,
+                          fqdd_filter=fqdd_filter,
+                          name_formatter=name_formatter, lazy=lazy),
+        cache_key=(attr_cls, by_name, fqdd_filter, name_formatter),
+        offload=not lazy, shared=not lazy)
+
+
+def _parse_config(doc, attr_cls, by_name, fqdd_filter, name_formatter,
+                  lazy=False):
     result = {}
 
-    doc = client.enumerate(resource)
     items = doc.find('.//{%s}Items' % wsman.NS_WSMAN)
+    if lazy:
+        parse = _lazy_class(attr_cls).from_item
+    else:
+        parse = attr_cls.parse
 
     for item in items:
-        attribute = attr_cls.parse(item)
+        attribute = parse(item)
         if by_name:
             # Filter out all instances without a matching FQDD
             if fqdd_filter is None or fqdd_filter == attribute.fqdd:
@@ -360,8 +558,9 @@ def set_settings(settings_type,
     :raises: InvalidParameterValue on invalid new setting
     """
 
+    # Only the attributes being set are read, parse them on access
     current_settings = list_settings(client, namespaces, by_name=True,
-                                     name_formatter=name_formatter)
+                                     name_formatter=name_formatter, lazy=True)
 
     unknown_keys = set(new_settings) - set(current_settings)
     if unknown_keys:
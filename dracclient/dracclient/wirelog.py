@@ -0,0 +1,155 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Trace of the WS-Man requests and responses exchanged with DRAC interfaces.
+
+The bodies are logged at debug level by the LOGGER_NAME logger, shared by
+all hosts. The trace is enabled for all hosts, or restricted to some with
+set_traced_hosts(). Nothing is formatted unless the logger is enabled for
+debug messages and the host is traced.
+"""
+
+import logging
+import re
+
+from lxml import etree as ElementTree
+
+LOGGER_NAME = 'dracclient.wire'
+
+# Bodies are truncated to this number of bytes, None to log them whole
+DEFAULT_MAX_BYTES = 4096
+
+# Attributes whose values are replaced by REDACTED
+SENSITIVE_ATTRIBUTE_RE = re.compile(
+    r'password|passphrase|secret|community|privatekey', re.IGNORECASE)
+REDACTED = '******'
+
+# Elements holding the value of the attribute named by AttributeName
+_VALUE_NAMES = ('AttributeValue', 'CurrentValue', 'PendingValue')
+
+# Hosts traced, None for all of them
+_traced_hosts = None
+
+
+def set_traced_hosts(hosts):
+    """Restricts the trace to some hosts
+
+    :param hosts: an iterable of the hostnames or IPs of the DRAC interfaces
+                  traced, as passed to the clients, or None to trace all
+                  hosts
+    """
+    global _traced_hosts
+    _traced_hosts = None if hosts is None else frozenset(hosts)
+
+
+def _local_name(elem):
+    return ElementTree.QName(elem).localname
+
+
+def redact(content):
+    """Masks the values of sensitive attributes in a WS-Man message
+
+    Invoke requests pair the n-th AttributeName with the n-th
+    AttributeValue. Enumerated attributes have a single AttributeName along
+    with their current and pending values.
+
+    :param content: the raw content of a request or a response
+    :returns: the content, with the values of the attributes whose name
+              matches SENSITIVE_ATTRIBUTE_RE replaced by REDACTED
+    """
+    parser = ElementTree.XMLParser(resolve_entities=False, no_network=True)
+    try:
+        doc = ElementTree.fromstring(content, parser=parser)
+    except ElementTree.XMLSyntaxError:
+        return content
+
+    parents = set(name_elem.getparent()
+                  for name_elem in doc.iter('{*}AttributeName'))
+    redacted = False
+    for parent in parents:
+        names = [elem for elem in parent
+                 if _local_name(elem) == 'AttributeName']
+        for value_name in _VALUE_NAMES:
+            values = [elem for elem in parent
+                      if _local_name(elem) == value_name]
+            if len(names) == 1:
+                pairs = [(names[0], value) for value in values]
+            else:
+                pairs = zip(names, values)
+
+            for (name, value) in pairs:
+                if (name.text and value.text and
+                        SENSITIVE_ATTRIBUTE_RE.search(name.text)):
+                    value.text = REDACTED
+                    redacted = True
+
+    if not redacted:
+        return content
+
+    return ElementTree.tostring(doc)
+
+
+def truncate(content, max_bytes):
+    """Shortens a message to at most max_bytes, noting what was left out"""
+
+    if max_bytes is None or len(content) <= max_bytes:
+        return content
+
+    return content[:max_bytes] + (
+        b'... (%d bytes truncated)' % (len(content) - max_bytes))
+
+
+class WireLog(object):
+    """Logs the messages exchanged with one DRAC interface"""
+
+    def __init__(self, host, max_bytes=DEFAULT_MAX_BYTES, redact=True):
+        """Creates WireLog object
+
+        :param host: hostname or IP of the DRAC interface
+        :param max_bytes: number of bytes of every message logged, or None
+                          to log messages whole
+        :param redact: whether the values of sensitive attributes are masked
+        """
+        self.host = host
+        self.logger = logging.getLogger(LOGGER_NAME)
+        self.max_bytes = max_bytes
+        self.redact = redact
+
+    def enabled(self):
+        traced_hosts = _traced_hosts
+        return ((traced_hosts is None or self.host in traced_hosts) and
+                self.logger.isEnabledFor(logging.DEBUG))
+
+    def request(self, endpoint, payload):
+        """Logs a request sent to an endpoint"""
+
+        if self.enabled():
+            self.logger.debug('Sending request to %(endpoint)s: %(payload)s',
+                              {'endpoint': endpoint,
+                               'payload': self._format(payload)})
+
+    def response(self, endpoint, status_code, content):
+        """Logs a response received from an endpoint"""
+
+        if self.enabled():
+            self.logger.debug('Received response from %(endpoint)s with '
+                              'status %(status_code)s: %(payload)s',
+                              {'endpoint': endpoint,
+                               'status_code': status_code,
+                               'payload': self._format(content)})
+
+    def _format(self, content):
+        if self.redact:
+            content = redact(content)
+        return truncate(content, self.max_bytes)
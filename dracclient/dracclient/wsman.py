@@ -12,14 +12,21 @@
 #    under the License.
 
 import logging
+import re
+import threading
 import time
 import uuid
+from xml.sax import saxutils
 
 from lxml import etree as ElementTree
 import requests.exceptions
 
 from dracclient import constants
+from dracclient import deadline
 from dracclient import exceptions
+from dracclient.resources import uris
+from dracclient import retry
+from dracclient import wirelog
 
 LOG = logging.getLogger(__name__)
 
@@ -29,11 +36,53 @@ NS_WS_ADDR_ANONYM_ROLE = ('http://schemas.xmlsoap.org/ws/2004/08/addressing/'
                           'role/anonymous')
 NS_WSMAN = 'http://schemas.dmtf.org/wbem/wsman/1/wsman.xsd'
 NS_WSMAN_ENUM = 'http://schemas.xmlsoap.org/ws/2004/09/enumeration'
+NS_WS_TRANSFER = 'http://schemas.xmlsoap.org/ws/2004/09/transfer'
+NS_WSMAN_IDENTITY = ('http://schemas.dmtf.org/wbem/wsman/identity/1/'
+                     'wsmanidentity.xsd')
 
 NS_MAP = {'s': NS_SOAP_ENV,
           'wsa': NS_WS_ADDR,
           'wsman': NS_WSMAN}
 
+# Fault subcodes returned when no instance matches the selectors of a request
+INSTANCE_NOT_FOUND_FAULTS = ('DestinationUnreachable', 'InvalidSelectors')
+
+# Fault subcodes returned when pulling an enumeration context which expired
+# or was released
+INVALID_CONTEXT_FAULTS = ('InvalidEnumerationContext',)
+
+# Enumeration modes, returning endpoint references instead of, or along
+# with, the instances
+ENUMERATION_MODE_EPR = 'EnumerateEPR'
+ENUMERATION_MODE_OBJECT_AND_EPR = 'EnumerateObjectAndEPR'
+ENUMERATION_MODES = (ENUMERATION_MODE_EPR, ENUMERATION_MODE_OBJECT_AND_EPR)
+
+# Options of the parsers of responses. Whitespace between elements is
+# dropped, entities are not resolved, nothing is fetched over the network and
+# no table of xml:id attributes is built. The default limits of libxml2 on
+# the depth and size of documents are kept.
+PARSER_OPTIONS = {'remove_blank_text': True,
+                  'resolve_entities': False,
+                  'no_network': True,
+                  'collect_ids': False,
+                  'huge_tree': False}
+
+# Matches the Items element of an Enumerate or Pull response in its raw
+# content. Everything else, e.g. the MessageID and RelatesTo headers or the
+# enumeration context, changes with every response.
+ITEMS_RE = re.compile(
+    br'<(?:[\w.-]+:)?Items(?:\s[^>]*)?(?:/>|>.*?</(?:[\w.-]+:)?Items\s*>)',
+    re.DOTALL)
+
+# Matches the enumeration context of a response in its raw content, empty
+# when the enumeration is complete
+_ENUM_CONTEXT_RE = re.compile(
+    br'<(?:[\w.-]+:)?EnumerationContext(?:\s[^>]*)?'
+    br'(?:/>|>([^<]*)</(?:[\w.-]+:)?EnumerationContext\s*>)')
+
+# Number of bytes of a streamed response fed to the parser at once
+STREAM_CHUNK_SIZE = 64 * 1024
+
 FILTER_DIALECT_MAP = {'cql': 'http://schemas.dmtf.org/wbem/cql/1/dsp0202.pdf',
                       'wql': 'http://schemas.microsoft.com/wbem/wsman/1/WQL'}
 
@@ -45,7 +94,12 @@ class Client(object):
                  protocol='https',
                  ssl_retries=constants.DEFAULT_WSMAN_SSL_ERROR_RETRIES,
                  ssl_retry_delay=(
-                     constants.DEFAULT_WSMAN_SSL_ERROR_RETRY_DELAY_SEC)):
+                     constants.DEFAULT_WSMAN_SSL_ERROR_RETRY_DELAY_SEC),
+                 retry_policy=None,
+                 connect_timeout=constants.DEFAULT_WSMAN_CONNECT_TIMEOUT_SEC,
+                 read_timeout=constants.DEFAULT_WSMAN_READ_TIMEOUT_SEC,
+                 rate_limiter=None, session=None, pull_retry=None,
+                 batch_sizer=None):
         """Creates client object
 
         :param host: hostname or IP of the DRAC interface
@@ -57,6 +111,27 @@ class Client(object):
         :param ssl_retries: number of resends to attempt on SSL failures
         :param ssl_retry_delay: number of seconds to wait between
                                 retries on SSL failures
+        :param retry_policy: a dracclient.retry.RetryPolicy used to retry
+                             requests on connection and SSL failures. If
+                             None, ssl_retries attempts are made with a fixed
+                             delay of ssl_retry_delay seconds.
+        :param connect_timeout: number of seconds to wait for a connection
+                                to the DRAC interface, or None to wait
+                                indefinitely
+        :param read_timeout: number of seconds to wait for data from the
+                             DRAC interface, or None to wait indefinitely
+        :param rate_limiter: a dracclient.ratelimit.RateLimiter shared with
+                             other clients, or None
+        :param session: a requests.Session keeping connections to the DRAC
+                        interface open between requests, or None to open a
+                        connection for every request
+        :param pull_retry: a dracclient.retry.PullRetry used to retry the
+                           Pull requests of enumerations which failed, or
+                           None to fail the whole enumeration
+        :param batch_sizer: a dracclient.batching.AdaptiveBatchSizer picking
+                            the number of items requested by enumerations
+                            without an explicit max_elems, or None to
+                            request DEFAULT_WSMAN_MAX_ELEMS items
         """
 
         self.host = host
@@ -67,40 +142,90 @@ class Client(object):
         self.protocol = protocol
         self.ssl_retries = ssl_retries
         self.ssl_retry_delay = ssl_retry_delay
+        if retry_policy is None:
+            retry_policy = retry.FixedDelay(ssl_retries, ssl_retry_delay)
+        self.retry_policy = retry_policy
+        self.timeout = (connect_timeout, read_timeout)
+        self.rate_limiter = rate_limiter
+        self.session = session
+        self.pull_retry = pull_retry
+        self.batch_sizer = batch_sizer
+        # Version of the iDRAC firmware, read once by the first enumeration
+        # sized by the batch sizer
+        self.firmware_version = None
+        self._firmware_version_read = False
+        self.wire_log = wirelog.WireLog(host)
         self.endpoint = ('%(protocol)s://%(host)s:%(port)s%(path)s' % {
             'protocol': self.protocol,
             'host': self.host,
             'port': self.port,
             'path': self.path})
 
-    def _do_request(self, payload):
+    def _do_request(self, payload, accept_faults=False, authenticate=True,
+                    retry_policy=None, stream=False):
+        # With accept_faults, responses carrying a SOAP fault are returned
+        # to the caller instead of raising WSManInvalidResponse. With stream,
+        # the body of successful responses is left unread.
+        max_elems = payload.batch_size()
+        if self.batch_sizer is None or max_elems is None:
+            return self._request(payload, accept_faults, authenticate,
+                                 retry_policy, stream)
+
+        # The batch sizer learns from every Enumerate and Pull request
+        started = time.time()
+        try:
+            resp = self._request(payload, accept_faults, authenticate,
+                                 retry_policy, stream)
+        except exceptions.DRACDeadlineExceeded:
+            raise
+        except (exceptions.WSManRequestFailure,
+                exceptions.WSManInvalidResponse):
+            self.batch_sizer.record_failure(self.host, payload.resource_uri,
+                                            self.firmware_version, max_elems)
+            raise
+
+        if not resp.ok:
+            self.batch_sizer.record_failure(self.host, payload.resource_uri,
+                                            self.firmware_version, max_elems)
+        else:
+            content_length = resp.headers.get('Content-Length')
+            if not stream:
+                content_length = len(resp.content)
+            elif content_length is not None:
+                content_length = int(content_length)
+            self.batch_sizer.record_response(
+                self.host, payload.resource_uri, self.firmware_version,
+                max_elems, time.time() - started, content_length)
+
+        return resp
+
+    def _request(self, payload, accept_faults, authenticate, retry_policy,
+                 stream):
         payload = payload.build()
-        LOG.debug('Sending request to %(endpoint)s: %(payload)s',
-                  {'endpoint': self.endpoint, 'payload': payload})
+        self.wire_log.request(self.endpoint, payload)
 
-        num_tries = 1
-        while num_tries <= self.ssl_retries:
+        if retry_policy is None:
+            retry_policy = self.retry_policy
+        retry_state = retry_policy.begin()
+        while True:
+            deadline.check()
             try:
-                resp = requests.post(
-                    self.endpoint,
-                    auth=requests.auth.HTTPBasicAuth(self.username,
-                                                     self.password),
-                    data=payload,
-                    # TODO(ifarkas): enable cert verification
-                    verify=False)
+                resp = self._post(payload, authenticate, stream)
                 break
             except (requests.exceptions.ConnectionError,
                     requests.exceptions.SSLError) as ex:
+                deadline.check()
 
                 error_msg = "A {error_type} error occurred while " \
                     " communicating with {host}, attempt {num_tries} of " \
                     "{retries}".format(
                         error_type=type(ex).__name__,
                         host=self.host,
-                        num_tries=num_tries,
-                        retries=self.ssl_retries)
+                        num_tries=retry_state.attempt,
+                        retries=retry_policy.max_attempts)
 
-                if num_tries == self.ssl_retries:
+                delay = retry_state.next_delay()
+                if delay is None:
                     LOG.error(error_msg)
                     raise exceptions.WSManRequestFailure(
                         "A {error_type} error occurred while communicating "
@@ -111,11 +236,11 @@ class Client(object):
                 else:
                     LOG.warning(error_msg)
 
-                num_tries += 1
-                if self.ssl_retry_delay > 0 and num_tries <= self.ssl_retries:
-                    time.sleep(self.ssl_retry_delay)
+                if delay > 0:
+                    time.sleep(delay)
 
             except requests.exceptions.RequestException as ex:
+                deadline.check()
                 error_msg = "A {error_type} error occurred while " \
                     "communicating with {host}: {error}".format(
                         error_type=type(ex).__name__,
@@ -124,40 +249,242 @@ class Client(object):
                 LOG.error(error_msg)
                 raise exceptions.WSManRequestFailure(error_msg)
 
-        LOG.debug('Received response from %(endpoint)s: %(payload)s',
-                  {'endpoint': self.endpoint, 'payload': resp.content})
-        if not resp.ok:
+        if stream and resp.ok:
+            self.wire_log.response(self.endpoint, resp.status_code,
+                                   b'(streamed)')
+            return resp
+
+        self.wire_log.response(self.endpoint, resp.status_code, resp.content)
+        if not resp.ok and not (accept_faults and
+                                _fault_subcode(resp) is not None):
             raise exceptions.WSManInvalidResponse(
                 status_code=resp.status_code,
                 reason=resp.reason)
         else:
             return resp
 
-    def enumerate(self, resource_uri, optimization=True, max_elems=100,
-                  auto_pull=True, filter_query=None, filter_dialect='cql'):
+    def _post(self, payload, authenticate=True, stream=False):
+        if self.rate_limiter is None:
+            return self._send(payload, authenticate, stream)
+
+        self.rate_limiter.acquire(self.endpoint)
+        permit = _Permit(self.rate_limiter, self.endpoint)
+        try:
+            resp = self._send(payload, authenticate, stream)
+        except Exception as ex:
+            permit.release(ex)
+            raise
+
+        permit.latency = time.time() - permit.started
+        if stream and resp.ok:
+            # The body is still being sent, the permit is released by the
+            # _ItemStream reading it.
+            resp.permit = permit
+        elif resp.status_code >= 500:
+            # Client errors, such as faults on unknown selectors, are no
+            # sign of an overloaded DRAC interface.
+            permit.release(exceptions.WSManInvalidResponse(
+                status_code=resp.status_code, reason=resp.reason))
+        else:
+            permit.release()
+        return resp
+
+    def _send(self, payload, authenticate=True, stream=False):
+        auth = None
+        if authenticate:
+            auth = requests.auth.HTTPBasicAuth(self.username, self.password)
+        sender = requests if self.session is None else self.session
+        return sender.post(
+            self.endpoint,
+            auth=auth,
+            data=payload,
+            timeout=deadline.clamp_timeout(self.timeout),
+            stream=stream,
+            # TODO(ifarkas): enable cert verification
+            verify=False)
+
+    def close(self):
+        """Closes the connections kept open by the session, if any."""
+
+        if self.session is not None:
+            self.session.close()
+
+    def enumerate(self, resource_uri, optimization=True, max_elems=None,
+                  auto_pull=True, filter_query=None, filter_dialect='cql',
+                  enumeration_mode=None):
         """Executes enumerate operation over WSMan.
 
         :param resource_uri: URI of resource to enumerate.
         :param optimization: flag to enable enumeration optimization. If
                              disabled, the enumeration returns only an
                              enumeration context.
-        :param max_elems: maximum number of elements returned by the operation.
+        :param max_elems: maximum number of elements returned by each
+                          operation, or None to let the batch sizer of the
+                          client pick it for every operation.
         :param auto_pull: flag to enable automatic pull on the enumeration
                           context, merging the items returned.
         :param filter_query: filter query string.
         :param filter_dialect: filter dialect. Valid options are: 'cql' and
                                'wql'.
+        :param enumeration_mode: one of ENUMERATION_MODES to receive endpoint
+                                 references of the instances, or None to
+                                 receive the instances only.
         :returns: an lxml.etree.Element object of the response received.
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
+        :raises: InvalidParameterValue on invalid enumeration mode
+        """
+
+        return self._enumerate(resource_uri, optimization, max_elems,
+                               auto_pull, filter_query, filter_dialect,
+                               enumeration_mode=enumeration_mode)
+
+    def enumerate_selectors(self, resource_uri, max_elems=None,
+                            filter_query=None, filter_dialect='cql'):
+        """Lists the selectors of the instances of a resource.
+
+        Only endpoint references are enumerated, so the instances themselves
+        are neither transferred nor parsed.
+
+        :param resource_uri: URI of resource to enumerate.
+        :param max_elems: maximum number of elements returned by each
+                          operation, or None to let the batch sizer of the
+                          client pick it for every operation.
+        :param filter_query: filter query string.
+        :param filter_dialect: filter dialect. Valid options are: 'cql' and
+                               'wql'.
+        :returns: a list of dictionaries of selector names and values, one
+                  per instance, which can be passed to get().
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
         """
 
+        resp_xml = self._enumerate(resource_uri, max_elems=max_elems,
+                                   filter_query=filter_query,
+                                   filter_dialect=filter_dialect,
+                                   enumeration_mode=ENUMERATION_MODE_EPR)
+        return get_epr_selectors(resp_xml)
+
+    def iter_items(self, resource_uri, max_elems=None, filter_query=None,
+                   filter_dialect='cql', enumeration_mode=None,
+                   chunk_size=STREAM_CHUNK_SIZE):
+        """Executes enumerate operation over WSMan, streaming the items.
+
+        The responses are parsed incrementally as they are received, and
+        every item is yielded as soon as it is complete. Once the next item
+        is requested, the previous one is cleared and dropped from the
+        document, so memory usage does not grow with the number of items.
+        Items needed afterwards must be copied or converted while they are
+        current. With a rate limiter, every request counts as in flight
+        until its response has been read, so close the generator when
+        stopping early.
+
+        :param resource_uri: URI of resource to enumerate.
+        :param max_elems: maximum number of elements returned by each
+                          operation, or None to let the batch sizer of the
+                          client pick it for every operation.
+        :param filter_query: filter query string.
+        :param filter_dialect: filter dialect. Valid options are: 'cql' and
+                               'wql'.
+        :param enumeration_mode: one of ENUMERATION_MODES, or None.
+        :param chunk_size: number of bytes fed to the parser at once.
+        :returns: a generator of lxml.etree.Element objects, the children
+                  of the Items elements of the responses.
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        :raises: WSManEnumerationContextExpired when the enumeration context
+                 became invalid while retrying a Pull request. Items were
+                 yielded already, so the enumeration is not restarted.
+        """
+
+        payload = _EnumeratePayload(self.endpoint, resource_uri, True,
+                                    self._batch_size(resource_uri, max_elems),
+                                    filter_query, filter_dialect,
+                                    enumeration_mode)
+        while payload is not None:
+            if isinstance(payload, _PullPayload):
+                try:
+                    resp = self._request_pull(resource_uri, payload,
+                                              stream=True)
+                except exceptions.WSManEnumerationContextExpired:
+                    self.pull_retry.record_failure()
+                    raise
+            else:
+                resp = self._do_request(payload, stream=True)
+            items = _ItemStream(resp, chunk_size)
+            try:
+                for item in items:
+                    yield item
+            finally:
+                items.close()
+
+            payload = None
+            if items.context is not None:
+                payload = _PullPayload(
+                    self.endpoint, resource_uri, items.context,
+                    self._batch_size(resource_uri, max_elems))
+
+    def _enumerate(self, resource_uri, optimization=True, max_elems=None,
+                   auto_pull=True, filter_query=None, filter_dialect='cql',
+                   items_digest=None, enumeration_mode=None, raw=False):
+        # items_digest is a dracclient.cache.ItemsDigest updated with the
+        # raw content of every response, before any parsing. With raw, the
+        # raw contents of the responses are returned instead of a document,
+        # see parse_enumeration().
+        restarts = 0
+        while True:
+            try:
+                return self._enumerate_once(resource_uri, optimization,
+                                            max_elems, auto_pull,
+                                            filter_query, filter_dialect,
+                                            items_digest, enumeration_mode,
+                                            raw)
+            except exceptions.WSManEnumerationContextExpired:
+                if (self.pull_retry is None or
+                        restarts >= self.pull_retry.max_restarts):
+                    if self.pull_retry is not None:
+                        self.pull_retry.record_failure()
+                    raise
+
+            restarts += 1
+            self.pull_retry.record_restart()
+            LOG.warning('The enumeration context of %(resource_uri)s on '
+                        '%(host)s is no longer valid, restarting the '
+                        'enumeration, restart %(restart)d of %(restarts)d',
+                        {'resource_uri': resource_uri, 'host': self.host,
+                         'restart': restarts,
+                         'restarts': self.pull_retry.max_restarts})
+            if items_digest is not None:
+                items_digest.reset()
+
+    def _enumerate_once(self, resource_uri, optimization, max_elems,
+                        auto_pull, filter_query, filter_dialect,
+                        items_digest, enumeration_mode, raw=False):
         payload = _EnumeratePayload(self.endpoint, resource_uri,
-                                    optimization, max_elems,
-                                    filter_query, filter_dialect)
+                                    optimization,
+                                    self._batch_size(resource_uri, max_elems),
+                                    filter_query, filter_dialect,
+                                    enumeration_mode)
 
         resp = self._do_request(payload)
-        resp_xml = ElementTree.fromstring(resp.content)
+        if items_digest is not None:
+            items_digest.update(resp.content)
+
+        if raw:
+            # Only the enumeration contexts are read, the responses are
+            # parsed later if at all
+            contents = [resp.content]
+            context = _scan_enum_context(resp.content)
+            while auto_pull and context is not None:
+                resp = self._pull(resource_uri, context,
+                                  self._batch_size(resource_uri, max_elems))
+                if items_digest is not None:
+                    items_digest.update(resp.content)
+                contents.append(resp.content)
+                context = _scan_enum_context(resp.content)
+            return contents
+
+        resp_xml = parse_response(resp.content)
 
         if auto_pull:
             # The first response returns "<wsman:Items>"
@@ -171,7 +498,13 @@ class Client(object):
 
             context = self._enum_context(full_resp_xml)
             while context is not None:
-                resp_xml = self.pull(resource_uri, context, max_elems)
+                batch_size = self._batch_size(resource_uri, max_elems)
+                if items_digest is None:
+                    resp_xml = self.pull(resource_uri, context, batch_size)
+                else:
+                    resp = self._pull(resource_uri, context, batch_size)
+                    items_digest.update(resp.content)
+                    resp_xml = parse_response(resp.content)
                 context = self._enum_context(resp_xml)
 
                 # Merge in next batch of enumeration items
@@ -197,15 +530,118 @@ class Client(object):
         :returns: an lxml.etree.Element object of the response received
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
+        :raises: WSManEnumerationContextExpired when the enumeration context
+                 became invalid while retrying the request
         """
 
+        resp = self._pull(resource_uri, context, max_elems)
+        resp_xml = parse_response(resp.content)
+
+        return resp_xml
+
+    def _pull(self, resource_uri, context, max_elems):
         payload = _PullPayload(self.endpoint, resource_uri, context,
                                max_elems)
-        resp = self._do_request(payload)
-        resp_xml = ElementTree.fromstring(resp.content)
+        return self._request_pull(resource_uri, payload)
+
+    def _request_pull(self, resource_uri, payload, stream=False):
+        # Connection failures are retried by _do_request already, with the
+        # retry policy of the client. Failures left, including timeouts and
+        # server errors, are retried with the policy of pull_retry.
+        if self.pull_retry is None:
+            return self._do_request(payload, stream=stream)
+
+        retry_state = self.pull_retry.policy.begin()
+        while True:
+            self.pull_retry.record_pull()
+            try:
+                resp = self._do_request(payload, accept_faults=True,
+                                        stream=stream)
+            except exceptions.DRACDeadlineExceeded:
+                raise
+            except exceptions.WSManRequestFailure as ex:
+                error = ex
+            except exceptions.WSManInvalidResponse as ex:
+                if ex.status_code < 500:
+                    raise
+                error = ex
+            else:
+                if resp.ok:
+                    return resp
+
+                if _fault_subcode(resp) in INVALID_CONTEXT_FAULTS:
+                    raise exceptions.WSManEnumerationContextExpired(
+                        resource_uri=resource_uri,
+                        status_code=resp.status_code,
+                        reason=resp.reason)
+
+                error = exceptions.WSManInvalidResponse(
+                    status_code=resp.status_code,
+                    reason=resp.reason)
+                if resp.status_code < 500:
+                    raise error
+
+            delay = retry_state.next_delay()
+            if delay is None:
+                self.pull_retry.record_failure()
+                raise error
+
+            LOG.warning('Pulling the enumeration of %(resource_uri)s from '
+                        '%(host)s failed with %(error_type)s, attempt '
+                        '%(attempt)d of %(attempts)d',
+                        {'resource_uri': resource_uri, 'host': self.host,
+                         'error_type': type(error).__name__,
+                         'attempt': retry_state.attempt - 1,
+                         'attempts': self.pull_retry.policy.max_attempts})
+            self.pull_retry.record_retry()
+            if delay > 0:
+                time.sleep(delay)
+
+    def identify(self, retry_policy=None):
+        """Executes identify operation over WSMan.
+
+        The request is unauthenticated and answered by the WS-Man stack
+        itself, which makes it the cheapest way to check that it is up.
+
+        :param retry_policy: a dracclient.retry.RetryPolicy overriding the
+                             one of the client for this request
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        resp = self._do_request(_IdentifyPayload(), authenticate=False,
+                                retry_policy=retry_policy)
+        resp_xml = parse_response(resp.content)
 
         return resp_xml
 
+    def get(self, resource_uri, selectors):
+        """Executes get operation over WSMan.
+
+        Unlike an enumeration filtered on the keys of an instance, this
+        retrieves the instance in a single round trip.
+
+        :param resource_uri: URI of the resource
+        :param selectors: dictionary of selectors identifying the instance
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManInstanceNotFound when no instance matches the selectors
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = _GetPayload(self.endpoint, resource_uri, selectors)
+        resp = self._do_request(payload, accept_faults=True)
+        if not resp.ok:
+            if _fault_subcode(resp) in INSTANCE_NOT_FOUND_FAULTS:
+                raise exceptions.WSManInstanceNotFound(
+                    resource_uri=resource_uri, selectors=selectors)
+            raise exceptions.WSManInvalidResponse(
+                status_code=resp.status_code,
+                reason=resp.reason)
+
+        return parse_response(resp.content)
+
     def invoke(self, resource_uri, method, selectors, properties):
         """Executes invoke operation over WSMan.
 
@@ -221,16 +657,233 @@ class Client(object):
         payload = _InvokePayload(self.endpoint, resource_uri, method,
                                  selectors, properties)
         resp = self._do_request(payload)
-        resp_xml = ElementTree.fromstring(resp.content)
+        resp_xml = parse_response(resp.content)
 
         return resp_xml
 
+    def _batch_size(self, resource_uri, max_elems):
+        # Resolves the number of items requested by the next Enumerate or
+        # Pull request, which changes between requests in adaptive mode.
+        if max_elems is not None:
+            return max_elems
+        if self.batch_sizer is None:
+            return constants.DEFAULT_WSMAN_MAX_ELEMS
+        if not self._firmware_version_read:
+            self._read_firmware_version()
+        return self.batch_sizer.size(self.host, resource_uri,
+                                     self.firmware_version)
+
+    def _read_firmware_version(self):
+        # The sizes learned on other hosts running the same firmware are the
+        # starting point of this one. The version of the Lifecycle
+        # Controller is the one of the iDRAC firmware. It is read once, even
+        # if reading it failed.
+        self._firmware_version_read = True
+        try:
+            resp_xml = self.enumerate(
+                uris.DCIM_SystemView,
+                max_elems=constants.DEFAULT_WSMAN_MAX_ELEMS)
+        except (exceptions.WSManRequestFailure,
+                exceptions.WSManInvalidResponse) as exc:
+            LOG.warning('Could not read the firmware version of %(host)s, '
+                        'batch sizes are learned for this host only. '
+                        'Error: %(error)s', {'host': self.host, 'error': exc})
+            return
+
+        self.firmware_version = resp_xml.findtext(
+            './/{%s}LifecycleControllerVersion' % uris.DCIM_SystemView)
+
     def _enum_context(self, resp):
         context_elem = resp.find('.//{%s}EnumerationContext' % NS_WSMAN_ENUM)
         if context_elem is not None:
             return context_elem.text
 
 
+_local = threading.local()
+
+
+def _parser():
+    # Parsers are not thread-safe, every thread reuses its own
+    try:
+        return _local.parser
+    except AttributeError:
+        _local.parser = ElementTree.XMLParser(**PARSER_OPTIONS)
+        return _local.parser
+
+
+def parse_response(content):
+    """Parses the content of a response.
+
+    :param content: the raw content of a response
+    :returns: an lxml.etree.Element object of the root of the document
+    :raises: lxml.etree.XMLSyntaxError when the content is not well-formed
+    """
+
+    return ElementTree.fromstring(content, parser=_parser())
+
+
+def _scan_enum_context(content):
+    # Returns the enumeration context of a raw response, or None. The items
+    # are skipped, they may hold elements of any name.
+    match = ITEMS_RE.search(content)
+    if match is None:
+        context_match = _ENUM_CONTEXT_RE.search(content)
+    else:
+        context_match = (_ENUM_CONTEXT_RE.search(content, 0, match.start()) or
+                         _ENUM_CONTEXT_RE.search(content, match.end()))
+    if context_match is None or not context_match.group(1):
+        return None
+    return saxutils.unescape(context_match.group(1).decode('utf-8'))
+
+
+def parse_enumeration(contents):
+    """Parses the contents of the responses of an enumeration.
+
+    :param contents: the raw contents of the Enumerate response and of the
+                     Pull responses following it
+    :returns: an lxml.etree.Element object of the root of the Enumerate
+              response, holding the items of all the responses, as
+              returned by Client.enumerate()
+    :raises: lxml.etree.XMLSyntaxError when a content is not well-formed
+    """
+
+    full_resp_xml = parse_response(contents[0])
+    items_xml = full_resp_xml.find('.//{%s}Items' % NS_WSMAN)
+    for content in contents[1:]:
+        resp_xml = parse_response(content)
+        for item in resp_xml.find('.//{%s}Items' % NS_WSMAN_ENUM):
+            items_xml.append(item)
+
+    enum_context_elem = full_resp_xml.find('.//{%s}EnumerationContext'
+                                           % NS_WSMAN_ENUM)
+    if enum_context_elem is not None:
+        enum_context_elem.getparent().remove(enum_context_elem)
+    return full_resp_xml
+
+
+def _fault_subcode(resp):
+    """Returns the local name of the subcode of a SOAP fault response
+
+    :param resp: a requests.Response object
+    :returns: the subcode, e.g. 'InvalidSelectors', or None if the response
+              is not a SOAP fault
+    """
+    try:
+        resp_xml = parse_response(resp.content)
+    except ElementTree.XMLSyntaxError:
+        return None
+
+    if resp_xml.find('.//{%s}Fault' % NS_SOAP_ENV) is None:
+        return None
+
+    subcode = resp_xml.find('.//{%(ns)s}Subcode/{%(ns)s}Value'
+                            % {'ns': NS_SOAP_ENV})
+    if subcode is None or not subcode.text:
+        return ''
+    return subcode.text.strip().rsplit(':', 1)[-1]
+
+
+class _Permit(object):
+    """Permit of the rate limiter to send a request to an endpoint"""
+
+    def __init__(self, rate_limiter, endpoint):
+        self.rate_limiter = rate_limiter
+        self.endpoint = endpoint
+        self.started = time.time()
+        self.latency = None
+        self.released = False
+
+    def release(self, error=None):
+        if self.released:
+            return
+
+        self.released = True
+        if self.latency is None:
+            self.latency = time.time() - self.started
+        self.rate_limiter.release(self.endpoint, latency=self.latency,
+                                  error=error)
+
+
+class _ItemStream(object):
+    """Incremental parser of an Enumerate or Pull response.
+
+    Iterating yields the children of the Items element as they are parsed.
+    Afterwards, context holds the enumeration context to pull the next
+    items with, or None if the response had none. The response, and the
+    permit of the rate limiter held while receiving it, are released once
+    the items are exhausted or the stream is closed.
+    """
+
+    _ITEMS_TAGS = ('{%s}Items' % NS_WSMAN, '{%s}Items' % NS_WSMAN_ENUM)
+    _CONTEXT_TAG = '{%s}EnumerationContext' % NS_WSMAN_ENUM
+
+    def __init__(self, resp, chunk_size=STREAM_CHUNK_SIZE):
+        self.resp = resp
+        self.chunk_size = chunk_size
+        self.context = None
+
+    def __iter__(self):
+        parser = ElementTree.XMLPullParser(events=('end',), **PARSER_OPTIONS)
+        error = None
+        try:
+            try:
+                for chunk in self.resp.iter_content(self.chunk_size):
+                    parser.feed(chunk)
+                    for item in self._read_events(parser):
+                        yield item
+            except requests.exceptions.RequestException as ex:
+                error = exceptions.WSManRequestFailure(
+                    'A {error_type} error occurred while receiving a '
+                    'response: {error}'.format(error_type=type(ex).__name__,
+                                               error=ex))
+                raise error
+
+            parser.close()
+            for item in self._read_events(parser):
+                yield item
+        finally:
+            self.close(error)
+
+    def close(self, error=None):
+        """Closes the response and releases its rate limiter permit
+
+        :param error: the exception raised while receiving the response, if
+                      any
+        """
+        self.resp.close()
+        permit = getattr(self.resp, 'permit', None)
+        if permit is not None:
+            permit.release(error)
+
+    def _read_events(self, parser):
+        for (_, elem) in parser.read_events():
+            parent = elem.getparent()
+            if parent is not None and parent.tag in self._ITEMS_TAGS:
+                yield elem
+                # Drop the item and the ones before it from the document
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+            elif elem.tag == self._CONTEXT_TAG:
+                self.context = elem.text
+
+
+def get_epr_selectors(doc):
+    """Extracts the selectors of the endpoint references of a response.
+
+    :param doc: an lxml.etree.Element object of an enumeration response
+    :returns: a list of dictionaries of selector names and values, one per
+              endpoint reference, in document order
+    """
+
+    selectors = []
+    for epr_elem in doc.iter('{%s}EndpointReference' % NS_WS_ADDR):
+        selectors.append(dict(
+            (selector_elem.get('Name'), selector_elem.text)
+            for selector_elem in epr_elem.iter('{%s}Selector' % NS_WSMAN)))
+    return selectors
+
+
 class _Payload(object):
     """Payload generation for WSMan requests."""
 
@@ -274,12 +927,28 @@ class _Payload(object):
     def _add_body(self, envelope):
         return ElementTree.SubElement(envelope, '{%s}Body' % NS_SOAP_ENV)
 
+    def batch_size(self):
+        """Returns the number of items requested, if any"""
+
+        return None
+
+    def _add_selectors(self, header):
+        selector_set_elem = ElementTree.SubElement(
+            header, '{%s}SelectorSet' % NS_WSMAN)
+
+        for (name, value) in self.selectors.items():
+            selector_elem = ElementTree.SubElement(selector_set_elem,
+                                                   '{%s}Selector' % NS_WSMAN)
+            selector_elem.set('Name', name)
+            selector_elem.text = value
+
 
 class _EnumeratePayload(_Payload):
     """Payload generation for WSMan enumerate operation."""
 
     def __init__(self, endpoint, resource_uri, optimization=True,
-                 max_elems=100, filter_query=None, filter_dialect=None):
+                 max_elems=100, filter_query=None, filter_dialect=None,
+                 enumeration_mode=None):
         self.endpoint = endpoint
         self.resource_uri = resource_uri
         self.filter_dialect = None
@@ -287,6 +956,13 @@ class _EnumeratePayload(_Payload):
         self.optimization = optimization
         self.max_elems = max_elems
 
+        if (enumeration_mode is not None and
+                enumeration_mode not in ENUMERATION_MODES):
+            raise exceptions.InvalidParameterValue(
+                reason='Invalid enumeration mode %r, valid options are: %s' % (
+                    enumeration_mode, ', '.join(ENUMERATION_MODES)))
+        self.enumeration_mode = enumeration_mode
+
         if filter_query is not None:
             try:
                 self.filter_dialect = FILTER_DIALECT_MAP[filter_dialect]
@@ -316,6 +992,11 @@ class _EnumeratePayload(_Payload):
         if self.filter_query is not None:
             self._add_filter(enum_elem)
 
+        if self.enumeration_mode is not None:
+            mode_elem = ElementTree.SubElement(
+                enum_elem, '{%s}EnumerationMode' % NS_WSMAN)
+            mode_elem.text = self.enumeration_mode
+
         if self.optimization:
             self._add_enum_optimization(enum_elem)
 
@@ -329,6 +1010,11 @@ class _EnumeratePayload(_Payload):
                                                '{%s}MaxElements' % NS_WSMAN)
         max_elem_elem.text = str(self.max_elems)
 
+    def batch_size(self):
+        if self.optimization:
+            return self.max_elems
+        return None
+
     def _add_filter(self, enum_elem):
         filter_elem = ElementTree.SubElement(enum_elem,
                                              '{%s}Filter' % NS_WSMAN)
@@ -345,6 +1031,9 @@ class _PullPayload(_Payload):
         self.context = context
         self.max_elems = max_elems
 
+    def batch_size(self):
+        return self.max_elems
+
     def _add_header(self, envelope):
         header = super(_PullPayload, self)._add_header(envelope)
 
@@ -375,6 +1064,42 @@ class _PullPayload(_Payload):
         max_elem_elem.text = str(self.max_elems)
 
 
+class _IdentifyPayload(_Payload):
+    """Payload generation for WSMan identify operation."""
+
+    def _add_header(self, envelope):
+        # Identify requests carry no addressing headers
+        return ElementTree.SubElement(envelope, '{%s}Header' % NS_SOAP_ENV)
+
+    def _add_body(self, envelope):
+        body = super(_IdentifyPayload, self)._add_body(envelope)
+
+        ElementTree.SubElement(body, '{%s}Identify' % NS_WSMAN_IDENTITY,
+                               nsmap={'wsmid': NS_WSMAN_IDENTITY})
+
+        return body
+
+
+class _GetPayload(_Payload):
+    """Payload generation for WSMan get operation."""
+
+    def __init__(self, endpoint, resource_uri, selectors):
+        self.endpoint = endpoint
+        self.resource_uri = resource_uri
+        self.selectors = selectors
+
+    def _add_header(self, envelope):
+        header = super(_GetPayload, self)._add_header(envelope)
+
+        action_elem = ElementTree.SubElement(header, '{%s}Action' % NS_WS_ADDR)
+        action_elem.set('{%s}mustUnderstand' % NS_SOAP_ENV, 'true')
+        action_elem.text = NS_WS_TRANSFER + '/Get'
+
+        self._add_selectors(header)
+
+        return header
+
+
 class _InvokePayload(_Payload):
     """Payload generation for WSMan invoke operation."""
 
@@ -405,16 +1130,6 @@ class _InvokePayload(_Payload):
 
         return body
 
-    def _add_selectors(self, header):
-        selector_set_elem = ElementTree.SubElement(
-            header, '{%s}SelectorSet' % NS_WSMAN)
-
-        for (name, value) in self.selectors.items():
-            selector_elem = ElementTree.SubElement(selector_set_elem,
-                                                   '{%s}Selector' % NS_WSMAN)
-            selector_elem.set('Name', name)
-            selector_elem.text = value
-
     def _add_properties(self, body):
         method_elem = ElementTree.SubElement(
             body,
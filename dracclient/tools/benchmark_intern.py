@@ -0,0 +1,109 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Measures the memory held by the objects parsed from the mock WS-Man
+responses of a synthetic fleet, with and without string interning.
+
+Usage, with dracclient installed, e.g. in the tox virtualenv:
+
+    tox -e venv -- python tools/benchmark_intern.py [NODES [SETTINGS_NODES]]
+
+The physical disks and jobs of NODES nodes, 10000 by default, are parsed
+from their own copy of the responses. So are the iDRAC enumerable settings
+of SETTINGS_NODES of them, 200 by default, whose memory is then scaled to
+NODES nodes. Requires Python 3, for tracemalloc.
+"""
+
+from __future__ import print_function
+
+import gc
+import sys
+import tracemalloc
+
+from dracclient.resources import idrac_card
+from dracclient.resources import job
+from dracclient.resources import raid
+from dracclient.resources import uris
+from dracclient.tests import utils as test_utils
+from dracclient import utils
+from dracclient import wsman
+
+_RAID_MGMT = raid.RAIDManagement(None)
+_JOB_MGMT = job.JobManagement(None)
+
+INVENTORY = [
+    ('physical_disks',
+     test_utils.RAIDEnumerations[uris.DCIM_PhysicalDiskView]['ok'],
+     _RAID_MGMT._parse_physical_disk_view),
+    ('jobs',
+     test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['ok'],
+     lambda doc: [_JOB_MGMT._parse_drac_job(drac_job) for drac_job in
+                  utils.find_xml(doc, 'DCIM_LifecycleJob',
+                                 uris.DCIM_LifecycleJob, find_all=True)]),
+]
+
+SETTINGS = [
+    ('idrac_settings',
+     test_utils.iDracCardEnumerations[uris.DCIM_iDRACCardEnumeration]['ok'],
+     lambda doc: utils._parse_config(
+         doc, idrac_card.iDRACCardEnumerableAttribute, False, None, None)),
+]
+
+
+def _no_intern(value):
+    return value
+
+
+def _measure(kinds, nodes):
+    # Returns the number of bytes held by the objects parsed for nodes
+    contents = [(name, content.encode('utf-8'), parse)
+                for (name, content, parse) in kinds]
+    gc.collect()
+    tracemalloc.start()
+    results = []
+    for node in range(nodes):
+        for (name, content, parse) in contents:
+            results.append(parse(wsman.parse_response(content)))
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return size
+
+
+def _run(interned, nodes, settings_nodes):
+    utils.INTERN_TABLE.clear()
+    if interned:
+        utils.INTERN_TABLE.__dict__.pop('intern', None)
+    else:
+        utils.INTERN_TABLE.intern = _no_intern
+
+    inventory = _measure(INVENTORY, nodes)
+    settings = _measure(SETTINGS, settings_nodes) * nodes // settings_nodes
+    print('%-14s inventory %8.1f MiB  settings %8.1f MiB  total %8.1f MiB' % (
+        'interned' if interned else 'not interned', inventory / 2.0 ** 20,
+        settings / 2.0 ** 20, (inventory + settings) / 2.0 ** 20))
+    return inventory + settings
+
+
+def main(nodes=10000, settings_nodes=200):
+    print('%d nodes, iDRAC settings of %d nodes scaled to %d' % (
+        nodes, settings_nodes, nodes))
+    plain = _run(False, nodes, settings_nodes)
+    interned = _run(True, nodes, settings_nodes)
+    print('memory saved: %.1f%%' % (100.0 * (plain - interned) / plain))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,113 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Measures the throughput of parsing BIOS enumerable settings from many
+threads, in the calling threads and in parse pools of growing sizes.
+
+Usage, with dracclient installed, e.g. in the tox virtualenv:
+
+    tox -e venv -- python tools/benchmark_parse_pool.py [THREADS [DOCS
+                                                         [ATTRIBUTES]]]
+
+THREADS threads, 16 by default, parse DOCS enumerations each, 20 by
+default, holding ATTRIBUTES attributes, 2000 by default. The enumerations
+are parsed in the calling threads first, then by pools of 1, 2, 4... worker
+processes up to the number of CPUs.
+"""
+
+from __future__ import print_function
+
+import copy
+import functools
+import multiprocessing
+import sys
+import threading
+import time
+
+from lxml import etree as ElementTree
+
+from dracclient import offload
+from dracclient.resources import bios
+from dracclient.resources import uris
+from dracclient.tests import utils as test_utils
+from dracclient import utils
+from dracclient import wsman
+
+PARSE = functools.partial(utils._parse_config,
+                          attr_cls=bios.BIOSEnumerableAttribute,
+                          by_name=True, fqdd_filter=None,
+                          name_formatter=None)
+
+
+def _content(attributes):
+    # Returns an enumeration response holding attributes attributes, copies
+    # of those of the mock response with distinct names
+    doc = wsman.parse_response(test_utils.BIOSEnumerations[
+        uris.DCIM_BIOSEnumeration]['ok'].encode('utf-8'))
+    items = doc.find('.//{%s}Items' % wsman.NS_WSMAN)
+    templates = list(items)
+    name_tag = '{%s}AttributeName' % uris.DCIM_BIOSEnumeration
+    for index in range(len(templates), attributes):
+        item = copy.deepcopy(templates[index % len(templates)])
+        item.find(name_tag).text += str(index)
+        items.append(item)
+    return ElementTree.tostring(doc)
+
+
+def _run(parse_pool, content, threads, docs):
+    # Returns the number of enumerations parsed per second
+    def work():
+        for _ in range(docs):
+            contents = [content]
+            if parse_pool is None:
+                PARSE(wsman.parse_enumeration(contents))
+            else:
+                parse_pool.parse(PARSE, contents)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    started = time.time()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * docs / (time.time() - started)
+
+
+def main(threads=16, docs=20, attributes=2000):
+    content = _content(attributes)
+    print('%d threads parsing %d enumerations each, %d attributes and '
+          '%.1f KiB per enumeration' % (threads, docs, attributes,
+                                        len(content) / 1024.0))
+
+    # The pools are created, and their processes forked, before any thread
+    sizes = []
+    size = 1
+    while size < multiprocessing.cpu_count():
+        sizes.append(size)
+        size *= 2
+    sizes.append(multiprocessing.cpu_count())
+    pools = [offload.ParsePool(processes=size, min_bytes=0)
+             for size in sizes]
+
+    baseline = _run(None, content, threads, docs)
+    print('%-16s %8.1f enumerations/s' % ('calling threads', baseline))
+    for (size, parse_pool) in zip(sizes, pools):
+        throughput = _run(parse_pool, content, threads, docs)
+        parse_pool.close()
+        print('%-16s %8.1f enumerations/s  x%.2f' % (
+            '%d workers' % size, throughput, throughput / baseline))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
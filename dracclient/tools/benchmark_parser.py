@@ -0,0 +1,96 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Compares the parsing of the mock WS-Man responses with the default lxml
+parser and with the parser used by dracclient.wsman.
+
+Usage, with dracclient installed, e.g. in the tox virtualenv:
+
+    tox -e venv -- python tools/benchmark_parser.py [ROUNDS [COPIES]]
+
+libxml2 allocates outside of the Python heap, out of sight of tracemalloc,
+so memory is measured as the growth of the peak resident set size of a
+fresh process holding COPIES parsed copies of every response, 50 by
+default. The number of text nodes held by the parsed documents is
+reported as well.
+"""
+
+from __future__ import print_function
+
+import glob
+import multiprocessing
+import os
+import resource
+import sys
+import timeit
+
+from lxml import etree as ElementTree
+
+from dracclient import wsman
+
+MOCKS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'dracclient',
+                         'tests', 'wsman_mocks')
+
+
+def _load_corpus():
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(MOCKS_DIR, '*.xml'))):
+        with open(path, 'rb') as f:
+            corpus.append(f.read())
+    return corpus
+
+
+def _text_nodes(doc):
+    return sum((elem.text is not None) + (elem.tail is not None)
+               for elem in doc.iter())
+
+
+def _hold(parse, corpus, copies, queue):
+    # Runs in a fresh process, whose peak RSS only grows with the documents
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    docs = [parse(content) for _ in range(copies) for content in corpus]
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((after - before, len(docs)))
+
+
+def _memory(parse, corpus, copies):
+    # Returns the number of KiB of resident memory per parsed response
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_hold,
+                                      args=(parse, corpus, copies, queue))
+    process.start()
+    (grown_kib, docs) = queue.get()
+    process.join()
+    return float(grown_kib) / docs
+
+
+def _run(name, parse, corpus, rounds, copies):
+    elapsed = min(timeit.repeat(lambda: [parse(content) for content in corpus],
+                                number=rounds, repeat=3))
+    text_nodes = sum(_text_nodes(parse(content)) for content in corpus)
+    print('%-8s %8.1f us per response %8.1f KiB per response %8d text '
+          'nodes' % (name, elapsed / rounds / len(corpus) * 1e6,
+                     _memory(parse, corpus, copies), text_nodes))
+
+
+def main(rounds=200, copies=50):
+    corpus = _load_corpus()
+    print('%d responses, %d bytes, %d rounds' % (
+        len(corpus), sum(len(content) for content in corpus), rounds))
+    _run('default', ElementTree.fromstring, corpus, rounds, copies)
+    _run('wsman', wsman.parse_response, corpus, rounds, copies)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,87 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Compares the lookups of the attributes of the items of the mock WS-Man
+responses through ElementPath queries, as find_xml used to do, and through
+dracclient.utils.find_xml.
+
+Usage, with dracclient installed, e.g. in the tox virtualenv:
+
+    tox -e venv -- python tools/benchmark_queries.py [ROUNDS]
+
+Every attribute of every item is looked up once per round, the way the
+resource parsers read them.
+"""
+
+from __future__ import print_function
+
+import glob
+import os
+import sys
+import timeit
+
+from lxml import etree as ElementTree
+
+from dracclient import utils
+from dracclient import wsman
+
+MOCKS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'dracclient',
+                         'tests', 'wsman_mocks')
+
+
+def _load_items():
+    # Returns (item, [(namespace, name)]) tuples for every enumerated item
+    items = []
+    for path in sorted(glob.glob(os.path.join(MOCKS_DIR, '*enum*.xml'))):
+        with open(path, 'rb') as f:
+            doc = wsman.parse_response(f.read())
+        for items_elem in doc.iter('{%s}Items' % wsman.NS_WSMAN,
+                                   '{%s}Items' % wsman.NS_WSMAN_ENUM):
+            for item in items_elem:
+                attrs = []
+                for child in item:
+                    if not isinstance(child.tag, str):
+                        continue
+                    qname = ElementTree.QName(child)
+                    attrs.append((qname.namespace, qname.localname))
+                items.append((item, attrs))
+    return items
+
+
+def _find_elementpath(doc, item, namespace):
+    return doc.find('.//{%(namespace)s}%(item)s' % {'namespace': namespace,
+                                                    'item': item})
+
+
+def _run(name, find, items, rounds):
+    def lookup_all():
+        for item, attrs in items:
+            for namespace, attr_name in attrs:
+                find(item, attr_name, namespace)
+
+    elapsed = min(timeit.repeat(lookup_all, number=rounds, repeat=3))
+    print('%-12s %8.2f us per item' % (
+        name, elapsed / rounds / len(items) * 1e6))
+
+
+def main(rounds=50):
+    items = _load_items()
+    print('%d items, %d attributes, %d rounds' % (
+        len(items), sum(len(attrs) for item, attrs in items), rounds))
+    _run('elementpath', _find_elementpath, items, rounds)
+    _run('find_xml', utils.find_xml, items, rounds)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])